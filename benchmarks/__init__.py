@@ -0,0 +1,79 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+:synopsis: Benchmarks.
+
+Run from the repository root, e.g. ``python -m benchmarks.parser``.
+"""
+
+
+# standard library imports
+import time
+import statistics
+
+# third party imports
+import lxml.etree
+
+# library specific imports
+
+
+EXAMPLE = "examples/Wikipedia-20180812145957.xml"
+
+
+def load_example(xml=EXAMPLE):
+    """Load namespaces and revisions of example export file
+    (without validation).
+
+    :param str xml: XML file
+
+    :returns: namespaces and revisions (title, id, ns, revision id, wikitext)
+    :rtype: tuple
+    """
+    tree = lxml.etree.parse(xml)
+    namespaces = {}
+    for element in tree.iterfind("{*}siteinfo/{*}namespaces/{*}namespace"):
+        namespaces[element.attrib["key"]] = element.text or "(Main)"
+    revisions = [
+        (
+            page.findtext("{*}title"),
+            page.findtext("{*}id"),
+            page.findtext("{*}ns"),
+            revision.findtext("{*}id"),
+            revision.findtext("{*}text") or ""
+        )
+        for page in tree.iterfind("{*}page")
+        for revision in page.iterfind("{*}revision")
+    ]
+    return namespaces, revisions
+
+
+def measure(function, repeat=5):
+    """Measure function.
+
+    :param callable function: function
+    :param int repeat: number of repetitions
+
+    :returns: median wall-clock time (sec)
+    :rtype: float
+    """
+    timings = []
+    for _ in range(repeat):
+        time0 = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - time0)
+    return statistics.median(timings)
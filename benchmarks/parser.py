@@ -0,0 +1,175 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+:synopsis: Wikitext parser benchmarks.
+"""
+
+
+# standard library imports
+import re
+import warnings
+
+# third party imports
+
+# library specific imports
+import src.page
+import src.parser
+from src.parser_elements import links
+from benchmarks import load_example, measure
+
+
+def benchmark_sections():
+    """Benchmark section tree (per page, fully expanded)."""
+    _, revisions = load_example()
+    wikitexts = [revision[-1] for revision in revisions]
+    for name in ("find_sections", "find_section_spans"):
+        function = getattr(src.parser.Parser, name)
+
+        def find_sections():
+            for wikitext in wikitexts:
+                # pylint: disable=cell-var-from-loop,protected-access
+                list(src.page.Page._search_depth_first(function(wikitext)))
+        seconds = measure(find_sections)
+        print(
+            "{}: {:.3f} ms/page ({} pages)".format(
+                name, 1000*seconds/len(wikitexts), len(wikitexts)
+            )
+        )
+
+
+def benchmark_pagelinks_table():
+    """Benchmark pagelinks table creation (per page)."""
+    namespaces, revisions = load_example()
+    for engine in src.parser.Parser.ENGINES:
+        parser = src.parser.Parser(namespaces, engine=engine)
+
+        def create_pagelinks_tables():
+            # pages cache their links, i.e. are created anew
+            for revision in revisions:
+                src.page.Page(
+                    *revision, parser  # pylint: disable=cell-var-from-loop
+                ).create_pagelinks_table()
+        seconds = measure(create_pagelinks_tables, repeat=3)
+        print(
+            "pagelinks table ({}): {:.2f} ms/page ({} pages)".format(
+                engine, 1000*seconds/len(revisions), len(revisions)
+            )
+        )
+
+
+def benchmark_short_sections():
+    """Benchmark link scanning of short sections (per call)."""
+    namespaces, _ = load_example()
+    parser = src.parser.Parser(namespaces)
+    wikitext = "See [[Doctor Who (film)|the film]] and [https://bbc.co.uk BBC]."
+    number = 200
+
+    def find_links():
+        for _ in range(number):
+            parser.find_internal_links(wikitext)
+            parser.find_external_links(wikitext, engine=parser.engine)
+    seconds = measure(find_links, repeat=3)
+    print("short section: {:.3f} ms/call".format(1000*seconds/number))
+
+
+def benchmark_prefilter():
+    """Benchmark prefiltered link scanning of link-sparse prose (one link
+    per 2000 characters)."""
+    namespaces, revisions = load_example()
+    prose = re.sub(r"[\[\]]", "", revisions[0][-1])
+    link = "[[Doctor Who (film)|the film]] [https://bbc.co.uk BBC]"
+    wikitext = link.join(
+        prose[i:i+2000] for i in range(0, len(prose), 2000)
+    )
+    parser_elements = {
+        # pylint: disable=protected-access
+        "internal_link": src.parser.Parser(namespaces)._grammar[
+            "internal_link"
+        ],
+        "external_link": src.parser.Parser.EXTERNAL_LINKS["pyparsing"]
+    }
+    for name, parser_element in parser_elements.items():
+        scan = getattr(links, "scan_{}s".format(name))
+
+        def scan_string():
+            # pylint: disable=cell-var-from-loop
+            list(links.scan_string(parser_element, wikitext))
+
+        def scan_prefiltered():
+            list(scan(parser_element, wikitext))  # pylint: disable=W0640
+        seconds0 = measure(scan_string, repeat=3)
+        seconds1 = measure(scan_prefiltered, repeat=3)
+        print(
+            "{}: scan_string {:.1f} ms, prefiltered {:.2f} ms ({:.0f}x, "
+            "{} characters)".format(
+                name, 1000*seconds0, 1000*seconds1, seconds0/seconds1,
+                len(wikitext)
+            )
+        )
+
+
+def benchmark_extract_many():
+    """Benchmark extracting the internal links of all sections (per page),
+    one call per section vs. one call per page."""
+    namespaces, revisions = load_example()
+    sections = [
+        [
+            section.wikitext
+            # pylint: disable=protected-access
+            for section in src.page.Page._search_depth_first(
+                src.parser.Parser.find_section_spans(revision[-1])
+            )
+        ]
+        for revision in revisions
+    ]
+    for engine in src.parser.Parser.ENGINES:
+        parser = src.parser.Parser(namespaces, engine=engine)
+
+        def find_internal_links():
+            for wikitexts in sections:
+                for wikitext in wikitexts:
+                    parser.find_internal_links(  # pylint: disable=W0640
+                        wikitext
+                    )
+
+        def extract_many():
+            for wikitexts in sections:
+                parser.extract_many(wikitexts)  # pylint: disable=W0640
+        seconds0 = measure(find_internal_links, repeat=3)
+        seconds1 = measure(extract_many, repeat=3)
+        print(
+            "internal links ({}): {:.2f} ms/page per section, {:.2f} ms/page "
+            "extract_many ({} pages)".format(
+                engine, 1000*seconds0/len(sections),
+                1000*seconds1/len(sections), len(sections)
+            )
+        )
+
+
+def main():
+    """Run wikitext parser benchmarks."""
+    warnings.simplefilter("ignore")
+    benchmark_sections()
+    benchmark_pagelinks_table()
+    benchmark_short_sections()
+    benchmark_prefilter()
+    benchmark_extract_many()
+
+
+if __name__ == "__main__":
+    main()
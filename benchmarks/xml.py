@@ -0,0 +1,129 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Wikipedia export file parser benchmarks.
+"""
+
+
+# standard library imports
+import sys
+import tracemalloc
+
+# third party imports
+
+# library specific imports
+import src.xml
+from benchmarks import EXAMPLE, measure
+
+
+PROJECTIONS = (
+    ("full", ("title", "id", "ns", "revision")),
+    ("minimal", ("title", "id", "ns", "revision.text"))
+)
+
+
+def benchmark_projections(xml=EXAMPLE):
+    """Benchmark page element extraction by projection (pages/sec).
+
+    :param str xml: XML file
+    """
+    export_file_parser = src.xml.ExportFileParser(xml, None, streaming=True)
+    for name, prop in PROJECTIONS:
+        pages = []
+
+        def find_page_elements():
+            pages.clear()
+            pages.extend(
+                export_file_parser.find_page_elements(
+                    prop=prop  # pylint: disable=cell-var-from-loop
+                )
+            )
+        seconds = measure(find_page_elements, repeat=3)
+        print(
+            "{}: {:.0f} pages/sec ({} pages)".format(
+                name, len(pages)/seconds, len(pages)
+            )
+        )
+
+
+def _copy(value, factory):
+    """Copy records (recursively).
+
+    :param value: value
+    :param callable factory: factory (called with record and fields)
+
+    :returns: copy
+    """
+    if isinstance(value, list):
+        return [_copy(item, factory) for item in value]
+    if isinstance(value, tuple):
+        return factory(
+            value,
+            {
+                field: _copy(getattr(value, field), factory)
+                for field in value.keys()
+            }
+        )
+    return value
+
+
+def benchmark_memory(xml=EXAMPLE):
+    """Benchmark memory usage of page elements held in memory (per 10k
+    revisions, strings are shared and not counted).
+
+    :param str xml: XML file
+    """
+    export_file_parser = src.xml.ExportFileParser(xml, None, streaming=True)
+    page_elements = list(
+        export_file_parser.find_page_elements(
+            prop=("title", "id", "ns", "revision")
+        )
+    )
+    revisions = sum(
+        len(page_element.revision) for page_element in page_elements
+    )
+    factories = (
+        ("nested dicts", lambda value, fields: fields),
+        ("records", lambda value, fields: type(value)(**fields))
+    )
+    for name, factory in factories:
+        tracemalloc.start()
+        copy = _copy(page_elements, factory)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del copy
+        print(
+            "{}: {:.0f} KiB/10k revisions ({} revisions)".format(
+                name, size/1024*10000/revisions, revisions
+            )
+        )
+
+
+def main():
+    """Run Wikipedia export file parser benchmarks."""
+    if len(sys.argv) > 1:
+        xml = sys.argv[1]
+    else:
+        xml = EXAMPLE
+    benchmark_projections(xml=xml)
+    benchmark_memory(xml=xml)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,25 +21,132 @@
 
 
 # standard library imports
+import os
+import sys
 import time
 import logging
+import functools
+import itertools
 
 # third party imports
 
 # library specific imports
 import src.cli
 import src.xml
+import src.multistream
 import src.page
+import src.cache
 import src.parser
+import src.sinks
+import src.titles
+import src.redirects
+import src.pipeline
+import src.incremental
 
 
-def main():     # pylint: disable=too-many-locals
+def extract(elements, parser, cache=None, cache_size=2**30):
+    """Extract table of contents, sections, links and pagelinks table rows.
+
+    :param tuple elements: page and revision element
+    :param Parser parser: wikitext parser
+    :param str cache: parse cache (SQLite database)
+    :param int cache_size: maximum size of parse cache (bytes)
+
+    :returns: output
+    :rtype: list
+    """
+    output = []
+    page_element, revision_element = elements
+    page = src.page.Page(
+        page_element.title,
+        page_element.id,
+        page_element.ns,
+        revision_element.id,
+        revision_element.text.text,
+        parser
+    )
+    if page.ns != "0":
+        return output
+    parse_cache = None
+    if cache and revision_element.sha1:
+        parse_cache = src.cache.ParseCache.get_parse_cache(
+            cache, parser.namespaces,
+            aliases=parser.aliases, max_size=cache_size
+        )
+        if parse_cache.load(page, revision_element.sha1):
+            parse_cache = None
+    output.append(page.find_toc(page.section))
+    output.append(page.find_prettyprint(page.section))
+    section = page.find_section("Adversaries")
+    output.append(section)
+    internal_links, _ = page.find_section_links(section)
+    output.append(internal_links)
+    rows = page.create_pagelinks_table()
+    output.append(rows)
+    section = page.find_section("Official websites")
+    _, external_links = page.find_section_links(section)
+    output.append(external_links)
+    if parse_cache is not None:
+        parse_cache.store(page, revision_element.sha1)
+    return output
+
+
+def extract_pagelinks(
+        elements, parser, cache=None, cache_size=2**30, titles=None
+):
+    """Extract pagelinks table rows (title IDs, deduplicated).
+
+    :param tuple elements: page and revision element
+    :param Parser parser: wikitext parser
+    :param str cache: parse cache (SQLite database)
+    :param int cache_size: maximum size of parse cache (bytes)
+    :param str titles: intern table (SQLite database)
+
+    :returns: pagelinks table rows
+    :rtype: list
+    """
+    page_element, revision_element = elements
+    page = src.page.Page(
+        page_element.title,
+        page_element.id,
+        page_element.ns,
+        revision_element.id,
+        revision_element.text.text,
+        parser
+    )
+    parse_cache = None
+    if cache and revision_element.sha1:
+        parse_cache = src.cache.ParseCache.get_parse_cache(
+            cache, parser.namespaces,
+            aliases=parser.aliases, max_size=cache_size
+        )
+        if parse_cache.load(page, revision_element.sha1):
+            parse_cache = None
+    rows = page.create_pagelinks_table(
+        normalize=True, table=src.titles.get_title_table(titles)
+    )
+    if parse_cache is not None:
+        parse_cache.store(page, revision_element.sha1)
+    return rows
+
+
+def write(outputs, fp):  # pylint: disable=invalid-name
+    """Write output.
+
+    :param iterable outputs: output (per revision)
+    :param file fp: file object
+    """
+    for output in outputs:
+        for value in output:
+            print(value, file=fp)
+
+
+def main():
     """main function."""
     try:
         logging.basicConfig(level=logging.DEBUG)
         logger = logging.getLogger(name=main.__name__)
-        argument_parser = src.cli.get_argument_parser()
-        args = argument_parser.parse_args()
+        args = src.cli.parse_args()
         logger.info("input file:%s", args.input)
         if args.output:
             logger.info("output file:%s", args.output)
@@ -47,7 +154,16 @@ def main():     # pylint: disable=too-many-locals
             logger.info("output:stdout")
         logger.info("parse wikitext")
         time0 = time.time()
-        export_file_parser = src.xml.ExportFileParser(args.input, args.xsd)
+        if args.index:
+            logger.info("multistream index:%s", args.index)
+            export_file_parser = src.multistream.MultistreamExportFileParser(
+                args.input, args.xsd, args.index, validation=args.validation
+            )
+        else:
+            export_file_parser = src.xml.ExportFileParser(
+                args.input, args.xsd,
+                streaming=True, validation=args.validation
+            )
         language_attrib = export_file_parser.find_language_attrib()
         logger.info("Wikipedia export file language:%s", language_attrib)
         namespace_elements = export_file_parser.find_namespace_elements()
@@ -56,33 +172,99 @@ def main():     # pylint: disable=too-many-locals
                 "'%s'" % value for value in namespace_elements.values()
             )
         )
-        parser = src.parser.Parser(namespace_elements)
-        prop = ("title", "id", "ns", "revision")
-        pages = []
-        for page_element in export_file_parser.find_page_elements(prop=prop):
-            for revision_element in page_element["revision"]:
-                page = src.page.Page(
-                    page_element["title"],
-                    page_element["id"],
-                    page_element["ns"],
-                    revision_element["id"],
-                    revision_element["text"]["text"],
-                    parser
+        logger.info("processes:%d", args.processes)
+        logger.info("engine:%s", args.engine)
+        prop = ("title", "id", "ns", "revision.id", "revision.text")
+        if args.pagelinks_delta:
+            prop += ("revision.parentid", "revision.sha1")
+        elif args.cache:
+            logger.info("parse cache:%s", args.cache)
+            prop += ("revision.sha1",)
+        if args.limit is None:
+            stop = None
+        else:
+            stop = args.skip + args.limit
+        if args.index:
+            page_elements = export_file_parser.find_page_elements(
+                prop=prop,
+                processes=args.processes,
+                latest_only=args.latest_only
+            )
+            revision_elements = (
+                (page_element._replace(revision=None), revision_element)
+                for page_element in page_elements
+                for revision_element in page_element.revision
+            )
+        else:
+            revision_elements = export_file_parser.find_revision_elements(
+                prop=prop, latest_only=args.latest_only
+            )
+        revision_elements = itertools.islice(
+            revision_elements, args.skip, stop
+        )
+        title_table = src.titles.get_title_table()
+        redirects = None
+        if args.redirects:
+            logger.info("redirect table:%s", args.redirects)
+            exists = os.path.exists(args.redirects)
+            redirect_table = src.redirects.RedirectTable(args.redirects)
+            if not exists:
+                redirect_table.build(
+                    export_file_parser.find_page_elements(
+                        prop=src.redirects.PROP, latest_only=True
+                    ),
+                    src.parser.Parser(namespace_elements, engine=args.engine)
                 )
-                pages.append(page)
-        for page in pages:
-            if page.ns == "0":
-                print(page.find_toc(page.section))
-                print(page.find_prettyprint(page.section))
-                section = page.find_section("Adversaries")
-                print(section)
-                internal_links = page.find_internal_links(section.wikitext)
-                print(internal_links)
-                rows = page.create_pagelinks_table()
-                print(rows)
-                section = page.find_section("Official websites")
-                external_links = page.find_external_links(section.wikitext)
-                print(external_links)
+            redirects = redirect_table.load(table=title_table)
+            redirect_table.close()
+        sink = src.sinks.get_sink(
+            args.output, redirects=redirects, table=title_table
+        )
+        if args.pagelinks_delta:
+            if sink is not None:
+                sink.close()
+                raise ValueError("pagelinks deltas cannot be written to sink")
+            pagelinks_deltas = src.incremental.find_pagelinks_deltas(
+                revision_elements,
+                src.parser.Parser(namespace_elements, engine=args.engine)
+            )
+            outputs = (
+                [pagelinks_delta] for pagelinks_delta in pagelinks_deltas
+            )
+        else:
+            if sink is None:
+                function = functools.partial(
+                    extract,
+                    cache=args.cache,
+                    cache_size=args.cache_size * 2**20
+                )
+            else:
+                function = functools.partial(
+                    extract_pagelinks,
+                    cache=args.cache,
+                    cache_size=args.cache_size * 2**20,
+                    titles=title_table.path
+                )
+            outputs = src.pipeline.imap(
+                function,
+                revision_elements, namespace_elements,
+                processes=args.processes,
+                chunksize=args.chunksize,
+                ordered=not args.unordered,
+                engine=args.engine
+            )
+        if sink is not None:
+            logger.info("sink:%s", type(sink).__name__)
+            with sink:
+                for rows in outputs:
+                    sink.write(rows)
+        elif args.output:
+            # pylint: disable=invalid-name
+            with open(args.output, "w", encoding="utf-8") as fp:
+                write(outputs, fp)
+        else:
+            write(outputs, sys.stdout)
+        title_table.close()
         time1 = time.time()
         logger.info("parsed wikitext (%f sec)", time1 - time0)
     except Exception as exception:
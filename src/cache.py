@@ -0,0 +1,407 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Parse result cache.
+"""
+
+
+# standard library imports
+import json
+import pickle
+import sqlite3
+import hashlib
+import collections
+
+# third party imports
+
+# library specific imports
+import src.parser
+import src.page_elements
+import src.parser_elements.links
+
+
+class MemoryCache():
+    """In-memory least recently used cache.
+
+    :ivar int size: maximum number of entries
+    """
+
+    def __init__(self, size=1024):
+        """Initialize in-memory cache.
+
+        :param int size: maximum number of entries
+        """
+        self.size = size
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        """Get entry.
+
+        :param str key: key
+
+        :returns: value
+        :rtype: bytes or None
+        """
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Put entry (evicts least recently used entries).
+
+        :param str key: key
+        :param bytes value: value
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def close(self):
+        """Close in-memory cache."""
+        self._entries.clear()
+
+
+class SQLiteCache():
+    """On-disk (SQLite) least recently used cache.
+
+    Entries are evicted once the size of all values exceeds max_size bytes.
+    The size of all values is kept in the table cache_size (updated in the
+    same transaction as the entries), i.e. the entries are only scanned
+    when evicting. The database may be shared by several processes.
+
+    :ivar str path: SQLite database
+    :ivar int max_size: maximum size (bytes)
+    """
+
+    def __init__(self, path, max_size=2**30):
+        """Initialize on-disk cache.
+
+        :param str path: SQLite database
+        :param int max_size: maximum size (bytes)
+        """
+        try:
+            self.path = path
+            self.max_size = max_size
+            self._connection = sqlite3.connect(
+                path, timeout=60, isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, "
+                "accessed INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed "
+                "ON cache (accessed)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_size (size INTEGER)"
+            )
+            self._connection.execute("BEGIN IMMEDIATE")
+            if self._connection.execute(
+                    "SELECT size FROM cache_size"
+            ).fetchone() is None:
+                self._connection.execute(
+                    "INSERT INTO cache_size "
+                    "SELECT TOTAL(size) FROM cache"
+                )
+            self._connection.execute("COMMIT")
+        except Exception as exception:
+            msg = "failed to initialize on-disk cache\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _get_clock(self):
+        """Get logical clock (most recent access + 1).
+
+        :returns: clock
+        :rtype: int
+        """
+        row = self._connection.execute(
+            "SELECT MAX(accessed) FROM cache"
+        ).fetchone()
+        return (row[0] or 0) + 1
+
+    def get(self, key):
+        """Get entry.
+
+        :param str key: key
+
+        :returns: value
+        :rtype: bytes or None
+        """
+        row = self._connection.execute(
+            "SELECT value FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._connection.execute(
+            "UPDATE cache SET accessed = ? WHERE key = ?",
+            (self._get_clock(), key)
+        )
+        return row[0]
+
+    def put(self, key, value):
+        """Put entry (evicts least recently used entries).
+
+        :param str key: key
+        :param bytes value: value
+        """
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._connection.execute(
+                "SELECT size FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (key, value, len(value), self._get_clock())
+            )
+            self._connection.execute(
+                "UPDATE cache_size SET size = size + ?",
+                (len(value) - (row[0] if row else 0),)
+            )
+            self._evict()
+            self._connection.execute("COMMIT")
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self):
+        """Evict least recently used entries (in the current
+        transaction)."""
+        size, = self._connection.execute(
+            "SELECT size FROM cache_size"
+        ).fetchone()
+        if size <= self.max_size:
+            return
+        evicted = []
+        evicted_size = 0
+        for key, value_size in self._connection.execute(
+                "SELECT key, size FROM cache ORDER BY accessed"
+        ):
+            if size - evicted_size <= self.max_size:
+                break
+            evicted.append((key,))
+            evicted_size += value_size
+        self._connection.executemany(
+            "DELETE FROM cache WHERE key = ?", evicted
+        )
+        self._connection.execute(
+            "UPDATE cache_size SET size = size - ?", (evicted_size,)
+        )
+
+    def close(self):
+        """Close on-disk cache."""
+        self._connection.close()
+
+
+class ParseCache():
+    """Parse result cache.
+
+    Section trees and the internal and external links of every section
+    are cached by revision SHA-1, wikitext parser version, namespaces and
+    namespace aliases, i.e. reverted and duplicate revisions or re-runs over
+    the same export file are not parsed again. Entries are looked up in every
+    tier in turn (e.g. MemoryCache, SQLiteCache) and put into every tier.
+
+    The heading of the root section (the page's title) is not cached,
+    i.e. pages with the same wikitext but different titles share entries.
+
+    Parse caches are shared by all callers using the same path, namespaces
+    and namespace aliases (q.v. get_parse_cache).
+
+    :cvar dict PARSE_CACHES: parse caches (by path, namespaces and
+        namespace aliases)
+    :ivar list tiers: tiers
+    :ivar str namespace_hash: namespaces and namespace aliases (hash)
+    """
+    PARSE_CACHES = {}
+
+    def __init__(self, tiers, namespaces, aliases=None):
+        """Initialize parse cache.
+
+        :param list tiers: tiers
+        :param dict namespaces: namespaces
+        :param dict aliases: namespace aliases (by key, default:
+            links.NAMESPACE_ALIASES)
+        """
+        try:
+            if aliases is None:
+                aliases = src.parser_elements.links.NAMESPACE_ALIASES
+            self.tiers = tiers
+            self.namespace_hash = hashlib.sha1(
+                json.dumps(
+                    [sorted(namespaces.items()), sorted(aliases.items())]
+                ).encode("utf-8")
+            ).hexdigest()
+        except Exception as exception:
+            msg = "failed to initialize parse cache\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    @classmethod
+    def get_parse_cache(
+            cls, path, namespaces, aliases=None, size=1024, max_size=2**30
+    ):
+        """Get parse cache (in-memory and on-disk tier).
+
+        :param str path: SQLite database
+        :param dict namespaces: namespaces
+        :param dict aliases: namespace aliases (by key)
+        :param int size: maximum number of entries (in-memory tier)
+        :param int max_size: maximum size in bytes (on-disk tier)
+
+        :returns: parse cache
+        :rtype: ParseCache
+        """
+        try:
+            key = (
+                path, tuple(sorted(namespaces.items())),
+                tuple(sorted((aliases or {}).items()))
+            )
+            if key not in cls.PARSE_CACHES:
+                cls.PARSE_CACHES[key] = cls(
+                    [MemoryCache(size=size), SQLiteCache(path, max_size)],
+                    namespaces,
+                    aliases=aliases
+                )
+            parse_cache = cls.PARSE_CACHES[key]
+        except Exception as exception:
+            msg = "failed to get parse cache\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return parse_cache
+
+    def _get_key(self, sha1):
+        """Get key.
+
+        :param str sha1: revision SHA-1
+
+        :returns: key
+        :rtype: str
+        """
+        return "{}:{}:{}".format(
+            sha1, src.parser.Parser.VERSION, self.namespace_hash
+        )
+
+    @staticmethod
+    def _dump(page):
+        """Serialize section tree and links of page.
+
+        :param Page page: page
+
+        :returns: serialized section tree and links
+        :rtype: bytes
+        """
+        def dump_section(section):
+            return (
+                section.level, section.heading, section.start, section.end,
+                section.heading_start, section.heading_end,
+                [
+                    dump_section(subsection)
+                    for subsection in section.subsections
+                ]
+            )
+        links = {}
+        # pylint: disable=protected-access
+        for section in page._search_depth_first(page.section):
+            internal_links, external_links = page.find_section_links(section)
+            links[(section.start, section.end)] = (
+                [tuple(internal_link) for internal_link in internal_links],
+                [tuple(external_link) for external_link in external_links]
+            )
+        return pickle.dumps(
+            (dump_section(page.section._replace(heading=None)), links),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+    @staticmethod
+    def _load(page, value):
+        """Deserialize section tree and links into page.
+
+        :param Page page: page
+        :param bytes value: serialized section tree and links
+        """
+        def load_section(section):
+            level, heading, start, end, heading_start, heading_end, \
+                subsections = section
+            return src.page_elements.SectionSpan(
+                level, heading, page.wikitext, start, end,
+                heading_start, heading_end,
+                [load_section(subsection) for subsection in subsections]
+            )
+        section, links = pickle.loads(value)
+        # pylint: disable=protected-access
+        page._section = load_section(section)._replace(heading=page.title)
+        page._links = {
+            key: (
+                [
+                    src.page_elements.InternalLink(*internal_link)
+                    for internal_link in internal_links
+                ],
+                [
+                    src.page_elements.ExternalLink(*external_link)
+                    for external_link in external_links
+                ]
+            )
+            for key, (internal_links, external_links) in links.items()
+        }
+
+    def load(self, page, sha1):
+        """Load section tree and links of page (if cached).
+
+        :param Page page: page
+        :param str sha1: revision SHA-1
+
+        :returns: whether section tree and links were cached
+        :rtype: bool
+        """
+        try:
+            key = self._get_key(sha1)
+            for i, tier in enumerate(self.tiers):
+                value = tier.get(key)
+                if value is not None:
+                    for tier_ in self.tiers[:i]:
+                        tier_.put(key, value)
+                    self._load(page, value)
+                    return True
+        except Exception as exception:
+            msg = "failed to load parse result\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return False
+
+    def store(self, page, sha1):
+        """Store section tree and links of page (parses all sections).
+
+        :param Page page: page
+        :param str sha1: revision SHA-1
+        """
+        try:
+            key = self._get_key(sha1)
+            value = self._dump(page)
+            for tier in self.tiers:
+                tier.put(key, value)
+        except Exception as exception:
+            msg = "failed to store parse result\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def close(self):
+        """Close parse cache."""
+        for tier in self.tiers:
+            tier.close()
@@ -26,6 +26,7 @@ import argparse
 
 # third party imports
 # library specific imports
+import src.sinks
 
 
 def get_argument_parser():
@@ -40,13 +41,96 @@ def get_argument_parser():
             "input", help="XML document (output of Special:Export)"
         )
         argument_parser.add_argument("xsd", help="XML Schema Definition")
-        argument_parser.add_argument("-o", "--output", help="output file")
+        argument_parser.add_argument(
+            "-o", "--output",
+            help="output file, the pagelinks table is written to an SQLite "
+            "database (.db, .sqlite, .sqlite3), a TSV file (.tsv), a "
+            "MediaWiki SQL file (.sql) or a columnar pagelinks file (.wpl) "
+            "depending on the file extension"
+        )
+        argument_parser.add_argument(
+            "--validation", default="streaming",
+            choices=("streaming", "header-only", "off"),
+            help="validate every page while it is parsed (default), only "
+            "the siteinfo element and the first pages or nothing"
+        )
+        argument_parser.add_argument(
+            "-i", "--index",
+            help="multistream index (bzip2 streams are decompressed in "
+            "parallel)"
+        )
         argument_parser.add_argument(
             "-p", "--processes",
             default=os.cpu_count(), type=int, help="number of processes"
         )
+        argument_parser.add_argument(
+            "--chunksize", default=16, type=int,
+            help="number of pages sent to a process at once"
+        )
+        argument_parser.add_argument(
+            "--unordered", action="store_true",
+            help="output pages in order of completion"
+        )
+        argument_parser.add_argument(
+            "--engine", default="regex", choices=("regex", "pyparsing"),
+            help="find links using regular expressions (default) or the "
+            "pyparsing grammar"
+        )
+        argument_parser.add_argument(
+            "--latest-only", action="store_true",
+            help="only process the latest revision of every page"
+        )
+        argument_parser.add_argument(
+            "--pagelinks-delta", action="store_true",
+            help="output pagelinks added and removed by every revision "
+            "(incrementally, in a single process)"
+        )
+        argument_parser.add_argument(
+            "--cache",
+            help="parse cache (SQLite database), revisions are looked up "
+            "by SHA-1"
+        )
+        argument_parser.add_argument(
+            "--cache-size", default=1024, type=int,
+            help="maximum size of parse cache (MiB)"
+        )
+        argument_parser.add_argument(
+            "--redirects",
+            help="redirect table (SQLite database, built in a single pass "
+            "over the XML document unless it exists), links to redirects "
+            "are resolved (requires an output file of the pagelinks table)"
+        )
+        argument_parser.add_argument(
+            "--skip", default=0, type=int,
+            help="number of revisions to skip"
+        )
+        argument_parser.add_argument(
+            "--limit", type=int, help="maximum number of revisions"
+        )
     except Exception as exception:
         raise RuntimeError(
             "failed to get argument parser\t: {}".format(exception)
         )
     return argument_parser
+
+
+def parse_args(args=None):
+    """Parse command-line arguments.
+
+    --redirects is rejected unless the output file is a pagelinks table
+    (q.v. src.sinks.get_sink), links in the printed output are not
+    resolved.
+
+    :param list args: command-line arguments (default: sys.argv)
+
+    :returns: arguments
+    :rtype: Namespace
+    """
+    argument_parser = get_argument_parser()
+    args = argument_parser.parse_args(args=args)
+    _, extension = os.path.splitext(args.output or "")
+    if args.redirects and extension.lower() not in src.sinks.SINKS:
+        argument_parser.error(
+            "--redirects requires an output file of the pagelinks table"
+        )
+    return args
@@ -0,0 +1,320 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Binary columnar pagelinks file format.
+
+A columnar pagelinks file holds the internal links (namespace and title) of
+a sequence of pages (page ID and namespace). Every column is stored as an
+array of fixed-size integers, titles are indices into a string table, i.e.
+the file can be memory-mapped and the columns read without parsing. The
+file consists of the header and the following columns (each one aligned to
+8 bytes, in native byte order)::
+
+    page_id             int64[pages]
+    page_namespace      int16[pages]
+    link_offset         int64[pages + 1]    links of page i are
+                                            link_offset[i]:link_offset[i+1]
+    namespace           int16[links]
+    title               uint32[links]       index into string table
+    string_offset       int64[strings + 1]  string i is
+                                            strings[string_offset[i]:
+                                            string_offset[i+1]]
+    strings             UTF-8
+"""
+
+
+# standard library imports
+import os
+import sys
+import mmap
+import array
+import shutil
+import struct
+import tempfile
+
+# third party imports
+
+# library specific imports
+
+
+MAGIC = b"WPLINKS\0"
+VERSION = 1
+HEADER = struct.Struct("=8sHHIQQQQ")
+BYTEORDERS = ("little", "big")
+
+
+def _pad(fp):   # pylint: disable=invalid-name
+    """Pad file to multiple of 8 bytes.
+
+    :param file fp: file object
+    """
+    fp.write(b"\0" * (-fp.tell() % 8))
+
+
+class ColumnarWriter():
+    """Columnar pagelinks file writer.
+
+    The page columns and the string table index are kept in memory, the
+    link columns and the strings are spilled to temporary files (in the
+    output file's directory) once batch_size links have been buffered.
+    The file is written on close.
+
+    :ivar str path: columnar pagelinks file
+    :ivar int batch_size: maximum number of links buffered
+    """
+
+    def __init__(self, path, batch_size=65536):
+        """Initialize columnar pagelinks file writer.
+
+        :param str path: columnar pagelinks file
+        :param int batch_size: maximum number of links buffered
+        """
+        try:
+            self.path = path
+            self.batch_size = batch_size
+            directory = os.path.dirname(os.path.abspath(path))
+            self._page_id = array.array("q")
+            self._page_namespace = array.array("h")
+            self._link_offset = array.array("q", [0])
+            self._namespace = array.array("h")
+            self._title = array.array("I")
+            self._string_offset = array.array("q", [0])
+            self._strings = {}
+            self._namespace_fp = tempfile.TemporaryFile(dir=directory)
+            self._title_fp = tempfile.TemporaryFile(dir=directory)
+            self._strings_fp = tempfile.TemporaryFile(dir=directory)
+        except Exception as exception:
+            msg = "failed to initialize columnar writer\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_string(self, string):
+        """Get index of string (added to string table if necessary).
+
+        :param str string: string
+
+        :returns: index
+        :rtype: int
+        """
+        index = self._strings.get(string)
+        if index is None:
+            index = self._strings[string] = len(self._strings)
+            data = string.encode("utf-8")
+            self._strings_fp.write(data)
+            self._string_offset.append(self._string_offset[-1] + len(data))
+        return index
+
+    def _spill(self):
+        """Spill link columns to temporary files."""
+        self._namespace.tofile(self._namespace_fp)
+        self._title.tofile(self._title_fp)
+        del self._namespace[:]
+        del self._title[:]
+
+    def write(self, page_id, page_namespace, links):
+        """Write page.
+
+        :param str page_id: page ID
+        :param str page_namespace: page namespace
+        :param iterable links: links (namespace and title)
+        """
+        try:
+            links_ = self._link_offset[-1]
+            for namespace, title in links:
+                self._namespace.append(int(namespace))
+                self._title.append(self._get_string(title))
+                links_ += 1
+            self._page_id.append(int(page_id))
+            self._page_namespace.append(int(page_namespace))
+            self._link_offset.append(links_)
+            if len(self._namespace) >= self.batch_size:
+                self._spill()
+        except Exception as exception:
+            msg = "failed to write page\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def close(self):
+        """Write columnar pagelinks file."""
+        try:
+            self._spill()
+            with open(self.path, "wb") as fp:  # pylint: disable=invalid-name
+                fp.write(
+                    HEADER.pack(
+                        MAGIC,
+                        VERSION,
+                        BYTEORDERS.index(sys.byteorder),
+                        0,
+                        len(self._page_id),
+                        self._link_offset[-1],
+                        len(self._strings),
+                        self._string_offset[-1]
+                    )
+                )
+                for column in (
+                        self._page_id,
+                        self._page_namespace,
+                        self._link_offset,
+                        self._namespace_fp,
+                        self._title_fp,
+                        self._string_offset,
+                        self._strings_fp
+                ):
+                    if isinstance(column, array.array):
+                        column.tofile(fp)
+                    else:
+                        column.seek(0)
+                        shutil.copyfileobj(column, fp)
+                        column.close()
+                    _pad(fp)
+        except Exception as exception:
+            msg = "failed to close columnar writer\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+
+class ColumnarReader():
+    """Columnar pagelinks file reader.
+
+    The file is memory-mapped, the columns are memoryviews of it (q.v.
+    module docstring), i.e. only the pages and strings accessed are read.
+
+    :ivar str path: columnar pagelinks file
+    :ivar memoryview page_id: page IDs
+    :ivar memoryview page_namespace: page namespaces
+    :ivar memoryview link_offset: link offsets (by page)
+    :ivar memoryview namespace: link namespaces
+    :ivar memoryview title: link titles (string table indices)
+    :ivar memoryview string_offset: string offsets
+    """
+
+    def __init__(self, path):
+        """Initialize columnar pagelinks file reader.
+
+        :param str path: columnar pagelinks file
+        """
+        try:
+            self.path = path
+            self._fp = open(path, "rb")
+            self._mmap = mmap.mmap(
+                self._fp.fileno(), 0, access=mmap.ACCESS_READ
+            )
+            magic, version, byteorder, _, pages, links, strings, size = \
+                HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError("not a columnar pagelinks file")
+            if version != VERSION:
+                raise ValueError("unsupported version {}".format(version))
+            if BYTEORDERS[byteorder] != sys.byteorder:
+                raise ValueError(
+                    "byte order {} is not native".format(BYTEORDERS[byteorder])
+                )
+            self._view = memoryview(self._mmap)
+            self._offset = HEADER.size
+            self.page_id = self._get_column("q", pages)
+            self.page_namespace = self._get_column("h", pages)
+            self.link_offset = self._get_column("q", pages + 1)
+            self.namespace = self._get_column("h", links)
+            self.title = self._get_column("I", links)
+            self.string_offset = self._get_column("q", strings + 1)
+            self._strings = self._get_column("B", size)
+        except Exception as exception:
+            msg = "failed to initialize columnar reader\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.page_id)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.get_page(index)
+
+    def _get_column(self, format_, length):
+        """Get column (next in file).
+
+        :param str format_: format (struct format character)
+        :param int length: number of values
+
+        :returns: column
+        :rtype: memoryview
+        """
+        size = struct.calcsize(format_) * length
+        column = self._view[self._offset:self._offset+size].cast(format_)
+        self._offset += size + (-size % 8)
+        return column
+
+    def get_string(self, index):
+        """Get string.
+
+        :param int index: index
+
+        :returns: string
+        :rtype: str
+        """
+        start = self.string_offset[index]
+        end = self.string_offset[index+1]
+        return str(self._strings[start:end], "utf-8")
+
+    def get_page(self, index):
+        """Get page (by position in file).
+
+        :param int index: index
+
+        :returns: page ID, page namespace and links (namespace and title)
+        :rtype: tuple
+        """
+        try:
+            start = self.link_offset[index]
+            end = self.link_offset[index+1]
+            links = [
+                (namespace, self.get_string(title))
+                for namespace, title in zip(
+                    self.namespace[start:end], self.title[start:end]
+                )
+            ]
+            page = (self.page_id[index], self.page_namespace[index], links)
+        except Exception as exception:
+            msg = "failed to get page\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return page
+
+    def close(self):
+        """Close columnar pagelinks file."""
+        for column in (
+                self.page_id,
+                self.page_namespace,
+                self.link_offset,
+                self.namespace,
+                self.title,
+                self.string_offset,
+                self._strings,
+                self._view
+        ):
+            column.release()
+        self._mmap.close()
+        self._fp.close()
@@ -0,0 +1,184 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Incremental pagelinks extraction across revisions.
+"""
+
+
+# standard library imports
+import hashlib
+import collections
+
+# third party imports
+
+# library specific imports
+import src.page
+import src.page_elements
+
+
+class IncrementalExtractor():
+    """Incremental pagelinks extractor.
+
+    Consecutive revisions of a page usually differ in a few sections, i.e.
+    the links of a section are only scanned if the section's wikitext
+    (by SHA-1 hash) is not part of a previously seen revision of the page.
+    The pagelinks of a revision are compared with those of its parent
+    revision (by parentid), revisions whose SHA-1 is the same as the
+    parent's are not parsed at all.
+
+    The caches only hold the revisions of the current page, at most size
+    revisions are kept.
+
+    :ivar Parser parser: wikitext parser
+    :ivar int size: maximum number of revisions cached
+    """
+
+    def __init__(self, parser, size=64):
+        """Initialize incremental pagelinks extractor.
+
+        :param Parser parser: wikitext parser
+        :param int size: maximum number of revisions cached
+        """
+        try:
+            self.parser = parser
+            self.size = size
+            self._id = None
+            self._revisions = collections.OrderedDict()
+            self._sections = {}
+        except Exception as exception:
+            msg = "failed to initialize incremental extractor\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _reset(self, id_):
+        """Reset caches (for new page).
+
+        :param str id_: page ID
+        """
+        self._id = id_
+        self._revisions.clear()
+        self._sections.clear()
+
+    def _create_pagelinks_table(self, page):
+        """Create pagelinks table (reusing the rows of unchanged
+        sections, the changed sections are extracted at once).
+
+        :param Page page: page
+
+        :returns: pagelinks table rows (section hashes and rows)
+        :rtype: tuple
+        """
+        # pylint: disable=protected-access
+        wikitexts = [
+            section.wikitext
+            for section in page._search_depth_first(page.section)
+        ]
+        digests = [
+            hashlib.sha1(wikitext.encode("utf-8")).digest()
+            for wikitext in wikitexts
+        ]
+        missing = {}
+        for digest, wikitext in zip(digests, wikitexts):
+            if digest not in self._sections:
+                missing[digest] = wikitext
+        pagelinks_tables = page.create_pagelinks_tables(
+            list(missing.values())
+        )
+        self._sections.update(zip(missing, pagelinks_tables))
+        rows = set()
+        for digest in digests:
+            rows.update(self._sections[digest])
+        return digests, frozenset(rows)
+
+    def _evict(self):
+        """Evict least recently used revisions (and sections no longer
+        part of any cached revision)."""
+        if len(self._revisions) > self.size:
+            while len(self._revisions) > self.size:
+                self._revisions.popitem(last=False)
+            digests = set()
+            for _, section_digests, _ in self._revisions.values():
+                digests.update(section_digests)
+            for digest in list(self._sections):
+                if digest not in digests:
+                    del self._sections[digest]
+
+    def extract(self, page_element, revision_element):
+        """Extract pagelinks delta (relative to parent revision).
+
+        :param PageRecord page_element: page element
+        :param RevisionRecord revision_element: revision element (id,
+            parentid, text and, optionally, sha1)
+
+        :returns: pagelinks delta (parentid is None if the parent revision
+            is unknown, i.e. all pagelinks are added)
+        :rtype: PagelinksDelta
+        """
+        try:
+            if page_element.id != self._id:
+                self._reset(page_element.id)
+            parent = self._revisions.get(revision_element.parentid)
+            if parent is not None:
+                self._revisions.move_to_end(revision_element.parentid)
+            sha1 = revision_element.sha1
+            if parent is not None and sha1 and parent[0] == sha1:
+                digests, rows = parent[1], parent[2]
+            else:
+                page = src.page.Page(
+                    page_element.title,
+                    page_element.id,
+                    page_element.ns,
+                    revision_element.id,
+                    revision_element.text.text,
+                    self.parser
+                )
+                digests, rows = self._create_pagelinks_table(page)
+            self._revisions[revision_element.id] = (sha1, digests, rows)
+            self._evict()
+            if parent is None:
+                parentid = None
+                parent_rows = frozenset()
+            else:
+                parentid = revision_element.parentid
+                parent_rows = parent[2]
+            pagelinks_delta = src.page_elements.PagelinksDelta(
+                revision_element.id,
+                parentid,
+                sorted(rows - parent_rows),
+                sorted(parent_rows - rows)
+            )
+        except Exception as exception:
+            msg = "failed to extract pagelinks delta\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return pagelinks_delta
+
+
+def find_pagelinks_deltas(revision_elements, parser, size=64):
+    """Find pagelinks deltas.
+
+    :param iterable revision_elements: page and revision elements (in
+        order of the export file)
+    :param Parser parser: wikitext parser
+    :param int size: maximum number of revisions cached
+
+    :returns: pagelinks deltas
+    :rtype: generator
+    """
+    incremental_extractor = IncrementalExtractor(parser, size=size)
+    for page_element, revision_element in revision_elements:
+        yield incremental_extractor.extract(page_element, revision_element)
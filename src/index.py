@@ -0,0 +1,243 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Indexed Wikipedia export file parser.
+
+The page index (an SQLite database next to the export file) holds the byte
+offset of every page element by title and by page ID, i.e. a page is looked
+up without parsing the pages preceding it. The index is built in a single
+pass over the (uncompressed) export file.
+"""
+
+
+# standard library imports
+import re
+import html
+import mmap
+import logging
+import sqlite3
+
+# third party imports
+import lxml.etree
+
+# library specific imports
+import src.xml
+
+
+PAGE_REGEX = re.compile(rb"<page>")
+HEADER_REGEX = re.compile(
+    rb"<page>\s*<title>([^<]*)</title>\s*<ns>(-?\d+)</ns>\s*<id>(\d+)</id>"
+)
+
+
+def find_page_offsets(xml):
+    """Find byte offsets of page elements.
+
+    :param str xml: XML file (uncompressed)
+
+    :returns: title, ns, page ID and offset
+    :rtype: generator
+    """
+    with open(xml, "rb") as fp:  # pylint: disable=invalid-name
+        magic_number = fp.read(6)
+        for prefix, _ in src.xml.COMPRESSIONS:
+            if magic_number.startswith(prefix):
+                raise ValueError("{} is compressed".format(xml))
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for page in PAGE_REGEX.finditer(buffer):
+                offset = page.start()
+                match = HEADER_REGEX.match(buffer, offset)
+                if match is None:
+                    msg = "malformed page element at byte {}".format(offset)
+                    raise ValueError(msg)
+                title, ns, id_ = match.groups()
+                yield (
+                    html.unescape(title.decode("utf-8")),
+                    ns.decode("ascii"),
+                    id_.decode("ascii"),
+                    offset
+                )
+
+
+def read_page(xml, offset, size=65536):
+    """Read page element.
+
+    :param str xml: XML file (uncompressed)
+    :param int offset: byte offset of page element
+    :param int size: number of bytes read at once
+
+    :returns: page element
+    :rtype: bytes
+    """
+    data = bytearray()
+    with open(xml, "rb") as fp:  # pylint: disable=invalid-name
+        fp.seek(offset)
+        end = -1
+        while end < 0:
+            chunk = fp.read(size)
+            if not chunk:
+                msg = "page element at byte {} is truncated".format(offset)
+                raise EOFError(msg)
+            start = max(0, len(data) - len("</page>"))
+            data += chunk
+            end = data.find(b"</page>", start)
+    return bytes(data[:end+len("</page>")])
+
+
+class IndexedExportFileParser(src.xml.ExportFileParser):
+    """Indexed Wikipedia export file parser.
+
+    Pages are looked up by title or page ID in the page index and parsed
+    from their byte offset, i.e. the time a lookup takes does not depend
+    on the size of the export file.
+
+    :ivar str index: page index (SQLite database)
+    """
+
+    def __init__(self, xml, xsd, index=None, validation=None):
+        """Initialize indexed Wikipedia export file parser.
+
+        :param str xml: XML file (uncompressed)
+        :param str xsd: XSD (None: do not validate)
+        :param str index: page index (default: XML file + ".index.db")
+        :param str validation: validation mode (default: streaming)
+        """
+        try:
+            super().__init__(
+                xml, xsd, streaming=True, validation=validation
+            )
+            if index is None:
+                index = xml + ".index.db"
+            self.index = index
+            self._connection = sqlite3.connect(index, isolation_level=None)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS page_index "
+                "(title TEXT, ns INTEGER, id INTEGER PRIMARY KEY, "
+                "offset INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS page_index_title "
+                "ON page_index (title)"
+            )
+        except Exception as exception:
+            msg = "failed to initialize indexed export file parser\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def build_index(self):
+        """Build page index (in a single pass over the export file).
+
+        :returns: number of pages
+        :rtype: int
+        """
+        try:
+            logger = logging.getLogger().getChild(__name__)
+            logger.info("building page index")
+            self._connection.execute("BEGIN")
+            self._connection.execute("DELETE FROM page_index")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO page_index VALUES (?, ?, ?, ?)",
+                (
+                    (title, int(ns), int(id_), offset)
+                    for title, ns, id_, offset in find_page_offsets(self.xml)
+                )
+            )
+            self._connection.execute("COMMIT")
+            pages = self._connection.execute(
+                "SELECT COUNT(*) FROM page_index"
+            ).fetchone()[0]
+            logger.info("%d pages indexed", pages)
+        except Exception as exception:
+            if self._connection.in_transaction:
+                self._connection.execute("ROLLBACK")
+            msg = "failed to build page index\t: {}".format(exception)
+            raise RuntimeError(msg)
+        return pages
+
+    def _find_offset(self, title=None, id_=None):
+        """Find byte offset of page element (builds the page index if it
+        is empty).
+
+        :param str title: title
+        :param str id_: page ID
+
+        :returns: offset (None: no such page)
+        :rtype: int
+        """
+        row = self._connection.execute(
+            "SELECT 1 FROM page_index LIMIT 1"
+        ).fetchone()
+        if row is None:
+            self.build_index()
+        if title is not None:
+            row = self._connection.execute(
+                "SELECT offset FROM page_index WHERE title = ?", (title,)
+            ).fetchone()
+        else:
+            row = self._connection.execute(
+                "SELECT offset FROM page_index WHERE id = ?", (int(id_),)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def get_page(self, title=None, id_=None, prop=("title", "ns", "id")):
+        """Get page element by title or page ID.
+
+        The title or page ID of the page parsed is checked against the one
+        looked up, i.e. stale page indices fail (build the index again).
+
+        :param str title: title
+        :param str id_: page ID
+        :param tuple prop: properties
+
+        :returns: page element
+        :rtype: PageRecord or None
+        """
+        try:
+            offset = self._find_offset(title=title, id_=id_)
+            page_element = None
+            if offset is not None:
+                root = lxml.etree.fromstring(
+                    b"".join(
+                        (
+                            '<mediawiki xmlns="{}">'.format(
+                                self._namespace
+                            ).encode("utf-8"),
+                            read_page(self.xml, offset),
+                            b"</mediawiki>"
+                        )
+                    )
+                )
+                element = root.find(self._tag("page"))
+                if title is not None:
+                    tag, value = self._tag("title"), title
+                else:
+                    tag, value = self._tag("id"), id_
+                if element.findtext(tag) != value:
+                    msg = "page index {} is stale".format(self.index)
+                    raise ValueError(msg)
+                page_element = self._find_page_element(prop, element)
+        except Exception as exception:
+            msg = "failed to get page element\t: {}".format(exception)
+            raise RuntimeError(msg)
+        return page_element
+
+    def close(self):
+        """Close page index."""
+        self._connection.close()
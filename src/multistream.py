@@ -0,0 +1,404 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+:synopsis: Multistream Wikipedia export file parser.
+
+Multistream database dumps (pages-articles-multistream.xml.bz2) are
+concatenated bzip2 streams of (usually) 100 page elements each, the index
+(pages-articles-multistream-index.txt.bz2) has a line
+``offset:page_id:title`` per page, offset being the byte offset of the
+bzip2 stream containing the page.
+"""
+
+
+# standard library imports
+import bz2
+import logging
+import sqlite3
+import multiprocessing
+
+# third party imports
+import lxml.etree
+
+# library specific imports
+import src.xml
+import src.pipeline
+
+
+_EXPORT_FILE_PARSER = None
+_PROP = None
+_LATEST_ONLY = False
+
+
+def _initialize(xml, xsd, index, validation, prop, latest_only):
+    """Initialize worker process.
+
+    :param str xml: XML file
+    :param str xsd: XSD (None: do not validate)
+    :param str index: multistream index
+    :param str validation: validation mode
+    :param tuple prop: properties
+    :param bool latest_only: toggle latest revision only on/off
+    """
+    # pylint: disable=global-statement
+    global _EXPORT_FILE_PARSER, _PROP, _LATEST_ONLY
+    _EXPORT_FILE_PARSER = MultistreamExportFileParser(
+        xml, xsd, index, validation=validation
+    )
+    _PROP = prop
+    _LATEST_ONLY = latest_only
+
+
+def _find_stream_page_elements(offset):
+    """Find page elements of bzip2 stream (in worker process).
+
+    :param int offset: byte offset of bzip2 stream
+
+    :returns: page elements
+    :rtype: list
+    """
+    # pylint: disable=protected-access
+    return _EXPORT_FILE_PARSER._find_stream_page_elements(
+        _PROP, offset, latest_only=_LATEST_ONLY
+    )
+
+
+def read_index(index):
+    """Read multistream index.
+
+    :param str index: multistream index (may be compressed)
+
+    :returns: offset, page ID and title
+    :rtype: generator
+    """
+    with src.xml.open_export_file(index) as fp:  # pylint: disable=C0103
+        for line in fp:
+            offset, id_, title = line.decode("utf-8").rstrip("\n").split(
+                ":", 2
+            )
+            yield int(offset), id_, title
+
+
+def find_offsets(index):
+    """Find byte offsets of bzip2 streams (in order).
+
+    :param str index: multistream index (may be compressed)
+
+    :returns: byte offsets
+    :rtype: generator
+    """
+    previous_offset = None
+    for offset, _, _ in read_index(index):
+        if offset != previous_offset:
+            yield offset
+            previous_offset = offset
+
+
+def read_stream(xml, offset, size=65536):
+    """Read (and decompress) bzip2 stream.
+
+    :param str xml: XML file
+    :param int offset: byte offset of bzip2 stream
+    :param int size: number of bytes read at once
+
+    :returns: decompressed stream
+    :rtype: bytes
+    """
+    decompressor = bz2.BZ2Decompressor()
+    data = []
+    with open(xml, "rb") as fp:  # pylint: disable=invalid-name
+        fp.seek(offset)
+        while not decompressor.eof:
+            compressed_data = fp.read(size)
+            if not compressed_data:
+                msg = "bzip2 stream at {} is truncated".format(offset)
+                raise EOFError(msg)
+            data.append(decompressor.decompress(compressed_data))
+    return b"".join(data)
+
+
+def parse_stream(xml, offset, namespace):
+    """Parse page elements of bzip2 stream.
+
+    :param str xml: XML file
+    :param int offset: byte offset of bzip2 stream
+    :param str namespace: export file namespace (URI)
+
+    :returns: page elements
+    :rtype: list
+    """
+    data = read_stream(xml, offset)
+    data = data.replace(b"</mediawiki>", b"")
+    root = lxml.etree.fromstring(
+        b"".join(
+            (
+                '<mediawiki xmlns="{}">'.format(namespace).encode("utf-8"),
+                data,
+                b"</mediawiki>"
+            )
+        )
+    )
+    return root.findall("{{{}}}page".format(namespace))
+
+
+class MultistreamExportFileParser(src.xml.ExportFileParser):
+    """Multistream Wikipedia export file parser.
+
+    Pages are looked up by title or page ID in the multistream index and
+    parsed from the bzip2 stream containing them, i.e. only this stream is
+    decompressed. The offsets are looked up in an SQLite database built
+    from the multistream index on first lookup (keyed like the page index
+    of src.index), i.e. the index is decompressed only once and never held
+    in memory.
+
+    When finding page elements using more than one process, the bzip2
+    streams are decompressed, parsed and (streaming validation) validated
+    page by page in worker processes.
+
+    :ivar str xsd: XSD
+    :ivar str index: multistream index
+    :ivar str database: offsets (SQLite database)
+    """
+
+    def __init__(self, xml, xsd, index, validation=None, database=None):
+        # pylint: disable=too-many-arguments
+        """Initialize multistream Wikipedia export file parser.
+
+        :param str xml: XML file
+        :param str xsd: XSD (None: do not validate)
+        :param str index: multistream index
+        :param str validation: validation mode (default: streaming)
+        :param str database: offsets (SQLite database, default:
+            multistream index + ".db")
+        """
+        try:
+            super().__init__(
+                xml, xsd, streaming=True, validation=validation
+            )
+            if database is None:
+                database = index + ".db"
+            self.xsd = xsd
+            self.index = index
+            self.database = database
+            self._connection = None
+        except Exception as exception:
+            msg = "failed to initialize multistream export file parser\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    @property
+    def namespace(self):
+        """Export file namespace (URI).
+
+        :returns: namespace
+        :rtype: str
+        """
+        return self._namespace
+
+    def build_index(self):
+        """Build offsets database (in a single pass over the multistream
+        index).
+
+        :returns: number of pages
+        :rtype: int
+        """
+        try:
+            logger = logging.getLogger().getChild(__name__)
+            logger.info("building multistream offsets database")
+            self._connect()
+            self._connection.execute("BEGIN")
+            self._connection.execute("DELETE FROM stream_index")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO stream_index VALUES (?, ?, ?)",
+                (
+                    (title, int(id_), offset)
+                    for offset, id_, title in read_index(self.index)
+                )
+            )
+            self._connection.execute("COMMIT")
+            pages = self._connection.execute(
+                "SELECT COUNT(*) FROM stream_index"
+            ).fetchone()[0]
+            logger.info("%d pages indexed", pages)
+        except Exception as exception:
+            if self._connection.in_transaction:
+                self._connection.execute("ROLLBACK")
+            msg = "failed to build offsets database\t: {}".format(exception)
+            raise RuntimeError(msg)
+        return pages
+
+    def _connect(self):
+        """Connect to offsets database."""
+        if self._connection is not None:
+            return
+        self._connection = sqlite3.connect(
+            self.database, isolation_level=None
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS stream_index "
+            "(title TEXT, id INTEGER PRIMARY KEY, offset INTEGER)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS stream_index_title "
+            "ON stream_index (title)"
+        )
+
+    def _find_offset(self, title=None, id_=None):
+        """Find byte offset of bzip2 stream containing page (by title or
+        page ID, builds the offsets database if it is empty).
+
+        :param str title: title
+        :param str id_: page ID
+
+        :returns: byte offset (None: page not in index)
+        :rtype: int
+        """
+        self._connect()
+        row = self._connection.execute(
+            "SELECT 1 FROM stream_index LIMIT 1"
+        ).fetchone()
+        if row is None:
+            self.build_index()
+        if title is not None:
+            row = self._connection.execute(
+                "SELECT offset FROM stream_index WHERE title = ?", (title,)
+            ).fetchone()
+        else:
+            row = self._connection.execute(
+                "SELECT offset FROM stream_index WHERE id = ?", (int(id_),)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def _find_stream_page_elements(self, prop, offset, latest_only=False):
+        """Find page elements of bzip2 stream.
+
+        :param tuple prop: properties
+        :param int offset: byte offset of bzip2 stream
+        :param bool latest_only: toggle latest revision only on/off
+
+        :returns: page elements
+        :rtype: list
+        """
+        page_elements = []
+        for element in parse_stream(self.xml, offset, self.namespace):
+            if self._xmlschema is not None:
+                self._validate_elements(
+                    self._xmlschema, self._root, [element]
+                )
+            page_elements.append(
+                self._find_page_element(
+                    prop, element, latest_only=latest_only
+                )
+            )
+        return page_elements
+
+    def find_page_elements(
+            self, prop=("title", "ns", "id"), latest_only=False, processes=1
+    ):
+        """Find page elements.
+
+        :param tuple prop: properties
+        :param bool latest_only: toggle latest revision only on/off
+        :param int processes: number of processes
+
+        :returns: page elements
+        :rtype: generator
+        """
+        try:
+            if processes > 1:
+                generator = self._find_page_elements_in_parallel(
+                    prop, processes, latest_only
+                )
+            else:
+                generator = super().find_page_elements(
+                    prop=prop, latest_only=latest_only
+                )
+        except Exception as exception:
+            msg = "failed to find page elements\t: {}".format(exception)
+            raise RuntimeError(msg)
+        return generator
+
+    def _find_page_elements_in_parallel(self, prop, processes, latest_only):
+        """Find page elements (bzip2 streams are decompressed and parsed in
+        worker processes).
+
+        :param tuple prop: properties
+        :param int processes: number of processes
+        :param bool latest_only: toggle latest revision only on/off
+
+        :returns: page elements
+        :rtype: generator
+        """
+        with multiprocessing.Pool(
+            processes,
+            initializer=_initialize,
+            initargs=(
+                self.xml, self.xsd, self.index, self.validation, prop,
+                latest_only
+            )
+        ) as pool:
+            for page_elements in src.pipeline.imap_bounded(
+                    pool, _find_stream_page_elements,
+                    find_offsets(self.index), 2*processes
+            ):
+                yield from page_elements
+
+    def get_page(self, title=None, id_=None, prop=("title", "ns", "id")):
+        """Get page element by title or page ID.
+
+        The page is looked for in the bzip2 stream at the offset found, i.e.
+        stale offsets databases fail (build the database again).
+
+        :param str title: title
+        :param str id_: page ID
+        :param tuple prop: properties
+
+        :returns: page element
+        :rtype: PageRecord or None
+        """
+        try:
+            offset = self._find_offset(title=title, id_=id_)
+            if title is not None:
+                tag, value = self._tag("title"), title
+            else:
+                tag, value = self._tag("id"), id_
+            page_element = None
+            if offset is not None:
+                elements = parse_stream(self.xml, offset, self.namespace)
+                for element in elements:
+                    if element.findtext(tag) == value:
+                        if self._xmlschema is not None:
+                            self._validate_elements(
+                                self._xmlschema, self._root, [element]
+                            )
+                        page_element = self._find_page_element(prop, element)
+                        break
+                else:
+                    msg = "offsets database {} is stale".format(self.database)
+                    raise ValueError(msg)
+        except Exception as exception:
+            msg = "failed to get page element\t: {}".format(exception)
+            raise RuntimeError(msg)
+        return page_element
+
+    def close(self):
+        """Close offsets database."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
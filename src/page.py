@@ -26,6 +26,8 @@ import json
 # third party imports
 
 # library specific imports
+import src.titles
+import src.page_elements
 
 
 class Page():
@@ -37,6 +39,9 @@ class Page():
     :ivar str revision_id: revision id
     :ivar str wikitext: wikitext
     :ivar Parser parser: wikitext parser
+
+    The section tree and the links of every section are parsed on first
+    use and cached until the wikitext is replaced.
     """
 
     def __init__(self, title, id_, ns, revision_id, wikitext, parser):
@@ -55,6 +60,7 @@ class Page():
             self.id_ = id_
             self.ns = ns    # pylint: disable=invalid-name
             self.revision_id = revision_id
+            self._section = None
             self.wikitext = wikitext
             self.parser = parser
         except Exception as exception:
@@ -80,20 +86,42 @@ class Page():
             msg = "failed to do depth-first search:{}".format(exception)
             raise RuntimeError(msg)
 
+    @property
+    def wikitext(self):
+        """Wikitext.
+
+        :returns: wikitext
+        :rtype: str
+        """
+        return self._wikitext
+
+    @wikitext.setter
+    def wikitext(self, wikitext):
+        """Set wikitext (invalidates section tree).
+
+        :param str wikitext: wikitext
+        """
+        self._wikitext = wikitext
+        self._section = None
+        self._links = {}
+
     @property
     def section(self):
         """(Root) section.
 
         :returns: section
-        :rtype: Section
+        :rtype: SectionSpan
         """
         try:
-            section = self.parser.find_sections(self.wikitext, level=2)
-            section = section._replace(heading=self.title)
+            if self._section is None:
+                section = self.parser.find_section_spans(
+                    self.wikitext, level=2
+                )
+                self._section = section._replace(heading=self.title)
         except Exception as exception:
             msg = "failed to find section:{}".format(exception)
             raise RuntimeError(msg)
-        return section
+        return self._section
 
     def find_paragraphs(self, section=None):
         """Find paragraphs.
@@ -223,18 +251,82 @@ class Page():
             raise RuntimeError(msg)
         return internal_links
 
-    def create_pagelinks_table_rows(self, wikitext):
+    def find_section_links(self, section):
+        """Find internal and external links of section (cached).
+
+        :param SectionSpan section: section
+
+        :returns: internal and external links
+        :rtype: tuple
+        """
+        try:
+            key = (section.start, section.end)
+            links = self._links.get(key)
+            if links is None:
+                links = self._links[key] = self.parser.find_links(
+                    section.buffer, start=section.start, end=section.end
+                )
+            elif links[1] is None:
+                links = self._links[key] = (
+                    links[0],
+                    self.parser.find_external_links(
+                        section.wikitext, engine=self.parser.engine
+                    )
+                )
+        except Exception as exception:
+            msg = "failed to find section links:{}".format(exception)
+            raise RuntimeError(msg)
+        return links
+
+    def extract(self):
+        """Extract sections, internal and external links at once.
+
+        The section tree is found in a single pass over the wikitext, then
+        the links of every section are found in the section's wikitext
+        (q.v. Parser.find_links), i.e. headings are skipped and the links
+        are tagged with the section they have been found in. The links are
+        cached (q.v. find_section_links).
+
+        :returns: section, internal and external links
+        :rtype: Extraction
+        """
+        try:
+            internal_links = []
+            external_links = []
+            for section in self._search_depth_first(self.section):
+                section_internal_links, section_external_links = \
+                    self.find_section_links(section)
+                internal_links += (
+                    src.page_elements.SectionLink(section, internal_link)
+                    for internal_link in section_internal_links
+                )
+                external_links += (
+                    src.page_elements.SectionLink(section, external_link)
+                    for external_link in section_external_links
+                )
+            extraction = src.page_elements.Extraction(
+                self.section, internal_links, external_links
+            )
+        except Exception as exception:
+            msg = "failed to extract:{}".format(exception)
+            raise RuntimeError(msg)
+        return extraction
+
+    def create_pagelinks_table_rows(self, wikitext, internal_links=None):
         """Create pagelinks table rows
         (q.v. https://www.mediawiki.org/wiki/Special:MyLanguage/
         Manual:Pagelinks_table).
 
         :param str wikitext: wikitext
+        :param list internal_links: internal links (found in wikitext
+            unless given)
 
         :returns: pagelinks table rows
         :rtype: list
         """
         try:
-            internal_links = self.find_internal_links(wikitext)
+            if internal_links is None:
+                internal_links = self.find_internal_links(wikitext)
             pl_from = self.id_
             pl_from_namespace = self.ns
             rows = []
@@ -248,20 +340,99 @@ class Page():
             raise RuntimeError(msg)
         return rows
 
-    def create_pagelinks_table(self):
+    def create_pagelinks_tables(self, wikitexts):
+        """Create pagelinks table rows of several wikitexts at once
+        (q.v. Parser.extract_many).
+
+        :param list wikitexts: wikitexts
+
+        :returns: pagelinks table rows (by wikitext)
+        :rtype: list
+        """
+        try:
+            pl_from = self.id_
+            pl_from_namespace = self.ns
+            pagelinks_tables = [[] for _ in wikitexts]
+            columns = self.parser.extract_many(wikitexts)
+            for source, pl_namespace, pl_title in zip(
+                    columns.source, columns.namespace, columns.page_name
+            ):
+                pagelinks_tables[source].append(
+                    (pl_from, pl_from_namespace, str(pl_namespace), pl_title)
+                )
+        except Exception as exception:
+            msg = "failed to create pagelinks tables:{}".format(exception)
+            raise RuntimeError(msg)
+        return pagelinks_tables
+
+    def _find_internal_links_at_once(self, sections):
+        """Find internal links of several sections at once (q.v.
+        Parser.extract_many) and cache them (q.v. find_section_links,
+        the external links are found on demand).
+
+        :param list sections: sections
+        """
+        internal_links = [[] for _ in sections]
+        columns = self.parser.extract_many(sections)
+        for source, namespace, page_name, link_text in zip(*columns):
+            internal_links[source].append(
+                src.page_elements.InternalLink(
+                    str(namespace), page_name, link_text
+                )
+            )
+        for section, section_internal_links in zip(sections, internal_links):
+            self._links[(section.start, section.end)] = (
+                section_internal_links, None
+            )
+
+    def create_pagelinks_table(self, normalize=False, table=None):
         """Create pagelinks table
         (q.v. https://www.mediawiki.org/wiki/Special:MyLanguage/
         Manual:Pagelinks_table).
 
+        The internal links of sections whose links have not been found yet
+        are extracted at once and cached (q.v. Parser.extract_many), i.e.
+        they are not found again when storing the page in the parse cache
+        (q.v. ParseCache).
+
+        Given normalize, the rows are (pl_from, pl_from_namespace, title ID),
+        the normalised titles (q.v. src.titles) are interned in the intern
+        table and deduplicated by their IDs, links to anchors on the page
+        itself are dropped.
+
+        :param bool normalize: toggle title normalisation on/off
+        :param TitleTable table: intern table (default: intern table of
+            this process, q.v. src.titles.get_title_table)
+
         :returns: pagelinks table
         :rtype: list
         """
         try:
+            sections = list(self._search_depth_first(self.section))
+            self._find_internal_links_at_once(
+                [
+                    section for section in sections
+                    if (section.start, section.end) not in self._links
+                ]
+            )
             pagelinks_table = []
-            for section in self._search_depth_first(self.section):
+            for section in sections:
+                internal_links, _ = self._links[(section.start, section.end)]
                 pagelinks_table += self.create_pagelinks_table_rows(
-                    section.wikitext
+                    section.wikitext, internal_links=internal_links
+                )
+            if normalize:
+                title_normalizer = src.titles.get_title_normalizer(
+                    self.parser.namespaces, aliases=self.parser.aliases
+                )
+                if table is None:
+                    table = src.titles.get_title_table()
+                ids = dict.fromkeys(
+                    title_normalizer.get_id(pl_namespace, pl_title, table)
+                    for _, _, pl_namespace, pl_title in pagelinks_table
                 )
+                ids.pop(None, None)
+                pagelinks_table = [(self.id_, self.ns, id_) for id_ in ids]
         except Exception as exception:
             msg = "failed to create pagelinks table:{}".format(exception)
             raise RuntimeError(msg)
@@ -276,7 +447,9 @@ class Page():
         :rtype: list
         """
         try:
-            external_links = self.parser.find_external_links(wikitext)
+            external_links = self.parser.find_external_links(
+                wikitext, engine=self.parser.engine
+            )
         except Exception as exception:
             msg = "failed to find external_links:{}".format(exception)
             raise RuntimeError(msg)
@@ -22,6 +22,7 @@
 
 # standard library imports
 import collections
+import collections.abc
 
 # third party imports
 # library specific imports
@@ -39,6 +40,78 @@ class Section(_Section):    # pylint: disable=missing-docstring
         return "{}\n{}".format(self.heading, self.wikitext)
 
 
+class Subsections(collections.abc.Sequence):
+    """Subsections (expanded on first access).
+
+    :ivar callable expand: function returning list of subsections
+    """
+
+    def __init__(self, expand):
+        """Initialize subsections.
+
+        :param callable expand: function returning list of subsections
+        """
+        self.expand = expand
+        self._subsections = None
+
+    @property
+    def subsections(self):
+        """Subsections.
+
+        :returns: subsections
+        :rtype: list
+        """
+        if self._subsections is None:
+            self._subsections = self.expand()
+            self.expand = None
+        return self._subsections
+
+    def __getitem__(self, index):
+        return self.subsections[index]
+
+    def __len__(self):
+        return len(self.subsections)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(self.subsections)
+
+    def __reduce__(self):
+        return (list, (self.subsections,))
+
+
+_SectionSpan = collections.namedtuple(
+    "SectionSpan",
+    [
+        "level", "heading", "buffer", "start", "end",
+        "heading_start", "heading_end", "subsections"
+    ]
+)
+
+
+class SectionSpan(_SectionSpan):
+    """Section stored as offsets into the page's wikitext.
+
+    ``buffer[start:end]`` is the section's own wikitext (without its
+    subsections), ``buffer[heading_start:heading_end]`` its heading markup.
+    """
+    __slots__ = ()
+
+    @property
+    def wikitext(self):
+        """Wikitext (sliced on demand).
+
+        :returns: wikitext
+        :rtype: str
+        """
+        return self.buffer[self.start:self.end]
+
+    def __repr__(self):
+        return "{}\n{}".format(self.heading, self.wikitext)
+
+
 _Paragraph = collections.namedtuple("Paragraph", ["index", "wikitext"])
 
 
@@ -75,3 +148,134 @@ class ExternalLink(_ExternalLink):  # pylint: disable=missing-docstring
 
     def __format__(self, format_spec):
         return self.link_text
+
+
+_InternalLinkColumns = collections.namedtuple(
+    "InternalLinkColumns", ["source", "namespace", "page_name", "link_text"]
+)
+
+
+class InternalLinkColumns(_InternalLinkColumns):
+    """Internal links of several wikitexts stored column by column.
+
+    ``source[i]`` is the index of the wikitext the i-th link was found in,
+    ``namespace[i]`` its namespace ID, ``page_name[i]`` and ``link_text[i]``
+    its page name and link text.
+    """
+    __slots__ = ()
+
+
+_SectionLink = collections.namedtuple("SectionLink", ["section", "link"])
+
+
+class SectionLink(_SectionLink):    # pylint: disable=missing-docstring
+    __slots__ = ()
+
+    def __repr__(self):
+        return repr(self.link)
+
+
+_Extraction = collections.namedtuple(
+    "Extraction", ["section", "internal_links", "external_links"]
+)
+
+
+class Extraction(_Extraction):  # pylint: disable=missing-docstring
+    __slots__ = ()
+
+
+class _Record():
+    """Dict-compatible access to records (by field name).
+
+    Fields which are not part of the projection are None.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            value = getattr(self, key, None)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return super().__getitem__(key)  # pylint: disable=no-member
+
+    def get(self, key, default=None):
+        """Get field (dict-compatible).
+
+        :param str key: field name
+        :param default: default value
+
+        :returns: value
+        """
+        value = getattr(self, key, None)
+        if value is None:
+            return default
+        return value
+
+    def keys(self):
+        """Get field names (dict-compatible).
+
+        :returns: field names (part of the projection)
+        :rtype: list
+        """
+        return [
+            field for field in self._fields     # pylint: disable=no-member
+            if getattr(self, field) is not None
+        ]
+
+
+_PageRecord = collections.namedtuple(
+    "PageRecord", ["title", "ns", "id", "redirect", "revision"]
+)
+_PageRecord.__new__.__defaults__ = (None,) * len(_PageRecord._fields)
+
+
+class PageRecord(_Record, _PageRecord):  # pylint: disable=missing-docstring
+    __slots__ = ()
+
+
+_RevisionRecord = collections.namedtuple(
+    "RevisionRecord",
+    [
+        "id", "parentid", "timestamp", "contributor", "minor", "comment",
+        "model", "format", "text", "sha1"
+    ]
+)
+_RevisionRecord.__new__.__defaults__ = (None,) * len(_RevisionRecord._fields)
+
+
+class RevisionRecord(_Record, _RevisionRecord):  # pylint: disable=C0111
+    __slots__ = ()
+
+
+_Contributor = collections.namedtuple(
+    "Contributor", ["username", "id", "ip", "deleted"]
+)
+_Contributor.__new__.__defaults__ = (None,) * len(_Contributor._fields)
+
+
+class Contributor(_Record, _Contributor):  # pylint: disable=missing-docstring
+    __slots__ = ()
+
+
+_Text = collections.namedtuple("Text", ["text", "deleted", "id", "bytes"])
+
+
+class Text(_Record, _Text):     # pylint: disable=missing-docstring
+    __slots__ = ()
+
+
+_PagelinksDelta = collections.namedtuple(
+    "PagelinksDelta", ["revision_id", "parentid", "added", "removed"]
+)
+
+
+class PagelinksDelta(_PagelinksDelta):  # pylint: disable=missing-docstring
+    __slots__ = ()
+
+    def __repr__(self):
+        return "\n".join(
+            ["{} {}".format(self.revision_id, self.parentid or "-")]
+            + ["+ {}".format(row) for row in self.added]
+            + ["- {}".format(row) for row in self.removed]
+        )
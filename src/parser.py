@@ -21,6 +21,9 @@
 
 
 # standard library imports
+import array
+import bisect
+import functools
 
 # third party imports
 
@@ -33,23 +36,108 @@ import src.parser_elements.layout
 class Parser():
     """Wikitext parser.
 
+    The link parser elements are built once per namespace set and shared by
+    all wikitext parsers using the same namespaces.
+
+    Links are either found by the pyparsing parser elements or by the
+    equivalent regular expressions (engine), both yield the same links.
+    Namespaces and their aliases are looked up in the same namespace index
+    (q.v. links.get_namespace_index).
+
+    VERSION has to be incremented whenever the output of the wikitext
+    parser changes (invalidates cached parse results).
+
+    :cvar int VERSION: version
+    :cvar tuple ENGINES: engines
+    :cvar dict GRAMMARS: parser elements (by namespaces, flag, engine and
+        aliases)
+    :cvar dict EXTERNAL_LINKS: external_link parser element and regular
+        expression (by engine, external links do not depend on namespaces)
     :ivar dict namespaces: namespaces
     :ivar bool flag: toggle debug messages on/off
+    :ivar str engine: engine
+    :ivar dict aliases: namespace aliases
     """
+    VERSION = 3
+    ENGINES = ("pyparsing", "regex")
+    GRAMMARS = {}
+    EXTERNAL_LINKS = {
+        "pyparsing": src.parser_elements.links.get_external_link(),
+        "regex": src.parser_elements.links.get_external_link_regex()
+    }
 
-    def __init__(self, namespaces, flag=False):
+    def __init__(
+            self, namespaces, flag=False, engine="pyparsing", aliases=None
+    ):
         """Initialize wikitext parser.
 
         :param dict namespaces: namespaces
         :param bool flag: toggle debug messages on/off
+        :param str engine: engine (pyparsing or regex)
+        :param dict aliases: namespace aliases (by key, default:
+            links.NAMESPACE_ALIASES)
         """
         try:
+            if engine not in self.ENGINES:
+                raise ValueError("unknown engine '{}'".format(engine))
+            if aliases is None:
+                aliases = src.parser_elements.links.NAMESPACE_ALIASES
             self.namespaces = namespaces
             self.flag = flag
+            self.engine = engine
+            self.aliases = aliases
+            self._grammar = self._get_grammar(
+                namespaces, flag, engine, aliases
+            )
         except Exception as exception:
             msg = "failed to initialize wikitext parser\t: {}"
             raise RuntimeError(msg.format(exception))
 
+    @classmethod
+    def _get_grammar(cls, namespaces, flag, engine="pyparsing", aliases=None):
+        """Get parser elements (or regular expressions).
+
+        :param dict namespaces: namespaces
+        :param bool flag: toggle debug messages on/off
+        :param str engine: engine
+        :param dict aliases: namespace aliases (by key)
+
+        :returns: parser elements
+        :rtype: dict
+        """
+        try:
+            key = (
+                tuple(sorted(namespaces.items())), flag, engine,
+                tuple(sorted((aliases or {}).items()))
+            )
+            if key not in cls.GRAMMARS:
+                links = src.parser_elements.links
+                namespace_index = links.get_namespace_index(
+                    namespaces, aliases=aliases
+                )
+                if engine == "regex":
+                    internal_link = links.get_internal_link_regex(
+                        namespace_index, flag=flag
+                    )
+                    redirect = links.get_redirect_regex(
+                        namespace_index, flag=flag
+                    )
+                else:
+                    internal_link = links.get_internal_link(
+                        namespace_index, flag=flag
+                    )
+                    redirect = links.get_redirect(namespace_index, flag=flag)
+                cls.GRAMMARS[key] = {
+                    "namespace_index": namespace_index,
+                    "internal_link": internal_link,
+                    "redirect": redirect
+                }
+            grammar = cls.GRAMMARS[key]
+        except Exception as exception:
+            msg = "failed to get parser elements\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return grammar
+
     @staticmethod
     def find_sections(wikitext, level=2):
         """Find sections.
@@ -61,52 +149,124 @@ class Parser():
         :rtype: Section
         """
         try:
-            pattern = src.parser_elements.layout.get_section_regex(
-                level=level
+            section = Parser._copy_section_span(
+                Parser.find_section_spans(wikitext, level=level)
             )
-            matches = [
-                match[0] if match[0] else match[1]
-                for match in pattern.findall(wikitext)
-            ]
-            if not matches:     # pylint: disable=no-else-return
-                return src.page_elements.Section(level-1, "", wikitext, [])
-            else:
-                pattern = src.parser_elements.layout.get_section_regex(
-                    level=level, non_capturing=True
+        except Exception as exception:
+            msg = "failed to find sections\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return section
+
+    @staticmethod
+    def _copy_section_span(section_span):
+        """Copy section (as offsets into wikitext) to section (subsections
+        are copied on first access).
+
+        :param SectionSpan section_span: section (as offsets into wikitext)
+
+        :returns: section
+        :rtype: Section
+        """
+        return src.page_elements.Section(
+            section_span.level,
+            section_span.heading,
+            section_span.wikitext,
+            src.page_elements.Subsections(
+                functools.partial(
+                    list,
+                    map(Parser._copy_section_span, section_span.subsections)
                 )
-                splits = [
-                    split for split in pattern.split(wikitext) if split
-                ]
-                msg = (
-                    "number of section headings ({}) does not match "
-                    "number of sections ({})"
-                ).format(len(matches), len(splits)-1)
-                assert len(matches) == len(splits)-1, msg
-                if level == 6:  # pylint: disable=no-else-return
-                    subsections = [
-                        src.page_elements.Section(level, heading, wikitext, [])
-                        for heading, wikitext in zip(matches, splits[1:])
-                    ]
-                    section = src.page_elements.Section(
-                        level-1, "", splits[0], subsections
-                    )
-                    return section
+            )
+        )
+
+    @staticmethod
+    def find_section_spans(wikitext, level=2, start=0, end=None):
+        """Find sections (as offsets into wikitext).
+
+        All headings are found in a single pass, a heading is a subsection
+        of the preceding heading one level above it (headings skipping a
+        level are part of the section's wikitext). The subsections are
+        expanded on first access (q.v. Subsections).
+
+        :param str wikitext: wikitext
+        :param int level: level
+        :param int start: start offset
+        :param int end: end offset
+
+        :returns: section
+        :rtype: SectionSpan
+        """
+        try:
+            if end is None:
+                end = len(wikitext)
+            pattern = src.parser_elements.layout.get_heading_regex()
+            headings = []
+            current_level = level - 1
+            for match in pattern.finditer(wikitext, start, end):
+                if match.group(1):
+                    heading_level = len(match.group(1))
+                    heading = match.group(2)
                 else:
-                    section = src.page_elements.Section(
-                        level-1, "", splits[0], []
+                    heading_level = int(match.group(3))
+                    heading = match.group(4)
+                if level <= heading_level <= current_level + 1:
+                    current_level = heading_level
+                    headings.append(
+                        (heading_level, heading, match.start(), match.end())
                     )
-                    subsections = [
-                        Parser.find_sections(split, level=level+1)
-                        for split in splits[1:]
-                    ]
-                    subsections = [
-                        subsection._replace(heading=heading)
-                        for heading, subsection in zip(matches, subsections)
-                    ]
-                    return section._replace(subsections=subsections)
+            ends = [heading_start for _, _, heading_start, _ in headings]
+            ends.append(end)
+            section = src.page_elements.SectionSpan(
+                level-1, "", wikitext, start, ends[0], start, start,
+                src.page_elements.Subsections(
+                    functools.partial(
+                        Parser._find_subsection_spans,
+                        wikitext, headings, ends, level, 0, len(headings)
+                    )
+                )
+            )
         except Exception as exception:
             msg = "failed to find sections\t: {}"
             raise RuntimeError(msg.format(exception))
+        return section
+
+    @staticmethod
+    def _find_subsection_spans(wikitext, headings, ends, level, first, stop):
+        # pylint: disable=too-many-arguments
+        """Find subsections (as offsets into wikitext).
+
+        :param str wikitext: wikitext
+        :param list headings: headings (level, heading, heading start and
+            end offset)
+        :param list ends: end offsets (heading start offsets and end offset)
+        :param int level: level
+        :param int first: index of first heading of the section
+        :param int stop: index of first heading following the section
+
+        :returns: subsections
+        :rtype: list
+        """
+        indices = [
+            index for index in range(first, stop)
+            if headings[index][0] == level
+        ]
+        subsections = []
+        for index, next_index in zip(indices, indices[1:] + [stop]):
+            _, heading, heading_start, heading_end = headings[index]
+            subsections.append(
+                src.page_elements.SectionSpan(
+                    level, heading, wikitext, heading_end, ends[index+1],
+                    heading_start, heading_end,
+                    src.page_elements.Subsections(
+                        functools.partial(
+                            Parser._find_subsection_spans,
+                            wikitext, headings, ends, level+1,
+                            index+1, next_index
+                        )
+                    )
+                )
+            )
+        return subsections
 
     @staticmethod
     def find_paragraphs(wikitext):
@@ -128,6 +288,70 @@ class Parser():
             raise RuntimeError(msg.format(exception))
         return paragraphs
 
+    def _find_internal_link(
+            self, namespace, page_name, anchor, link_text, word_ending
+    ):
+        # pylint: disable=too-many-arguments
+        """Find internal link (from its parts).
+
+        :param str namespace: namespace or alias (None: main namespace)
+        :param str page_name: page_name (or None)
+        :param str anchor: anchor (or None)
+        :param str link_text: link_text (or None)
+        :param str word_ending: word_ending (or None)
+
+        :returns: internal link
+        :rtype: InternalLink
+        """
+        if namespace:
+            namespace, _ = self._grammar["namespace_index"][namespace.upper()]
+        else:
+            namespace = "0"
+        page_name = (page_name or "") + (anchor or "")
+        if not link_text:
+            link_text = page_name
+        if word_ending:
+            link_text += word_ending
+        return src.page_elements.InternalLink(namespace, page_name, link_text)
+
+    def _find_internal_link_parts(self, wikitext):
+        """Find internal link parts.
+
+        :param str wikitext: wikitext
+
+        :returns: start offset and namespace, page_name, anchor, link_text
+            and word_ending
+        :rtype: generator
+        """
+        parser_element = self._grammar["internal_link"]
+        if self.engine == "regex":
+            for match in parser_element.finditer(wikitext):
+                namespace, page_name, anchor, link_text, word_ending = \
+                    match.group(
+                        "prefix", "page_name", "anchor",
+                        "link_text", "word_ending"
+                    )
+                yield match.start(), (
+                    namespace[:-1], page_name, anchor, link_text, word_ending
+                )
+        else:
+            for tokens, start, _ in \
+                    src.parser_elements.links.scan_internal_links(
+                        parser_element, wikitext
+                    ):
+                token = tokens["internal_link"]
+                if "anchor" in token:
+                    anchor = token["anchor"][0]
+                else:
+                    anchor = None
+                yield start, (
+                    token.get("namespace"),
+                    token.get("page_name"),
+                    anchor,
+                    token.get("link_text"),
+                    token.get("word_ending")
+                )
+
     def find_internal_links(self, wikitext):
         """Find internal links.
 
@@ -137,71 +361,168 @@ class Parser():
         :rtype: list
         """
         try:
-            indexes = {v: k for k, v in self.namespaces.items()}
-            parser_element = src.parser_elements.links.get_internal_link(
-                [v for k, v in self.namespaces.items() if k != "0"],
-                flag=self.flag
-            )
-            tokens = [
-                tokens for tokens, _, _ in parser_element.scanString(wikitext)
+            internal_links = [
+                self._find_internal_link(*parts)
+                for _, parts in self._find_internal_link_parts(wikitext)
             ]
-            internal_links = []
-            for token in tokens:
-                if "namespace" in token:
-                    namespace = indexes[token["internal_link"]["namespace"]]
-                else:
-                    namespace = indexes["(Main)"]
-                if "anchor" in token["internal_link"]:
-                    if "page_name" in token["internal_link"]:
-                        page_name = (
-                            token["internal_link"]["page_name"]
-                            + token["internal_link"]["anchor"][0]
-                        )
-                    else:
-                        page_name = token["internal_link"]["anchor"][0]
-                else:
-                    page_name = token["internal_link"]["page_name"]
-                if "link_text" in token:
-                    link_text = token["internal_link"]["link_text"]
-                else:
-                    link_text = page_name
-                if "word_ending" in token:
-                    link_text += token["internal_link"]["word_ending"]
-                internal_links.append(
-                    src.page_elements.InternalLink(
-                        namespace, page_name, link_text
-                    )
-                )
         except Exception as exception:
             msg = "failed to find internal links\t: {}"
             raise RuntimeError(msg.format(exception))
         return internal_links
 
+    def extract_many(self, wikitexts):  # pylint: disable=too-many-locals
+        """Find internal links of several wikitexts at once.
+
+        The wikitexts are joined by line breaks and scanned at once (none
+        of the parser elements of an internal link matches a line break,
+        i.e. no link spans two wikitexts), the wikitext a link has been
+        found in is looked up by its start offset. No link objects are
+        created, the links are appended to columns instead (q.v.
+        InternalLinkColumns).
+
+        :param iterable wikitexts: wikitexts (or objects having a wikitext
+            attribute, e.g. Page or SectionSpan)
+
+        :returns: internal links (by column)
+        :rtype: InternalLinkColumns
+        """
+        try:
+            offsets = []
+            offset = 0
+            joined = []
+            for wikitext in wikitexts:
+                if not isinstance(wikitext, str):
+                    wikitext = wikitext.wikitext
+                offsets.append(offset)
+                offset += len(wikitext) + 1
+                joined.append(wikitext)
+            namespace_index = self._grammar["namespace_index"]
+            namespace_ids = {}
+            source = array.array("l")
+            namespace = array.array("l")
+            page_name = []
+            link_text = []
+            for start, parts in self._find_internal_link_parts(
+                    "\n".join(joined)
+            ):
+                prefix, name, anchor, text, word_ending = parts
+                if prefix:
+                    key = prefix.upper()
+                    if key not in namespace_ids:
+                        namespace_ids[key] = int(namespace_index[key][0])
+                    namespace_id = namespace_ids[key]
+                else:
+                    namespace_id = 0
+                name = (name or "") + (anchor or "")
+                if not text:
+                    text = name
+                if word_ending:
+                    text += word_ending
+                source.append(bisect.bisect_right(offsets, start) - 1)
+                namespace.append(namespace_id)
+                page_name.append(name)
+                link_text.append(text)
+            columns = src.page_elements.InternalLinkColumns(
+                source, namespace, page_name, link_text
+            )
+        except Exception as exception:
+            msg = "failed to extract internal links\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return columns
+
     @staticmethod
-    def find_external_links(wikitext):
+    def find_external_links(wikitext, engine="pyparsing"):
         """Find external links.
 
         :param str wikitext: wikitext
+        :param str engine: engine (pyparsing or regex)
 
         :returns: external links
         :rtype: list
         """
         try:
-            parser_element = src.parser_elements.links.get_external_link()
-            tokens = [
-                tokens for tokens, _, _ in parser_element.scanString(wikitext)
-            ]
-            external_links = []
-            for token in tokens:
-                url = token["external_link"]["url"]
-                if "link_text" in token:
-                    link_text = token["external_link"]["link_text"]
-                else:
-                    link_text = token["external_link"]["url"]
-                external_links.append(
-                    src.page_elements.ExternalLink(url, link_text)
+            parser_element = Parser.EXTERNAL_LINKS[engine]
+            if engine == "regex":
+                parts = (
+                    (match.group("url"), match.group("link_text"))
+                    for match in parser_element.finditer(wikitext)
+                )
+            else:
+                parts = (
+                    (
+                        tokens["external_link"]["url"],
+                        tokens["external_link"].get("link_text")
+                    )
+                    for tokens, _, _ in
+                    src.parser_elements.links.scan_external_links(
+                        parser_element, wikitext
+                    )
                 )
+            external_links = [
+                src.page_elements.ExternalLink(url, link_text or url)
+                for url, link_text in parts
+            ]
         except Exception as exception:
             msg = "failed to find external links\t:{}"
             raise RuntimeError(msg.format(exception))
         return external_links
+
+    def find_links(self, wikitext, start=0, end=None):
+        """Find internal and external links.
+
+        :param str wikitext: wikitext
+        :param int start: start offset
+        :param int end: end offset
+
+        :returns: internal and external links
+        :rtype: tuple
+        """
+        try:
+            wikitext = wikitext[start:end]
+            internal_links = self.find_internal_links(wikitext)
+            external_links = self.find_external_links(
+                wikitext, engine=self.engine
+            )
+        except Exception as exception:
+            msg = "failed to find links\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return internal_links, external_links
+
+    def find_redirect(self, wikitext):
+        """Find redirect (at the start of the wikitext).
+
+        The redirect magic word is case-insensitive and may be preceded
+        by whitespace (q.v. links.REDIRECT_REGEX).
+
+        :param str wikitext: wikitext
+
+        :returns: redirect target (None: wikitext is not a redirect)
+        :rtype: InternalLink
+        """
+        try:
+            parser_element = self._grammar["redirect"]
+            redirect = None
+            match = src.parser_elements.links.REDIRECT_REGEX.match(wikitext)
+            if match is not None and self.engine == "regex":
+                match = parser_element.match(wikitext, match.end())
+                if match is not None:
+                    redirect = self._find_internal_link(
+                        match.group("prefix")[:-1],
+                        match.group("page_name"),
+                        match.group("anchor"),
+                        match.group("link_text"),
+                        match.group("word_ending")
+                    )
+            elif match is not None:
+                # a redirect does not span a line break
+                end = wikitext.find("\n", match.end())
+                line = wikitext[match.end():end if end >= 0 else None]
+                for _, start, end in src.parser_elements.links.scan_string(
+                        parser_element, line, 1
+                ):
+                    if start == 0:
+                        redirect = self.find_internal_links(line[:end])[0]
+        except Exception as exception:
+            msg = "failed to find redirect\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return redirect
@@ -91,6 +91,36 @@ def get_section_regex(level=2, non_capturing=False, flag=False):
     return pattern
 
 
+def get_heading_regex(flag=False):
+    """Get heading regular expression (levels 2 to 6).
+
+    The level is either the length of group 1 or group 3, the heading_text
+    either group 2 or group 4.
+
+    :param bool flag: toggle debug messages on/off
+
+    :returns: heading regular expression
+    :rtype: SRE_Pattern
+    """
+    try:
+        blacklist_characters = r"\n\r#<=>\[\]_{|}"
+        format_string = (
+            r"^(?:(={{2,6}})([^{0}].*?)\1)|"
+            r"(?:<h([2-6])>([^{0}].*?)</h\3>)$"
+        )
+        if flag:
+            flags = re.DEBUG | re.MULTILINE
+        else:
+            flags = re.MULTILINE
+        pattern = re.compile(
+            format_string.format(blacklist_characters), flags=flags
+        )
+    except Exception as exception:
+        msg = "failed to get heading regular expression:{}".format(exception)
+        raise RuntimeError(msg)
+    return pattern
+
+
 def get_line_break_regex(flag=False):
     """Get line_break regular expression.
 
@@ -21,6 +21,8 @@
 
 
 # standard library imports
+import re
+import sys
 import string
 
 # third party imports
@@ -36,22 +38,109 @@ from src.parser_elements import layout
 #: https://en.wikipedia.org/wiki/Wikipedia:Article_titles
 
 
+#: namespace aliases (by namespace key)
+#: https://www.mediawiki.org/wiki/Manual:Namespace#Aliases
+NAMESPACE_ALIASES = {
+    "4": ("Project",),
+    "5": ("Project talk",),
+    "6": ("Image",),
+    "7": ("Image talk",)
+}
+#: English Wikipedia namespace aliases (by namespace key)
+#: https://en.wikipedia.org/wiki/Wikipedia:Namespace#Aliases
+ENWIKI_NAMESPACE_ALIASES = {
+    "4": ("Project", "WP"),
+    "5": ("Project talk", "WT"),
+    "6": ("Image",),
+    "7": ("Image talk",)
+}
+
+
+#: candidates (q.v. scan_internal_links and scan_external_links)
+EXTERNAL_LINK_REGEX = re.compile(r"\[(?=[+\-.0-9A-Za-z]+://)")
+WORD_ENDING_REGEX = re.compile(r"[A-Za-z]*")
+#: redirect magic word (case-insensitive, after leading whitespace)
+REDIRECT_REGEX = re.compile(r"\s*(?=(?i:#REDIRECT)[ \t])")
+#: pyparsing 3 (snake_case names, the camelCase names are deprecated)
+PYPARSING_3 = hasattr(pyparsing.ParserElement, "scan_string")
+
+
+def get_namespace_index(namespaces, aliases=None):
+    """Get namespace index.
+
+    Namespaces and their aliases are looked up case-insensitively (by
+    upper-case name), the main namespace is not part of the index.
+
+    :param dict namespaces: namespaces (by key) or list of namespaces
+    :param dict aliases: namespace aliases (by key)
+
+    :returns: key and namespace (by upper-case namespace or alias)
+    :rtype: dict
+    """
+    try:
+        namespace_index = {}
+        if isinstance(namespaces, dict):
+            for key, namespace_aliases in (aliases or {}).items():
+                if key in namespaces:
+                    for alias in namespace_aliases:
+                        namespace_index[alias.upper()] = (
+                            key, namespaces[key]
+                        )
+            for key, namespace in namespaces.items():
+                if key != "0":
+                    namespace_index[namespace.upper()] = (key, namespace)
+        else:
+            for namespace in namespaces:
+                namespace_index[namespace.upper()] = (None, namespace)
+    except Exception as exception:
+        msg = "failed to get namespace index:{}".format(exception)
+        raise RuntimeError(msg)
+    return namespace_index
+
+
+def _get_namespace_alternation(namespace_index):
+    """Get namespace alternation (longest first).
+
+    :param dict namespace_index: namespace index
+
+    :returns: namespace alternation
+    :rtype: str
+    """
+    return "|".join(
+        re.escape(name)
+        for name in sorted(namespace_index, key=len, reverse=True)
+    )
+
+
 def _get_namespace(namespaces, flag=False):
     """Get namespace parser element.
 
     namespace = any namespace;
 
+    Namespaces (and aliases) are matched by a single case-insensitive
+    alternation (longest first), the result is the namespace's name.
+
     :param bool flag: toggle debug messages on/off
-    :param list namespaces: list of namespaces
+    :param list namespaces: list of namespaces (or namespace index)
 
     :returns: namespace
     :rtype: ParserElement
     """
     try:
-        namespace = pyparsing.Or(
-            pyparsing.CaselessLiteral(namespace)
-            for namespace in namespaces
+        if isinstance(namespaces, dict):
+            namespace_index = namespaces
+        else:
+            namespace_index = get_namespace_index(namespaces)
+        namespace = pyparsing.Regex(
+            _get_namespace_alternation(namespace_index) or "(?!)",
+            flags=re.IGNORECASE
         )
+        namespace.setParseAction(
+            lambda tokens: namespace_index.get(
+                tokens[0].upper(), (None, tokens[0])
+            )[1]
+        )
+        namespace.leaveWhitespace()
         if flag:
             namespace.setDebug()
         namespace.setName("namespace")
@@ -173,7 +262,7 @@ def get_internal_link(namespaces, flag=False):
     "[[", [ [ namespace ], ":" ], ( anchor | page_name, [ anchor ] ),
     [ "|", [ link_text ] ], "]]", [ word_ending ];
 
-    :param list namespaces: namespaces
+    :param list namespaces: namespaces (or namespace index)
     :param bool flag: toggle debug messages on/off
 
     :returns: internal link
@@ -277,7 +366,7 @@ def get_external_link(flag=False):
 def get_redirect(namespaces, flag=False):
     """"Get redirect parser element.
 
-    redirect = "#REDIRECT", space | tab, internal_link;
+    redirect = "#REDIRECT" (case-insensitive), space | tab, internal_link;
 
     :param list namespaces: namespaces
     :param bool flag: toggle debug messages on/off
@@ -288,7 +377,7 @@ def get_redirect(namespaces, flag=False):
     try:
         internal_link = get_internal_link(namespaces, flag=flag)
         redirect = pyparsing.Combine(
-            pyparsing.Literal("#REDIRECT")
+            pyparsing.CaselessLiteral("#REDIRECT")
             + pyparsing.White(ws=" \t", exact=1)
             + internal_link
         )
@@ -302,3 +391,198 @@ def get_redirect(namespaces, flag=False):
         msg = "failed to return redirect:{}".format(exception)
         raise RuntimeError(msg)
     return redirect
+
+
+def scan_string(parser_element, wikitext, max_matches=sys.maxsize):
+    """Scan wikitext (scan_string or, before pyparsing 3, scanString).
+
+    :param ParserElement parser_element: parser element
+    :param str wikitext: wikitext
+    :param int max_matches: maximum number of matches (default: no
+        maximum)
+
+    :returns: tokens, start and end
+    :rtype: generator
+    """
+    if PYPARSING_3:
+        return parser_element.scan_string(wikitext, max_matches=max_matches)
+    return parser_element.scanString(wikitext, maxMatches=max_matches)
+
+
+def _scan_window(parser_element, wikitext, start, end):
+    """Scan window of wikitext for match starting at start.
+
+    :param ParserElement parser_element: parser element
+    :param str wikitext: wikitext
+    :param int start: start
+    :param int end: end
+
+    :returns: tokens, start and end (or None)
+    :rtype: tuple
+    """
+    for tokens, start_, end_ in scan_string(
+            parser_element, wikitext[start:end], 1
+    ):
+        if start_ == 0:
+            return tokens, start, start + end_
+    return None
+
+
+def scan_internal_links(internal_link, wikitext):
+    """Scan wikitext for internal links.
+
+    Same as scan_string(internal_link, wikitext), but the parser element is
+    only tried at "[[" and on the window up to the next "]]" (and
+    word_ending), none of the parser elements of an internal link matches
+    "]" or a line break.
+
+    :param ParserElement internal_link: internal link
+    :param str wikitext: wikitext
+
+    :returns: tokens, start and end
+    :rtype: generator
+    """
+    start = wikitext.find("[[")
+    while start >= 0:
+        closing = wikitext.find("]]", start + 2)
+        if closing < 0:
+            break
+        match = None
+        if wikitext.find("\n", start, closing) < 0:
+            end = WORD_ENDING_REGEX.match(wikitext, closing + 2).end()
+            match = _scan_window(internal_link, wikitext, start, end)
+        if match is not None:
+            yield match
+            start = wikitext.find("[[", match[2])
+        else:
+            start = wikitext.find("[[", start + 1)
+
+
+def scan_external_links(external_link, wikitext):
+    """Scan wikitext for external links.
+
+    Same as scan_string(external_link, wikitext), but the parser element is
+    only tried at "[" followed by a URL scheme and on the window up to the
+    next "]", none of the parser elements of an external link matches "]"
+    or a line break.
+
+    :param ParserElement external_link: external link
+    :param str wikitext: wikitext
+
+    :returns: tokens, start and end
+    :rtype: generator
+    """
+    end = 0
+    for candidate in EXTERNAL_LINK_REGEX.finditer(wikitext):
+        start = candidate.start()
+        if start < end:
+            continue
+        closing = wikitext.find("]", start + 1)
+        if closing < 0:
+            break
+        if wikitext.find("\n", start, closing) >= 0:
+            continue
+        match = _scan_window(external_link, wikitext, start, closing + 1)
+        if match is not None:
+            yield match
+            end = match[2]
+
+
+def get_internal_link_regex(namespaces, flag=False):
+    """Get internal_link regular expression.
+
+    Matches the same internal links as the internal_link parser element:
+    the namespace prefix ([ namespace ], ":") is matched atomically (the
+    longest namespace, case-insensitive) and none of the other parts can
+    backtrack into a different match. The namespace is group "prefix"
+    (without trailing ":"), the other parts are groups "page_name",
+    "anchor", "link_text" and "word_ending".
+
+    :param list namespaces: namespaces (or namespace index)
+    :param bool flag: toggle debug messages on/off
+
+    :returns: internal_link regular expression
+    :rtype: SRE_Pattern
+    """
+    try:
+        if isinstance(namespaces, dict):
+            namespace_index = namespaces
+        else:
+            namespace_index = get_namespace_index(namespaces)
+        namespace = _get_namespace_alternation(namespace_index) or "(?!)"
+        format_string = (
+            r"\[\["
+            r"(?=(?P<prefix>(?:(?=(?P<namespace>(?i:{0})))(?P=namespace))?:|))"
+            r"(?P=prefix)"
+            r"(?=[^{1}]|#[^{3}])"
+            r"(?P<page_name>[^{1}][^{2}]*)?(?P<anchor>#[^{3}]+)?"
+            r"(?:\|(?P<link_text>[^{2}]+)?)?"
+            r"\]\]"
+            r"(?P<word_ending>[A-Za-z]+)?"
+        )
+        pattern = format_string.format(
+            namespace,
+            r"\n\r#:<>\[\]_{|}",
+            r"\n\r#<>\[\]_{|}",
+            r"\n\r#<=>\[\]_{|}"
+        )
+        if flag:
+            pattern = re.compile(pattern, flags=re.DEBUG)
+        else:
+            pattern = re.compile(pattern)
+    except Exception as exception:
+        msg = "failed to get internal_link regular expression:{}"
+        raise RuntimeError(msg.format(exception))
+    return pattern
+
+
+def get_external_link_regex(flag=False):
+    """Get external_link regular expression.
+
+    Matches the same external links as the external_link parser element,
+    the parts are groups "url" and "link_text".
+
+    :param bool flag: toggle debug messages on/off
+
+    :returns: external_link regular expression
+    :rtype: SRE_Pattern
+    """
+    try:
+        pattern = (
+            r"\[(?P<url>[+\-.0-9A-Za-z]+://[^\t\n\r \[\]]+)"
+            r"(?:[ \t](?P<link_text>[^\n\r#<>\[\]_{|}]+))?\]"
+        )
+        if flag:
+            pattern = re.compile(pattern, flags=re.DEBUG)
+        else:
+            pattern = re.compile(pattern)
+    except Exception as exception:
+        msg = "failed to get external_link regular expression:{}"
+        raise RuntimeError(msg.format(exception))
+    return pattern
+
+
+def get_redirect_regex(namespaces, flag=False):
+    """Get redirect regular expression.
+
+    Matches the same redirects as the redirect parser element (at the
+    start of the wikitext), the groups are those of the internal_link
+    regular expression.
+
+    :param list namespaces: namespaces
+    :param bool flag: toggle debug messages on/off
+
+    :returns: redirect regular expression
+    :rtype: SRE_Pattern
+    """
+    try:
+        internal_link = get_internal_link_regex(namespaces)
+        pattern = r"(?i:#REDIRECT)[ \t]" + internal_link.pattern
+        if flag:
+            pattern = re.compile(pattern, flags=re.DEBUG)
+        else:
+            pattern = re.compile(pattern)
+    except Exception as exception:
+        msg = "failed to get redirect regular expression:{}"
+        raise RuntimeError(msg.format(exception))
+    return pattern
@@ -0,0 +1,180 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+:synopsis: Multiprocess page pipeline.
+"""
+
+
+# standard library imports
+import threading
+import multiprocessing
+
+# third party imports
+
+# library specific imports
+import src.parser
+
+
+_FUNCTION = None
+_PARSER = None
+
+
+def _initialize(function, namespaces, engine):
+    """Initialize worker process.
+
+    :param callable function: function
+    :param dict namespaces: namespaces
+    :param str engine: wikitext parser engine
+    """
+    global _FUNCTION, _PARSER  # pylint: disable=global-statement
+    _FUNCTION = function
+    _PARSER = src.parser.Parser(namespaces, engine=engine)
+
+
+def _apply(page_element):
+    """Apply function to page element (in worker process).
+
+    :param dict page_element: page element
+
+    :returns: result
+    """
+    return _FUNCTION(page_element, _PARSER)
+
+
+def _bound(iterable, semaphore, event):
+    """Bound number of items in flight.
+
+    :param iterable iterable: iterable
+    :param Semaphore semaphore: semaphore (released per result)
+    :param Event event: event (set when results are no longer consumed)
+
+    :returns: items
+    :rtype: generator
+    """
+    for item in iterable:
+        semaphore.acquire()
+        if event.is_set():
+            return
+        yield item
+
+
+def imap(
+        function, page_elements, namespaces,
+        processes=1, chunksize=16, ordered=True, engine="pyparsing"
+):
+    # pylint: disable=too-many-arguments
+    """Apply function to page elements.
+
+    Each worker process holds a wikitext parser initialized once with the
+    namespaces and is sent chunks of page elements, at most
+    2 * processes * chunksize page elements are in flight at any time.
+
+    :param callable function: function (called with page element and
+        wikitext parser, has to be picklable)
+    :param iterable page_elements: page elements (or page and revision
+        elements)
+    :param dict namespaces: namespaces
+    :param int processes: number of processes
+    :param int chunksize: number of page elements per chunk
+    :param bool ordered: toggle results in order of page elements on/off
+    :param str engine: wikitext parser engine
+
+    :returns: results
+    :rtype: generator
+    """
+    try:
+        if processes > 1:
+            generator = _imap(
+                function, page_elements, namespaces,
+                processes, chunksize, ordered, engine
+            )
+        else:
+            parser = src.parser.Parser(namespaces, engine=engine)
+            generator = (
+                function(page_element, parser)
+                for page_element in page_elements
+            )
+    except Exception as exception:
+        msg = "failed to apply function to page elements:{}"
+        raise RuntimeError(msg.format(exception))
+    return generator
+
+
+def _imap(
+        function, page_elements, namespaces,
+        processes, chunksize, ordered, engine
+):
+    # pylint: disable=too-many-arguments
+    """Apply function to page elements (in worker processes).
+
+    :param callable function: function
+    :param iterable page_elements: page elements
+    :param dict namespaces: namespaces
+    :param int processes: number of processes
+    :param int chunksize: number of page elements per chunk
+    :param bool ordered: toggle results in order of page elements on/off
+    :param str engine: wikitext parser engine
+
+    :returns: results
+    :rtype: generator
+    """
+    with multiprocessing.Pool(
+        processes,
+        initializer=_initialize,
+        initargs=(function, namespaces, engine)
+    ) as pool:
+        yield from imap_bounded(
+            pool, _apply, page_elements, 2*processes*chunksize,
+            chunksize=chunksize, ordered=ordered
+        )
+
+
+def imap_bounded(pool, function, iterable, size, chunksize=1, ordered=True):
+    # pylint: disable=too-many-arguments
+    """Apply function to items in pool (bounded).
+
+    Unlike Pool.imap, the items are not consumed faster than the results,
+    at most size items are in flight at any time.
+
+    :param Pool pool: pool
+    :param callable function: function
+    :param iterable iterable: items
+    :param int size: maximum number of items in flight (at least chunksize)
+    :param int chunksize: number of items per chunk
+    :param bool ordered: toggle results in order of items on/off
+
+    :returns: results
+    :rtype: generator
+    """
+    semaphore = threading.Semaphore(size)
+    event = threading.Event()
+    if ordered:
+        imap_ = pool.imap
+    else:
+        imap_ = pool.imap_unordered
+    try:
+        for result in imap_(
+                function,
+                _bound(iterable, semaphore, event),
+                chunksize=chunksize
+        ):
+            semaphore.release()
+            yield result
+    finally:
+        event.set()
+        semaphore.release()
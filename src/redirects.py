@@ -0,0 +1,225 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Redirect table.
+
+The redirect table maps the (normalised) title of every redirect to its
+target, chains of redirects are collapsed, i.e. the target of a redirect
+is never a redirect itself unless the redirects form a cycle.
+"""
+
+
+# standard library imports
+import logging
+import sqlite3
+
+# third party imports
+
+# library specific imports
+import src.titles
+
+
+PROP = ("title", "ns", "redirect", "revision.text")
+
+
+def collapse(redirects):
+    """Collapse chains of redirects.
+
+    :param dict redirects: targets (by redirect)
+
+    :returns: final targets (by redirect, None: redirect is part of or
+        leads to a cycle)
+    :rtype: dict
+    """
+    targets = {}
+    for redirect in redirects:
+        path = []
+        seen = set()
+        title = redirect
+        while title in redirects and title not in targets:
+            if title in seen:
+                break
+            seen.add(title)
+            path.append(title)
+            title = redirects[title]
+        if title in targets:
+            target = targets[title]
+        elif title in seen:
+            target = None
+        else:
+            target = title
+        for title in path:
+            targets[title] = target
+    return targets
+
+
+class RedirectTable():
+    """Redirect table (SQLite).
+
+    Titles are namespace keys and titles normalised by
+    src.titles.TitleNormalizer, i.e. the same as the pagelinks table rows
+    of Page.create_pagelinks_table(normalize=True).
+
+    :ivar str path: SQLite database
+    """
+
+    def __init__(self, path):
+        """Initialize redirect table.
+
+        :param str path: SQLite database
+        """
+        try:
+            self.path = path
+            self._connection = sqlite3.connect(path, isolation_level=None)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS redirect "
+                "(namespace INTEGER, title TEXT, target_namespace INTEGER, "
+                "target_title TEXT, cycle INTEGER, "
+                "PRIMARY KEY (namespace, title)) WITHOUT ROWID"
+            )
+        except Exception as exception:
+            msg = "failed to initialize redirect table\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def __len__(self):
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM redirect"
+        ).fetchone()[0]
+
+    def build(self, page_elements, parser):
+        # pylint: disable=too-many-locals
+        """Build redirect table (in a single pass over the page elements).
+
+        The target of a redirect is the title attribute of the redirect
+        element, or, if the export file does not have one, found in the
+        wikitext of the latest revision (q.v. Parser.find_redirect).
+
+        :param iterable page_elements: page elements (q.v. PROP)
+        :param Parser parser: wikitext parser
+
+        :returns: number of redirects, chains collapsed and cycles
+        :rtype: tuple
+        """
+        try:
+            title_normalizer = src.titles.TitleNormalizer(
+                parser.namespaces,
+                aliases=parser.aliases
+            )
+            redirects = {}
+            for page_element in page_elements:
+                if page_element.redirect:
+                    target = title_normalizer.normalize(
+                        "0", page_element.redirect
+                    )
+                elif page_element.revision:
+                    wikitext = page_element.revision[-1].text.text or ""
+                    internal_link = parser.find_redirect(wikitext)
+                    if internal_link is None:
+                        continue
+                    target = title_normalizer.normalize(
+                        internal_link.namespace, internal_link.page_name
+                    )
+                else:
+                    continue
+                title = title_normalizer.normalize("0", page_element.title)
+                if title is not None and target is not None:
+                    redirects[title] = target
+            targets = collapse(redirects)
+            rows = []
+            for (namespace, title), target in targets.items():
+                cycle = target is None
+                if cycle:
+                    target = redirects[namespace, title]
+                rows.append(
+                    (int(namespace), title, int(target[0]), target[1], cycle)
+                )
+            self._connection.execute("BEGIN")
+            self._connection.execute("DELETE FROM redirect")
+            self._connection.executemany(
+                "INSERT INTO redirect VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._connection.execute("COMMIT")
+            chains = sum(
+                1 for title, target in targets.items()
+                if target is not None and target != redirects[title]
+            )
+            cycles = sum(1 for target in targets.values() if target is None)
+            logger = logging.getLogger().getChild(__name__)
+            logger.info(
+                "%d redirects (%d chains collapsed, %d in or leading to "
+                "cycles)", len(targets), chains, cycles
+            )
+        except Exception as exception:
+            msg = "failed to build redirect table\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return len(targets), chains, cycles
+
+    def resolve(self, namespace, title):
+        """Resolve redirect.
+
+        :param str namespace: namespace key
+        :param str title: normalised title
+
+        :returns: namespace key and title of the target (None: not a
+            redirect or part of a cycle)
+        :rtype: tuple
+        """
+        try:
+            row = self._connection.execute(
+                "SELECT target_namespace, target_title FROM redirect "
+                "WHERE namespace = ? AND title = ? AND NOT cycle",
+                (int(namespace), title)
+            ).fetchone()
+            if row is not None:
+                row = (str(row[0]), row[1])
+        except Exception as exception:
+            msg = "failed to resolve redirect\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return row
+
+    def load(self, table=None):
+        """Load redirect table into memory (constant time lookups).
+
+        :param TitleTable table: intern table (default: intern table of
+            this process, q.v. src.titles.get_title_table)
+
+        :returns: title IDs of the targets (by title ID, redirects in cycles
+            are left out)
+        :rtype: dict
+        """
+        try:
+            if table is None:
+                table = src.titles.get_title_table()
+            redirects = {
+                table.intern((str(namespace), title)):
+                table.intern((str(target_namespace), target_title))
+                for namespace, title, target_namespace, target_title in
+                self._connection.execute(
+                    "SELECT namespace, title, target_namespace, target_title "
+                    "FROM redirect WHERE NOT cycle"
+                )
+            }
+        except Exception as exception:
+            msg = "failed to load redirect table\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return redirects
+
+    def close(self):
+        """Close SQLite database."""
+        self._connection.close()
@@ -0,0 +1,432 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Pagelinks table sinks.
+
+Sinks are given pagelinks table rows (pl_from, pl_from_namespace, title
+ID, q.v. Page.create_pagelinks_table) and write them as (pl_from,
+pl_from_namespace, pl_namespace, pl_title) in batches of batch_size rows,
+i.e. memory usage does not depend on the number of rows.
+"""
+
+
+# standard library imports
+import os
+import time
+import logging
+import sqlite3
+import operator
+import itertools
+
+# third party imports
+
+# library specific imports
+import src.titles
+import src.columnar
+
+
+ESCAPES = str.maketrans(
+    {
+        "\\": "\\\\", "'": "\\'", '"': '\\"',
+        "\0": "\\0", "\n": "\\n", "\r": "\\r", "\x1a": "\\Z"
+    }
+)
+
+
+def escape(value):
+    """Quote and escape string literal (same as mysqldump).
+
+    :param str value: value
+
+    :returns: string literal
+    :rtype: str
+    """
+    return "'{}'".format(value.translate(ESCAPES))
+
+
+class Sink():
+    """Pagelinks table sink.
+
+    Rows are buffered and written in batches of batch_size rows (the
+    remaining rows on close). The number of rows and rows/sec are logged on
+    close. Given redirects, links to redirects are replaced by links to
+    their targets (by title ID, the rows written at once are
+    deduplicated). Title IDs are looked up in the intern table when the
+    rows are written.
+
+    :ivar str path: output file
+    :ivar int batch_size: maximum number of rows buffered
+    :ivar int rows: number of rows written
+    :ivar dict redirects: redirect targets
+    :ivar TitleTable table: intern table
+    """
+
+    def __init__(self, path, batch_size=65536, redirects=None, table=None):
+        """Initialize sink.
+
+        :param str path: output file
+        :param int batch_size: maximum number of rows buffered
+        :param dict redirects: redirect targets (q.v.
+            RedirectTable.load)
+        :param TitleTable table: intern table (default: intern table of
+            this process, q.v. src.titles.get_title_table)
+        """
+        if table is None:
+            table = src.titles.get_title_table()
+        self.path = path
+        self.batch_size = batch_size
+        self.redirects = redirects
+        self.table = table
+        self.rows = 0
+        self._buffer = []
+        self._time = time.time()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, rows):
+        """Write rows.
+
+        :param iterable rows: pagelinks table rows
+        """
+        try:
+            self._buffer.extend(self._resolve(rows))
+            while len(self._buffer) >= self.batch_size:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:self.batch_size]
+                self._write_batch(batch)
+                self.rows += len(batch)
+        except Exception as exception:
+            msg = "failed to write rows\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _resolve(self, rows):
+        """Resolve redirects.
+
+        :param iterable rows: pagelinks table rows
+
+        :returns: pagelinks table rows
+        :rtype: iterable
+        """
+        if not self.redirects:
+            return rows
+        return dict.fromkeys(
+            (pl_from, pl_from_namespace, self.redirects.get(id_, id_))
+            for pl_from, pl_from_namespace, id_ in rows
+        )
+
+    def _expand(self, rows):
+        """Look up title IDs.
+
+        :param iterable rows: pagelinks table rows (title IDs)
+
+        :returns: pagelinks table rows (namespace keys and titles)
+        :rtype: generator
+        """
+        table = self.table
+        for pl_from, pl_from_namespace, id_ in rows:
+            yield (pl_from, pl_from_namespace) + table[id_]
+
+    def flush(self):
+        """Write buffered rows."""
+        try:
+            if self._buffer:
+                self._write_batch(self._buffer)
+                self.rows += len(self._buffer)
+                self._buffer = []
+        except Exception as exception:
+            msg = "failed to flush rows\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _write_batch(self, rows):
+        """Write batch of rows.
+
+        :param list rows: pagelinks table rows
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Write buffered rows and close sink."""
+        try:
+            self.flush()
+            self._close()
+            seconds = time.time() - self._time
+            logger = logging.getLogger().getChild(__name__)
+            logger.info(
+                "wrote %d rows to %s (%.0f rows/sec)",
+                self.rows, self.path, self.rows / (seconds or 1e-9)
+            )
+        except Exception as exception:
+            msg = "failed to close sink\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _close(self):
+        """Close output file."""
+        raise NotImplementedError
+
+
+class SQLiteSink(Sink):
+    """SQLite pagelinks table sink.
+
+    The pagelinks table (and its index) is dropped and created again on
+    initialization, i.e. re-runs replace the rows. Every batch is inserted in
+    a single transaction, the index is created once all rows have been
+    inserted.
+    """
+
+    def __init__(self, path, batch_size=65536, redirects=None, table=None):
+        """Initialize SQLite sink.
+
+        :param str path: SQLite database
+        :param int batch_size: maximum number of rows buffered
+        :param dict redirects: redirect targets (q.v.
+            RedirectTable.load)
+        :param TitleTable table: intern table
+        """
+        try:
+            super().__init__(
+                path, batch_size=batch_size, redirects=redirects,
+                table=table
+            )
+            self._connection = sqlite3.connect(path, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=MEMORY")
+            self._connection.execute("PRAGMA synchronous=OFF")
+            self._connection.execute("DROP INDEX IF EXISTS pl_namespace")
+            self._connection.execute("DROP TABLE IF EXISTS pagelinks")
+            self._connection.execute(
+                "CREATE TABLE pagelinks "
+                "(pl_from INTEGER, pl_from_namespace INTEGER, "
+                "pl_namespace INTEGER, pl_title TEXT)"
+            )
+        except Exception as exception:
+            msg = "failed to initialize SQLite sink\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _write_batch(self, rows):
+        """Write batch of rows (in a single transaction).
+
+        :param list rows: pagelinks table rows
+        """
+        self._connection.execute("BEGIN")
+        self._connection.executemany(
+            "INSERT INTO pagelinks VALUES (?, ?, ?, ?)", self._expand(rows)
+        )
+        self._connection.execute("COMMIT")
+
+    def _close(self):
+        """Create index and close SQLite database."""
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS pl_namespace "
+            "ON pagelinks (pl_namespace, pl_title, pl_from)"
+        )
+        self._connection.close()
+
+
+class TSVSink(Sink):
+    """Tab-separated values pagelinks table sink (one row per line)."""
+
+    def __init__(self, path, batch_size=65536, redirects=None, table=None):
+        """Initialize TSV sink.
+
+        :param str path: TSV file
+        :param int batch_size: maximum number of rows buffered
+        :param dict redirects: redirect targets (q.v.
+            RedirectTable.load)
+        :param TitleTable table: intern table
+        """
+        try:
+            super().__init__(
+                path, batch_size=batch_size, redirects=redirects,
+                table=table
+            )
+            self._fp = open(path, "w", encoding="utf-8")
+        except Exception as exception:
+            msg = "failed to initialize TSV sink\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _write_batch(self, rows):
+        """Write batch of rows.
+
+        :param list rows: pagelinks table rows
+        """
+        self._fp.write(
+            "".join(
+                "\t".join(map(str, row)) + "\n" for row in self._expand(rows)
+            )
+        )
+
+    def _close(self):
+        """Close TSV file."""
+        self._fp.close()
+
+
+class SQLSink(Sink):
+    """MediaWiki SQL pagelinks table sink (same format as the pagelinks
+    table database dumps, one extended INSERT statement per batch).
+
+    Titles are written in DB key form (spaces replaced by underscores) as
+    in the pagelinks table database dumps.
+    """
+
+    def __init__(self, path, batch_size=65536, redirects=None, table=None):
+        """Initialize SQL sink.
+
+        :param str path: SQL file
+        :param int batch_size: maximum number of rows buffered
+        :param dict redirects: redirect targets (q.v.
+            RedirectTable.load)
+        :param TitleTable table: intern table
+        """
+        try:
+            super().__init__(
+                path, batch_size=batch_size, redirects=redirects,
+                table=table
+            )
+            self._fp = open(path, "w", encoding="utf-8")
+        except Exception as exception:
+            msg = "failed to initialize SQL sink\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _write_batch(self, rows):
+        """Write batch of rows (as a single INSERT statement).
+
+        :param list rows: pagelinks table rows
+        """
+        self._fp.write(
+            "INSERT INTO `pagelinks` (`pl_from`,`pl_from_namespace`,"
+            "`pl_namespace`,`pl_title`) VALUES "
+        )
+        self._fp.write(
+            ",".join(
+                "({},{},{},{})".format(
+                    int(pl_from), int(pl_from_namespace), int(pl_namespace),
+                    escape(pl_title.replace(" ", "_"))
+                )
+                for pl_from, pl_from_namespace, pl_namespace, pl_title
+                in self._expand(rows)
+            )
+        )
+        self._fp.write(";\n")
+
+    def _close(self):
+        """Close SQL file."""
+        self._fp.close()
+
+
+class ColumnarSink(Sink):
+    """Columnar pagelinks file sink (q.v. src.columnar).
+
+    The rows passed to write at once are written as one page, i.e. the
+    rows of a page (revision) must be written at once.
+    """
+
+    def __init__(self, path, batch_size=65536, redirects=None, table=None):
+        """Initialize columnar sink.
+
+        :param str path: columnar pagelinks file
+        :param int batch_size: maximum number of rows buffered
+        :param dict redirects: redirect targets (q.v.
+            RedirectTable.load)
+        :param TitleTable table: intern table
+        """
+        try:
+            super().__init__(
+                path, batch_size=batch_size, redirects=redirects,
+                table=table
+            )
+            self._writer = src.columnar.ColumnarWriter(
+                path, batch_size=batch_size
+            )
+        except Exception as exception:
+            msg = "failed to initialize columnar sink\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def write(self, rows):
+        """Write rows (of one page).
+
+        :param iterable rows: pagelinks table rows
+        """
+        try:
+            rows = list(self._resolve(rows))
+            self._write_batch(rows)
+            self.rows += len(rows)
+        except Exception as exception:
+            msg = "failed to write rows\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _write_batch(self, rows):
+        """Write batch of rows (consecutive rows of the same page are
+        written as one page).
+
+        :param list rows: pagelinks table rows
+        """
+        for (pl_from, pl_from_namespace), page_rows in itertools.groupby(
+                self._expand(rows), key=operator.itemgetter(0, 1)
+        ):
+            self._writer.write(
+                pl_from,
+                pl_from_namespace,
+                (
+                    (pl_namespace, pl_title)
+                    for _, _, pl_namespace, pl_title in page_rows
+                )
+            )
+
+    def _close(self):
+        """Write columnar pagelinks file."""
+        self._writer.close()
+
+
+SINKS = {
+    ".db": SQLiteSink,
+    ".sqlite": SQLiteSink,
+    ".sqlite3": SQLiteSink,
+    ".tsv": TSVSink,
+    ".sql": SQLSink,
+    ".wpl": ColumnarSink
+}
+
+
+def get_sink(path, batch_size=65536, redirects=None, table=None):
+    """Get sink (by file extension of output file).
+
+    :param str path: output file
+    :param int batch_size: maximum number of rows buffered
+    :param dict redirects: redirect targets (q.v. RedirectTable.load)
+    :param TitleTable table: intern table (q.v. Sink)
+
+    :returns: sink (None: output file is not a pagelinks table)
+    :rtype: Sink
+    """
+    try:
+        _, extension = os.path.splitext(path or "")
+        if extension.lower() in SINKS:
+            sink = SINKS[extension.lower()](
+                path, batch_size=batch_size, redirects=redirects,
+                table=table
+            )
+        else:
+            sink = None
+    except Exception as exception:
+        msg = "failed to get sink\t: {}"
+        raise RuntimeError(msg.format(exception))
+    return sink
@@ -0,0 +1,329 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Title normalisation and interning.
+
+Titles are normalised the way MediaWiki does before looking them up
+(q.v. https://www.mediawiki.org/wiki/Manual:Page_title): character
+references and percent-encoding are decoded, the anchor is stripped,
+underscores and Unicode whitespace become (single) spaces, bidirectional
+marks are removed, namespace prefixes are resolved (case-insensitively,
+including aliases) and the first letter is upper-cased.
+
+Normalised titles are interned as integer IDs in an intern table shared
+by all processes using the same SQLite database (q.v. get_title_table),
+i.e. pagelinks table rows, sinks and redirect tables work on integers.
+"""
+
+
+# standard library imports
+import os
+import re
+import html
+import sqlite3
+import tempfile
+import collections
+import urllib.parse
+
+# third party imports
+
+# library specific imports
+import src.parser_elements.links
+
+
+WHITESPACE_REGEX = re.compile(
+    "[ _\u00a0\u1680\u180e\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+"
+)
+BIDI_REGEX = re.compile("[\u200e\u200f\u202a-\u202e]")
+
+
+class TitleTable():
+    """Intern table (normalised titles by integer ID).
+
+    The titles are stored in an SQLite database assigning the IDs, i.e.
+    IDs are the same in all processes sharing the database. The size
+    titles and IDs used most recently are cached (least recently used),
+    i.e. memory usage does not depend on the number of titles.
+
+    :ivar str path: SQLite database
+    :ivar int size: maximum number of titles and IDs cached
+    """
+
+    def __init__(self, path=None, size=2**20):
+        """Initialize intern table.
+
+        :param str path: SQLite database (default: temporary file, removed
+            on close)
+        :param int size: maximum number of titles and IDs cached
+        """
+        try:
+            self._temporary = path is None
+            if self._temporary:
+                handle, path = tempfile.mkstemp(suffix=".db")
+                os.close(handle)
+            self.path = path
+            self.size = size
+            self._connection = sqlite3.connect(
+                path, timeout=60, isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=OFF")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS titles "
+                "(id INTEGER PRIMARY KEY, namespace TEXT, title TEXT, "
+                "UNIQUE (namespace, title))"
+            )
+            self._ids = collections.OrderedDict()
+            self._titles = collections.OrderedDict()
+        except Exception as exception:
+            msg = "failed to initialize intern table\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def __len__(self):
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM titles"
+        ).fetchone()[0]
+
+    def __getitem__(self, id_):
+        title = self._titles.get(id_)
+        if title is None:
+            row = self._connection.execute(
+                "SELECT namespace, title FROM titles WHERE id = ?", (id_,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(id_)
+            title = tuple(row)
+            self._cache(id_, title)
+        else:
+            self._titles.move_to_end(id_)
+        return title
+
+    def _cache(self, id_, title):
+        """Cache title and ID (evicts least recently used ones).
+
+        :param int id_: ID
+        :param tuple title: namespace key and title
+        """
+        self._ids[title] = id_
+        self._titles[id_] = title
+        if len(self._ids) > self.size:
+            self._ids.popitem(last=False)
+        if len(self._titles) > self.size:
+            self._titles.popitem(last=False)
+
+    def intern(self, title):
+        """Intern title.
+
+        :param tuple title: namespace key and title
+
+        :returns: ID
+        :rtype: int
+        """
+        id_ = self._ids.get(title)
+        if id_ is not None:
+            self._ids.move_to_end(title)
+            return id_
+        try:
+            row = self._connection.execute(
+                "SELECT id FROM titles WHERE namespace = ? AND title = ?",
+                title
+            ).fetchone()
+            if row is None:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO titles (namespace, title) "
+                    "VALUES (?, ?)", title
+                )
+                if cursor.rowcount == 1:
+                    id_ = cursor.lastrowid
+                else:
+                    id_, = self._connection.execute(
+                        "SELECT id FROM titles "
+                        "WHERE namespace = ? AND title = ?", title
+                    ).fetchone()
+            else:
+                id_, = row
+            self._cache(id_, title)
+        except Exception as exception:
+            msg = "failed to intern title\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return id_
+
+    def close(self):
+        """Close intern table (removes temporary SQLite database)."""
+        self._connection.close()
+        if self._temporary:
+            os.remove(self.path)
+
+
+TITLE_TABLES = {}
+
+
+def get_title_table(path=None):
+    """Get intern table (one per SQLite database and process).
+
+    :param str path: SQLite database (None: temporary intern table of this
+        process)
+
+    :returns: intern table
+    :rtype: TitleTable
+    """
+    key = (os.getpid(), path)
+    if key not in TITLE_TABLES:
+        table = TitleTable(path)
+        TITLE_TABLES[key] = TITLE_TABLES[(os.getpid(), table.path)] = table
+    return TITLE_TABLES[key]
+
+
+class TitleNormalizer():
+    """Title normaliser.
+
+    The normalised titles of the size links normalised most recently are
+    cached (least recently used), i.e. frequent links are only normalised
+    once and memory usage does not depend on the number of links.
+
+    :ivar dict namespaces: namespaces
+    :ivar dict aliases: namespace aliases
+    :ivar bool first_letter: toggle upper-casing first letter on/off
+    :ivar int size: maximum number of normalised titles cached
+    """
+
+    def __init__(self, namespaces, aliases=None, first_letter=True,
+                 size=65536):
+        """Initialize title normaliser.
+
+        :param dict namespaces: namespaces
+        :param dict aliases: namespace aliases (by key, default:
+            links.NAMESPACE_ALIASES)
+        :param bool first_letter: toggle upper-casing first letter on/off
+            (off for case-sensitive wikis, e.g. Wiktionary)
+        :param int size: maximum number of normalised titles cached
+        """
+        try:
+            if aliases is None:
+                aliases = src.parser_elements.links.NAMESPACE_ALIASES
+            self.namespaces = namespaces
+            self.aliases = aliases
+            self.first_letter = first_letter
+            self.size = size
+            self._namespace_index = {
+                WHITESPACE_REGEX.sub(" ", name): value
+                for name, value in
+                src.parser_elements.links.get_namespace_index(
+                    namespaces, aliases=aliases
+                ).items()
+            }
+            self._titles = collections.OrderedDict()
+        except Exception as exception:
+            msg = "failed to initialize title normaliser\t: {}"
+            raise RuntimeError(msg.format(exception))
+
+    def _normalize(self, namespace, page_name):
+        """Normalise title.
+
+        :param str namespace: namespace key
+        :param str page_name: page name
+
+        :returns: namespace key and title (None: anchor only or empty)
+        :rtype: tuple
+        """
+        title = page_name
+        if "&" in title:
+            title = html.unescape(title)
+        if "%" in title:
+            title = urllib.parse.unquote(title)
+        title = title.split("#", 1)[0]
+        title = BIDI_REGEX.sub("", title)
+        title = WHITESPACE_REGEX.sub(" ", title).strip(" ")
+        if namespace == "0" and ":" in title:
+            prefix, _, name = title.partition(":")
+            value = self._namespace_index.get(prefix.rstrip(" ").upper())
+            if value is not None:
+                namespace, _ = value
+                title = name.lstrip(" ")
+        if not title:
+            return None
+        if self.first_letter:
+            first_letter = title[0].upper()
+            if len(first_letter) == 1:
+                title = first_letter + title[1:]
+        return namespace, title
+
+    def normalize(self, namespace, page_name):
+        """Normalise title.
+
+        :param str namespace: namespace key
+        :param str page_name: page name
+
+        :returns: namespace key and title (None: anchor only or empty)
+        :rtype: tuple
+        """
+        try:
+            key = (namespace, page_name)
+            if key in self._titles:
+                title = self._titles[key]
+                self._titles.move_to_end(key)
+            else:
+                title = self._titles[key] = self._normalize(
+                    namespace, page_name
+                )
+                if len(self._titles) > self.size:
+                    self._titles.popitem(last=False)
+        except Exception as exception:
+            msg = "failed to normalise title\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return title
+
+    def get_id(self, namespace, page_name, table=None):
+        """Get ID of normalised title.
+
+        :param str namespace: namespace key
+        :param str page_name: page name
+        :param TitleTable table: intern table (default: intern table of
+            this process, q.v. get_title_table)
+
+        :returns: ID (None: anchor only or empty)
+        :rtype: int
+        """
+        title = self.normalize(namespace, page_name)
+        if title is None:
+            return None
+        if table is None:
+            table = get_title_table()
+        return table.intern(title)
+
+
+TITLE_NORMALIZERS = {}
+
+
+def get_title_normalizer(namespaces, aliases=None):
+    """Get title normaliser (one per namespaces and aliases).
+
+    :param dict namespaces: namespaces
+    :param dict aliases: namespace aliases (by key)
+
+    :returns: title normaliser
+    :rtype: TitleNormalizer
+    """
+    key = (
+        tuple(sorted(namespaces.items())),
+        tuple(sorted((aliases or {}).items()))
+    )
+    if key not in TITLE_NORMALIZERS:
+        TITLE_NORMALIZERS[key] = TitleNormalizer(namespaces, aliases=aliases)
+    return TITLE_NORMALIZERS[key]
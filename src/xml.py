@@ -21,12 +21,96 @@
 
 
 # standard library imports
+import bz2
+import copy
+import gzip
+import functools
+import lzma
 import logging
 
 # third party imports
 import lxml.etree
 
 # library specific imports
+import src.page_elements
+
+
+COMPRESSIONS = (
+    (b"BZh", bz2.open),
+    (b"\x1f\x8b", gzip.open),
+    (b"\xfd7zXZ\x00", lzma.open)
+)
+
+
+def open_export_file(xml):
+    """Open (compressed) Wikipedia export file.
+
+    bzip2 (including multistream), gzip and xz compressed export files are
+    recognized by their magic number.
+
+    :param str xml: XML file
+
+    :returns: file object
+    :rtype: file
+    """
+    try:
+        with open(xml, "rb") as fp:   # pylint: disable=invalid-name
+            magic_number = fp.read(6)
+        for prefix, open_ in COMPRESSIONS:
+            if magic_number.startswith(prefix):
+                fp = open_(xml, "rb")   # pylint: disable=invalid-name
+                break
+        else:
+            fp = open(xml, "rb")    # pylint: disable=invalid-name
+    except Exception as exception:
+        msg = "failed to open Wikipedia export file\t: {}".format(exception)
+        raise RuntimeError(msg)
+    return fp
+
+
+REVISION_PROP = src.page_elements.RevisionRecord._fields
+OPTIONAL_REVISION_PROP = ("parentid", "minor", "comment")
+CONTRIBUTOR_PROP = src.page_elements.Contributor._fields
+
+
+@functools.lru_cache(maxsize=None)
+def _get_projection(prop):
+    """Get projection.
+
+    Properties are page properties ("title", "ns", "id", "redirect",
+    "revision"), revision properties ("revision.id", "revision.text", ...)
+    or contributor properties ("revision.contributor.username", ...);
+    "revision" and "revision.contributor" select all revision and
+    contributor properties respectively.
+
+    :param tuple prop: properties
+
+    :returns: page, revision and contributor properties
+    :rtype: tuple
+    """
+    page_prop = set()
+    revision_prop = set()
+    contributor_prop = set()
+    for name in prop:
+        names = name.split(".")
+        if names == ["revision"]:
+            revision_prop.update(REVISION_PROP)
+            contributor_prop.update(CONTRIBUTOR_PROP)
+        elif names == ["revision", "contributor"]:
+            revision_prop.add("contributor")
+            contributor_prop.update(CONTRIBUTOR_PROP)
+        elif names[:2] == ["revision", "contributor"]:
+            revision_prop.add("contributor")
+            contributor_prop.add(names[2])
+        elif names[0] == "revision":
+            revision_prop.add(names[1])
+        else:
+            page_prop.add(name)
+    return (
+        frozenset(page_prop),
+        tuple(name for name in REVISION_PROP if name in revision_prop),
+        tuple(name for name in CONTRIBUTOR_PROP if name in contributor_prop)
+    )
 
 
 class ExportFileParser():
@@ -35,36 +119,362 @@ class ExportFileParser():
     (q.v. https://stackoverflow.com/questions/31250641/
     python-lxml-using-the-xmllang-attribute-to-retrieve-an-element)
 
+    In streaming mode the export file is parsed incrementally, only the
+    root and siteinfo elements are kept and every page element is cleared
+    as soon as it has been processed. The export file may be compressed
+    (q.v. open_export_file).
+
+    Validation against the XSD is either
+
+    * full: the whole tree (not in streaming mode)
+    * streaming: every element while it is parsed
+    * header-only: the siteinfo element and the first HEADER_PAGES pages
+    * off
+
+    Compiled XSDs are shared by all Wikipedia export file parsers.
+
     :cvar dict NSMAP: namespaces
-    :ivar _ElementTree tree: tree
+    :cvar tuple VALIDATION: validation modes
+    :cvar int HEADER_PAGES: number of pages validated (header-only)
+    :cvar dict XMLSCHEMAS: XML schemas (by XSD)
+    :ivar str xml: XML file
+    :ivar bool streaming: toggle streaming mode on/off
+    :ivar str validation: validation mode
+    :ivar _ElementTree tree: tree (None in streaming mode)
     """
     NSMAP = {"xml": "http://www.w3.org/XML/1998/namespace"}
+    VALIDATION = ("full", "streaming", "header-only", "off")
+    HEADER_PAGES = 10
+    XMLSCHEMAS = {}
 
-    def __init__(self, xml, xsd):
+    def __init__(self, xml, xsd, streaming=False, validation=None):
+        # pylint: disable=too-many-branches
         """Initialize Wikipedia export file parser.
 
         :param str xml: XML file
-        :param str xsd: XSD
+        :param str xsd: XSD (None: do not validate)
+        :param bool streaming: toggle streaming mode on/off
+        :param str validation: validation mode (default: full or, in
+            streaming mode, streaming)
         """
         try:
             logger = logging.getLogger().getChild(__name__)
             logger.info("initializing Wikipedia export file parser")
-            tree = lxml.etree.parse(xml)
-            self._validate(xsd, tree)
-            self.tree = tree
+            self.xml = xml
+            self.streaming = streaming
+            if not xsd:
+                validation = "off"
+            elif validation is None:
+                validation = "streaming" if streaming else "full"
+            if validation not in self.VALIDATION:
+                msg = "unknown validation mode '{}'".format(validation)
+                raise ValueError(msg)
+            if streaming and validation == "full":
+                msg = "full validation is not supported in streaming mode"
+                raise ValueError(msg)
+            self.validation = validation
+            logger.info("validation:%s", validation)
+            if validation == "off":
+                xmlschema = None
+            else:
+                xmlschema = self._get_xmlschema(xsd)
+            if validation == "streaming":
+                self._xmlschema = xmlschema
+            else:
+                self._xmlschema = None
+            if streaming:
+                self._root, self._siteinfo_element = self._parse_header(xml)
+                self.tree = None
+                if self._xmlschema is not None:
+                    self._validate_elements(
+                        self._xmlschema, self._root, list(self._root)
+                    )
+            else:
+                parser = lxml.etree.XMLParser(schema=self._xmlschema)
+                with open_export_file(xml) as fp:  # pylint: disable=C0103
+                    self.tree = lxml.etree.parse(fp, parser=parser)
+            if streaming:
+                root = self._root
+            else:
+                root = self.tree.getroot()
+            self._namespace = lxml.etree.QName(root).namespace
+            self._tags = {}
+            if validation == "full":
+                self._validate(xmlschema, self.tree)
+            elif validation == "header-only":
+                self._validate_header(xmlschema)
         except Exception as exception:
             msg = "failed to initialize export file parser\t: {}"
             raise RuntimeError(msg.format(exception))
 
+    @classmethod
+    def _get_xmlschema(cls, xsd):
+        """Get (compiled) XML schema.
+
+        :param str xsd: XSD
+
+        :returns: XML schema
+        :rtype: XMLSchema
+        """
+        try:
+            if xsd not in cls.XMLSCHEMAS:
+                cls.XMLSCHEMAS[xsd] = lxml.etree.XMLSchema(file=xsd)
+            xmlschema = cls.XMLSCHEMAS[xsd]
+        except Exception as exception:
+            msg = "failed to get XML schema\t: {}".format(exception)
+            raise RuntimeError(msg)
+        return xmlschema
+
+    @staticmethod
+    def _parse_header(xml):
+        """Parse Wikipedia export file header.
+
+        Stops at the first page element, the pages themselves are never
+        buffered.
+
+        :param str xml: XML file
+
+        :returns: root and siteinfo element
+        :rtype: tuple
+        """
+        try:
+            root = None
+            siteinfo_element = None
+            with open_export_file(xml) as fp:   # pylint: disable=invalid-name
+                context = lxml.etree.iterparse(fp, events=("start", "end"))
+                for event, element in context:
+                    localname = lxml.etree.QName(element).localname
+                    if root is None:
+                        root = element
+                    elif event == "start" and localname == "page":
+                        break
+                    elif event == "end" and localname == "siteinfo":
+                        siteinfo_element = element
+                del context
+            for element in list(root):
+                if element is not siteinfo_element:
+                    root.remove(element)
+        except Exception as exception:
+            msg = "failed to parse Wikipedia export file header\t: {}"
+            raise RuntimeError(msg.format(exception))
+        return root, siteinfo_element
+
+    def _iterparse_page_elements(self, latest_only=False):
+        """Parse page elements incrementally.
+
+        Every page element (and its preceding siblings) is cleared once the
+        consumer asks for the next one, i.e. memory usage does not depend on
+        the size of the export file. Page elements are validated one by one
+        (streaming validation).
+
+        If latest_only is set, every revision element is removed as soon as
+        the next one has been parsed, i.e. memory usage does not depend on
+        the number of revisions either (only the latest revision elements
+        are validated).
+
+        :param bool latest_only: toggle latest revision only on/off
+
+        :returns: page elements
+        :rtype: generator
+        """
+        if latest_only:
+            tag = (self._tag("page"), self._tag("revision"))
+        else:
+            tag = self._tag("page")
+        page_tag = self._tag("page")
+        with open_export_file(self.xml) as fp:  # pylint: disable=C0103
+            context = lxml.etree.iterparse(fp, events=("end",), tag=tag)
+            for _, element in context:
+                if element.tag != page_tag:
+                    self._remove_previous_revision_elements(element)
+                    continue
+                if self._xmlschema is not None:
+                    self._validate_elements(
+                        self._xmlschema, self._root, [element]
+                    )
+                yield element
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            del context
+
+    def _iterparse_revision_elements(
+            self, page_prop, revision_prop, contributor_prop,
+            latest_only=False
+    ):
+        """Parse revision elements incrementally.
+
+        Every revision element is cleared once the consumer asks for the
+        next one (or, if latest_only is set, as soon as the next one has
+        been parsed). Revision elements are validated one by one as only
+        revision of their page element, page elements are validated once
+        they have been parsed, their revision elements replaced by (a copy
+        of) their first one (streaming validation, only the latest
+        revision elements if latest_only is set).
+
+        :param tuple page_prop: page properties
+        :param tuple revision_prop: revision properties
+        :param tuple contributor_prop: contributor properties
+        :param bool latest_only: toggle latest revision only on/off
+
+        :returns: page and revision elements
+        :rtype: generator
+        """
+        page_tag = self._tag("page")
+        with open_export_file(self.xml) as fp:  # pylint: disable=C0103
+            context = lxml.etree.iterparse(
+                fp, events=("end",), tag=(page_tag, self._tag("revision"))
+            )
+            page_element = None
+            revision_copy = None
+            for _, element in context:
+                if element.tag == page_tag:
+                    if not latest_only and self._xmlschema is not None:
+                        self._validate_page_element(element, revision_copy)
+                        revision_copy = None
+                    if latest_only and page_element is not None:
+                        if self._xmlschema is not None:
+                            self._validate_elements(
+                                self._xmlschema, self._root, [element]
+                            )
+                        revision_element = self._find_revision_element(
+                            element.find(self._tag("revision")),
+                            prop=revision_prop,
+                            contributor_prop=contributor_prop
+                        )
+                        yield page_element, revision_element
+                    page_element = None
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+                    continue
+                self._remove_previous_revision_elements(element)
+                if page_element is None:
+                    page_element = self._find_page_element(
+                        page_prop, element.getparent()
+                    )
+                if not latest_only:
+                    if self._xmlschema is not None:
+                        self._validate_revision_element(element)
+                        if revision_copy is None:
+                            revision_copy = copy.deepcopy(element)
+                    revision_element = self._find_revision_element(
+                        element,
+                        prop=revision_prop,
+                        contributor_prop=contributor_prop
+                    )
+                    yield page_element, revision_element
+                    element.clear()
+            del context
+
+    def _validate_revision_element(self, element):
+        """Validate revision element (as only revision of its page
+        element).
+
+        The page element may already contain (partially parsed) following
+        siblings of the revision element, these are not validated.
+
+        :param Element element: revision element
+        """
+        try:
+            parent = element.getparent()
+            page_element = lxml.etree.Element(
+                parent.tag, attrib=dict(parent.attrib)
+            )
+            for child in parent:
+                page_element.append(copy.deepcopy(child))
+                if child is element:
+                    break
+        except Exception as exception:
+            msg = "failed to validate Wikipedia export file\t:{}"
+            raise RuntimeError(msg.format(exception))
+        self._validate_elements(self._xmlschema, self._root, [page_element])
+
+    def _validate_page_element(self, element, revision_element):
+        """Validate page element (revision elements replaced by revision
+        element, q.v. _iterparse_revision_elements).
+
+        :param Element element: page element
+        :param Element revision_element: revision element (validated)
+        """
+        try:
+            revision_tag = self._tag("revision")
+            page_element = lxml.etree.Element(
+                element.tag, attrib=dict(element.attrib)
+            )
+            for child in element:
+                if child.tag == revision_tag and revision_element is not None:
+                    child = revision_element
+                page_element.append(copy.deepcopy(child))
+        except Exception as exception:
+            msg = "failed to validate Wikipedia export file\t:{}"
+            raise RuntimeError(msg.format(exception))
+        self._validate_elements(self._xmlschema, self._root, [page_element])
+
+    @staticmethod
+    def _remove_previous_revision_elements(element):
+        """Remove revision elements preceding revision element.
+
+        :param Element element: revision element
+        """
+        previous_element = element.getprevious()
+        while (
+                previous_element is not None
+                and previous_element.tag == element.tag
+        ):
+            element.getparent().remove(previous_element)
+            previous_element = element.getprevious()
+
+    def _validate_header(self, xmlschema):
+        """Validate Wikipedia export file header (siteinfo element and
+        first pages).
+
+        :param XMLSchema xmlschema: XML schema
+        """
+        try:
+            with open_export_file(self.xml) as fp:  # pylint: disable=C0103
+                context = lxml.etree.iterparse(fp, events=("start", "end"))
+                root = None
+                elements = []
+                for event, element in context:
+                    if root is None:
+                        root = element
+                    elif event == "end" and element.getparent() is root:
+                        elements.append(element)
+                        if len(elements) > self.HEADER_PAGES:
+                            break
+                del context
+        except Exception as exception:
+            msg = "failed to find Wikipedia export file header\t: {}"
+            raise RuntimeError(msg.format(exception))
+        self._validate_elements(xmlschema, root, elements)
+
+    @classmethod
+    def _validate_elements(cls, xmlschema, root, elements):
+        """Validate elements (as only children of root element).
+
+        :param XMLSchema xmlschema: XML schema
+        :param Element root: root element
+        :param list elements: elements
+        """
+        try:
+            tree = lxml.etree.Element(
+                root.tag, attrib=dict(root.attrib), nsmap=root.nsmap
+            )
+            tree.extend(copy.deepcopy(element) for element in elements)
+        except Exception as exception:
+            msg = "failed to validate Wikipedia export file\t:{}"
+            raise RuntimeError(msg.format(exception))
+        cls._validate(xmlschema, tree)
+
     @staticmethod
-    def _validate(xsd, tree):
+    def _validate(xmlschema, tree):
         """Validate Wikipedia export file.
 
-        :param str xsd: XSD
+        :param XMLSchema xmlschema: XML schema
         :param _ElementTree tree: tree
         """
         try:
-            xmlschema = lxml.etree.XMLSchema(file=xsd)
             xmlschema.assertValid(tree)
         except lxml.etree.DocumentInvalid:
             msg = "Wikipedia export file does not comply with XSD"
@@ -81,7 +491,11 @@ class ExportFileParser():
         """
         try:
             attrib = "{{{}}}lang".format(self.NSMAP["xml"])
-            language_attrib = self.tree.getroot().attrib[attrib]
+            if self.streaming:
+                root = self._root
+            else:
+                root = self.tree.getroot()
+            language_attrib = root.attrib[attrib]
         except Exception as exception:
             msg = "failed to find language attribute\t: {}".format(exception)
             raise RuntimeError(msg)
@@ -94,7 +508,10 @@ class ExportFileParser():
         :rtype: Element
         """
         try:
-            siteinfo_element = self.tree.find("{*}siteinfo")
+            if self.streaming:
+                siteinfo_element = self._siteinfo_element
+            else:
+                siteinfo_element = self.tree.find(self._tag("siteinfo"))
         except Exception as exception:
             msg = "failed to find siteinfo element\t: {}".format(exception)
             raise RuntimeError(msg)
@@ -108,9 +525,12 @@ class ExportFileParser():
         """
         try:
             siteinfo_element = self.find_siteinfo_element()
-            namespaces_element = siteinfo_element.find("{*}namespaces")
+            namespaces_element = siteinfo_element.find(
+                self._tag("namespaces")
+            )
             namespace_elements = {}
-            for element in namespaces_element.iterfind("{*}namespace"):
+            elements = namespaces_element.iterfind(self._tag("namespace"))
+            for element in elements:
                 if element.text is not None:
                     namespace_elements[element.attrib["key"]] = element.text
                 else:
@@ -120,154 +540,244 @@ class ExportFileParser():
             raise RuntimeError(msg)
         return namespace_elements
 
-    def find_page_elements(self, prop=("title", "ns", "id")):
+    def find_page_elements(
+            self, prop=("title", "ns", "id"), latest_only=False
+    ):
         """Find page elements.
 
-        :param tuple prop: properties
+        :param tuple prop: properties (q.v. _get_projection)
+        :param bool latest_only: toggle latest revision only on/off
 
         :returns: page elements
         :rtype: generator
         """
         try:
-            elements = self.tree.iterfind("{*}page")
-            generator = self._find_page_elements(prop, elements)
+            if self.streaming:
+                elements = self._iterparse_page_elements(
+                    latest_only=latest_only
+                )
+            else:
+                elements = self.tree.iterfind(self._tag("page"))
+            generator = self._find_page_elements(
+                prop, elements, latest_only=latest_only
+            )
         except Exception as exception:
             msg = "failed to find page elements\t: {}".format(exception)
             raise RuntimeError(msg)
         return generator
 
-    def _find_page_elements(self, prop, elements):
+    def _find_page_elements(self, prop, elements, latest_only=False):
         """Find page elements.
 
         :param tuple prop: properties
         :param generator elements: page elements
+        :param bool latest_only: toggle latest revision only on/off
 
         :returns: page elements
         :rtype: generator
         """
         for element in elements:
-            yield self._find_page_element(prop, element)
+            yield self._find_page_element(
+                prop, element, latest_only=latest_only
+            )
+
+    def find_revision_elements(
+            self, prop=("title", "ns", "id", "revision"), latest_only=False
+    ):
+        """Find revision elements (lazily).
+
+        Unlike find_page_elements, the revisions of a page are never held
+        in memory at once, i.e. full-history export files can be processed
+        revision by revision.
+
+        :param tuple prop: properties (q.v. _get_projection)
+        :param bool latest_only: toggle latest revision only on/off
+
+        :returns: page and revision elements (the page elements' revision
+            field is None)
+        :rtype: generator
+        """
+        try:
+            if self.streaming:
+                find_revision_elements = self._iterparse_revision_elements
+            else:
+                find_revision_elements = self._find_revision_elements_in_tree
+            page_prop = tuple(
+                name for name in prop if not name.startswith("revision")
+            )
+            _, revision_prop, contributor_prop = _get_projection(prop)
+            generator = find_revision_elements(
+                page_prop, revision_prop, contributor_prop,
+                latest_only=latest_only
+            )
+        except Exception as exception:
+            msg = "failed to find revision elements\t: {}".format(exception)
+            raise RuntimeError(msg)
+        return generator
 
-    def _find_page_element(self, prop, element):
+    def _find_revision_elements_in_tree(
+            self, page_prop, revision_prop, contributor_prop,
+            latest_only=False
+    ):
+        """Find revision elements in tree.
+
+        :param tuple page_prop: page properties
+        :param tuple revision_prop: revision properties
+        :param tuple contributor_prop: contributor properties
+        :param bool latest_only: toggle latest revision only on/off
+
+        :returns: page and revision elements
+        :rtype: generator
+        """
+        for element in self.tree.iterfind(self._tag("page")):
+            page_element = self._find_page_element(page_prop, element)
+            if latest_only:
+                elements = element.findall(self._tag("revision"))[-1:]
+            else:
+                elements = element.iterfind(self._tag("revision"))
+            for revision_element in self._find_revision_elements(
+                    elements, revision_prop, contributor_prop
+            ):
+                yield page_element, revision_element
+
+    def _tag(self, localname):
+        """Get tag (in export file namespace).
+
+        :param str localname: local name
+
+        :returns: tag
+        :rtype: str
+        """
+        try:
+            tag = self._tags[localname]
+        except KeyError:
+            tag = self._tags[localname] = "{{{}}}{}".format(
+                self._namespace, localname
+            )
+        return tag
+
+    def _find_page_element(self, prop, element, latest_only=False):
         """Find page element.
 
         :param tuple prop: properties
         :param Element page_element: page element
+        :param bool latest_only: toggle latest revision only on/off
 
-        :returns: page element
-        :rtype: dict
+        :returns: page element (fields not part of the projection are None,
+            redirect is the title attribute of the redirect element, i.e.
+            None unless the page is a redirect)
+        :rtype: PageRecord
         """
+        prop, revision_prop, contributor_prop = _get_projection(prop)
         page_element = {}
         if "title" in prop:
-            title_element = element.find("{*}title")
+            title_element = element.find(self._tag("title"))
             page_element["title"] = title_element.text or ""
         if "ns" in prop:
-            ns_element = element.find("{*}ns")
+            ns_element = element.find(self._tag("ns"))
             page_element["ns"] = ns_element.text or ""
         if "id" in prop:
-            pageid_element = element.find("{*}id")
+            pageid_element = element.find(self._tag("id"))
             page_element["id"] = pageid_element.text or ""
         if "redirect" in prop:
-            redirect_element = element.find("{*}redirect")
-            page_element["redirect"] = redirect_element.text or ""
-        if "revision" in prop:
-            elements = element.iterfind("{*}revision")
+            redirect_element = element.find(self._tag("redirect"))
+            if redirect_element is not None:
+                page_element["redirect"] = redirect_element.get("title", "")
+        if revision_prop:
+            if latest_only:
+                elements = element.findall(self._tag("revision"))[-1:]
+            else:
+                elements = element.iterfind(self._tag("revision"))
             page_element["revision"] = list(
-                self._find_revision_elements(elements)
+                self._find_revision_elements(
+                    elements, revision_prop, contributor_prop
+                )
             )
-        return page_element
+        return src.page_elements.PageRecord(**page_element)
 
-    def _find_revision_elements(self, elements):
+    def _find_revision_elements(
+            self, elements,
+            prop=REVISION_PROP, contributor_prop=CONTRIBUTOR_PROP
+    ):
         """Find revision elements.
 
         :param generator elements: revision elements
+        :param tuple prop: revision properties
+        :param tuple contributor_prop: contributor properties
 
         :returns: revision elements
         :rtype: generator
         """
         for element in elements:
-            yield self._find_revision_element(element)
+            yield self._find_revision_element(
+                element, prop=prop, contributor_prop=contributor_prop
+            )
 
-    def _find_revision_element(self, element):
+    def _find_revision_element(
+            self, element,
+            prop=REVISION_PROP, contributor_prop=CONTRIBUTOR_PROP
+    ):
         """Find revision element.
 
+        Only the child elements given by the (revision and contributor)
+        properties are looked up.
+
         :param Element element: revision element
+        :param tuple prop: revision properties
+        :param tuple contributor_prop: contributor properties
 
         :returns: revision element
-        :rtype: dict
+        :rtype: RevisionRecord
         """
         try:
             revision_element = {}
-            id_element = element.find("{*}id")
-            revision_element["id"] = id_element.text or ""
-            parentid_element = element.find("{*}parentid")
-            if parentid_element is not None:
-                revision_element["parentid"] = parentid_element.text or ""
-            else:
-                revision_element["parentid"] = ""
-            timestamp_element = element.find("{*}timestamp")
-            revision_element["timestamp"] = timestamp_element.text or ""
-            revision_element["contributor"] = self._find_contributor_element(
-                element.find("{*}contributor")
-            )
-            minor_element = element.find("{*}minor")
-            if minor_element is not None:
-                revision_element["minor"] = minor_element.text or ""
-            else:
-                revision_element["minor"] = ""
-            comment_element = element.find("{*}comment")
-            if comment_element is not None:
-                revision_element["comment"] = comment_element.text or ""
-            else:
-                revision_element["comment"] = ""
-            model_element = element.find("{*}model")
-            revision_element["model"] = model_element.text or ""
-            format_element = element.find("{*}format")
-            revision_element["format"] = format_element.text or ""
-            text_element = element.find("{*}text")
-            revision_element["text"] = self._find_text_element(text_element)
-            sha1_element = element.find("{*}sha1")
-            revision_element["sha1"] = sha1_element.text or ""
+            for name in prop:
+                child_element = element.find(self._tag(name))
+                if name == "contributor":
+                    revision_element[name] = self._find_contributor_element(
+                        child_element, prop=contributor_prop
+                    )
+                elif name == "text":
+                    revision_element[name] = self._find_text_element(
+                        child_element
+                    )
+                elif child_element is not None:
+                    revision_element[name] = child_element.text or ""
+                elif name in OPTIONAL_REVISION_PROP:
+                    revision_element[name] = ""
+                else:
+                    msg = "{} element is missing".format(name)
+                    raise ValueError(msg)
         except Exception as exception:
             msg = "failed to find revision element\t: {}"
             raise RuntimeError(msg.format(exception))
-        return revision_element
+        return src.page_elements.RevisionRecord(**revision_element)
 
-    @staticmethod
-    def _find_contributor_element(element):
+    def _find_contributor_element(self, element, prop=CONTRIBUTOR_PROP):
         """Find contributor element.
 
         :param Element element: contributor element
+        :param tuple prop: contributor properties
 
         :returns: contributor element
-        :rtype: dict
+        :rtype: Contributor
         """
         try:
             contributor_element = {}
-            username_element = element.find("{*}username")
-            if username_element is not None:
-                contributor_element["username"] = username_element.text or ""
-            else:
-                contributor_element["username"] = ""
-            id_element = element.find("{*}id")
-            if id_element is not None:
-                contributor_element["id"] = id_element.text or ""
-            else:
-                contributor_element["id"] = ""
-            ip_element = element.find("{*}ip")
-            if ip_element is not None:
-                contributor_element["ip"] = ip_element.text or ""
-            else:
-                contributor_element["ip"] = ""
-            # attribute (optional)
-            if "deleted" in element.attrib:
-                contributor_element["deleted"] = element.attrib["deleted"]
-            else:
-                contributor_element["deleted"] = ""
+            for name in prop:
+                if name == "deleted":
+                    # attribute (optional)
+                    contributor_element[name] = element.attrib.get(name, "")
+                else:
+                    child_element = element.find(self._tag(name))
+                    if child_element is not None:
+                        contributor_element[name] = child_element.text or ""
+                    else:
+                        contributor_element[name] = ""
         except Exception as exception:
             msg = "failed to find contributor element\t: {}"
             raise RuntimeError(msg.format(exception))
-        return contributor_element
+        return src.page_elements.Contributor(**contributor_element)
 
     @staticmethod
     def _find_text_element(element):
@@ -276,7 +786,7 @@ class ExportFileParser():
         :param Element element: text element
 
         :returns: text element
-        :rtype: str
+        :rtype: Text
         """
         try:
             text_element = {}
@@ -302,4 +812,4 @@ class ExportFileParser():
         except Exception as exception:
             msg = "failed to find text element\t: {}"
             raise RuntimeError(msg.format(exception))
-        return text_element
+        return src.page_elements.Text(**text_element)
@@ -84,3 +84,35 @@ def line_break(draw):
     )
     line_break_ = draw(hypothesis.strategies.sampled_from(elements))
     return line_break_
+
+
+@hypothesis.strategies.composite
+def sections(draw, max_size):
+    """Return wikitext divided into sections.
+
+    :param int max_size: maximum number of sections
+
+    Every heading is on a line of its own, the lead is empty if the
+    wikitext starts with a heading.
+
+    :returns: wikitext
+    :rtype: str
+    """
+    alphabet = hypothesis.strategies.characters(
+        blacklist_characters="\r<="
+    )
+    wikitext = draw(hypothesis.strategies.text(alphabet=alphabet))
+    levels = draw(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.integers(min_value=2, max_value=6),
+            max_size=max_size
+        )
+    )
+    for level in levels:
+        heading_text_ = draw(heading_text(1, 16))
+        section_ = draw(section(heading_text_, level))
+        text = draw(hypothesis.strategies.text(alphabet=alphabet))
+        if wikitext:
+            wikitext += "\n"
+        wikitext += "{}\n{}".format(section_, text)
+    return wikitext
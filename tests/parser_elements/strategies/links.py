@@ -243,3 +243,47 @@ def external_link(draw, url_, link_text_=""):
         url=url_, space_tab=space_tab, link_text=link_text_
     )
     return external_link_
+
+
+@hypothesis.strategies.composite
+def wikitext(draw, max_size):
+    """Return wikitext (prose containing internal and external links and
+    fragments thereof).
+
+    :param int max_size: maximum number of prose chunks and links
+
+    :returns: wikitext
+    :rtype: str
+    """
+    prose = hypothesis.strategies.text(
+        alphabet="ab :#|[]\n\t", max_size=8
+    )
+    page_name_ = page_name(1, 8)
+    internal_link_ = hypothesis.strategies.builds(
+        internal_link,
+        page_name_,
+        namespace_prefix=hypothesis.strategies.one_of(
+            hypothesis.strategies.sampled_from(("", ":")),
+            namespace().map(lambda namespace_: namespace_ + ":"),
+            namespace().map(lambda namespace_: namespace_.lower() + ":")
+        ),
+        piped=hypothesis.strategies.one_of(
+            hypothesis.strategies.just(""),
+            link_text(0, 8).map(lambda link_text_: "|" + link_text_)
+        ),
+        word_ending_=word_ending(0, 4)
+    )
+    external_link_ = hypothesis.strategies.tuples(
+        url(1, 16), link_text(0, 8)
+    ).flatmap(
+        lambda args: external_link(args[0], link_text_=args[1])
+    )
+    chunks = draw(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.one_of(
+                prose, internal_link_, external_link_
+            ),
+            max_size=max_size
+        )
+    )
+    return "".join(chunks)
@@ -441,3 +441,116 @@ class TestLinks(unittest.TestCase):
             link_text, parse_results["external_link"]["link_text"]
         )
         return
+
+    @hypothesis.given(strategies.links.wikitext(16))
+    def test_scan_internal_links_00(self, wikitext):
+        """Test prefiltered internal link scanning against scan_string.
+
+        :param str wikitext: wikitext
+        """
+        parser_element = links.get_internal_link(self._get_namespaces())
+        self.assertEqual(
+            [
+                (tokens.asList(), start, end)
+                for tokens, start, end in links.scan_string(
+                    parser_element, wikitext
+                )
+            ],
+            [
+                (tokens.asList(), start, end)
+                for tokens, start, end in links.scan_internal_links(
+                    parser_element, wikitext
+                )
+            ]
+        )
+        return
+
+    @hypothesis.given(strategies.links.wikitext(16))
+    def test_scan_external_links_00(self, wikitext):
+        """Test prefiltered external link scanning against scan_string.
+
+        :param str wikitext: wikitext
+        """
+        parser_element = links.get_external_link()
+        self.assertEqual(
+            [
+                (tokens.asList(), start, end)
+                for tokens, start, end in links.scan_string(
+                    parser_element, wikitext
+                )
+            ],
+            [
+                (tokens.asList(), start, end)
+                for tokens, start, end in links.scan_external_links(
+                    parser_element, wikitext
+                )
+            ]
+        )
+        return
+
+    @hypothesis.given(strategies.links.wikitext(16))
+    def test_internal_link_regex_00(self, wikitext):
+        """Test internal_link regular expression against parser element.
+
+        :param str wikitext: wikitext
+        """
+        namespaces = self._get_namespaces()
+        parser_element = links.get_internal_link(namespaces)
+        pattern = links.get_internal_link_regex(namespaces)
+        self.assertEqual(
+            [
+                (start, end)
+                for _, start, end in links.scan_string(
+                    parser_element, wikitext
+                )
+            ],
+            [match.span() for match in pattern.finditer(wikitext)]
+        )
+        return
+
+    @hypothesis.given(strategies.links.wikitext(16))
+    def test_external_link_regex_00(self, wikitext):
+        """Test external_link regular expression against parser element.
+
+        :param str wikitext: wikitext
+        """
+        parser_element = links.get_external_link()
+        pattern = links.get_external_link_regex()
+        self.assertEqual(
+            [
+                (start, end)
+                for _, start, end in links.scan_string(
+                    parser_element, wikitext
+                )
+            ],
+            [match.span() for match in pattern.finditer(wikitext)]
+        )
+        return
+
+    @hypothesis.given(
+        hypothesis.strategies.sampled_from(
+            ("#REDIRECT ", "#REDIRECT\t", "#redirect ", "#Redirect\t", "")
+        ),
+        strategies.links.wikitext(4)
+    )
+    def test_redirect_regex_00(self, prefix, wikitext):
+        """Test redirect regular expression against parser element.
+
+        :param str prefix: prefix
+        :param str wikitext: wikitext
+        """
+        namespaces = self._get_namespaces()
+        parser_element = links.get_redirect(namespaces)
+        pattern = links.get_redirect_regex(namespaces)
+        wikitext = prefix + wikitext
+        ends = [
+            end for _, start, end
+            in links.scan_string(parser_element, wikitext, 1)
+            if start == 0
+        ]
+        match = pattern.match(wikitext)
+        if match is None:
+            self.assertEqual([], ends)
+        else:
+            self.assertEqual([match.end()], ends)
+        return
@@ -0,0 +1,211 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Parse result cache tests.
+"""
+
+
+# standard library imports
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+# third party imports
+
+# library specific imports
+import src.xml
+import src.page
+import src.cache
+import src.parser
+from src.parser_elements import links
+
+
+XML = "examples/Wikipedia-20180812145957.xml"
+
+
+class TestCache(unittest.TestCase):
+    """Parse result cache tests."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_memory_cache_00(self):
+        """Test in-memory cache eviction."""
+        cache = src.cache.MemoryCache(size=2)
+        cache.put("a", b"a")
+        cache.put("b", b"b")
+        self.assertEqual(b"a", cache.get("a"))
+        cache.put("c", b"c")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(b"a", cache.get("a"))
+        self.assertEqual(b"c", cache.get("c"))
+        return
+
+    def test_sqlite_cache_00(self):
+        """Test on-disk cache eviction."""
+        path = os.path.join(self.directory, "cache.db")
+        cache = src.cache.SQLiteCache(path, max_size=20)
+        cache.put("a", 10*b"a")
+        cache.put("b", 10*b"b")
+        self.assertEqual(10*b"a", cache.get("a"))
+        cache.put("c", 10*b"c")
+        self.assertIsNone(cache.get("b"))
+        cache.close()
+        cache = src.cache.SQLiteCache(path, max_size=20)
+        self.assertEqual(10*b"a", cache.get("a"))
+        self.assertEqual(10*b"c", cache.get("c"))
+        cache.put("a", 5*b"a")
+        cache.put("d", 5*b"d")
+        self.assertEqual(10*b"c", cache.get("c"))
+        # pylint: disable=protected-access
+        self.assertEqual(
+            cache._connection.execute(
+                "SELECT TOTAL(size) FROM cache"
+            ).fetchone()[0],
+            cache._connection.execute(
+                "SELECT size FROM cache_size"
+            ).fetchone()[0]
+        )
+        cache.close()
+        return
+
+    def test_parse_cache_00(self):
+        """Test parse cache (section tree and links)."""
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        namespaces = export_file_parser.find_namespace_elements()
+        parser = src.parser.Parser(namespaces)
+        page_element, revision_element = next(
+            export_file_parser.find_revision_elements(
+                prop=("title", "ns", "id", "revision")
+            )
+        )
+        path = os.path.join(self.directory, "cache.db")
+        parse_cache = src.cache.ParseCache(
+            [src.cache.SQLiteCache(path)], namespaces
+        )
+        pages = [
+            src.page.Page(
+                page_element.title, page_element.id, page_element.ns,
+                revision_element.id, revision_element.text.text, parser
+            )
+            for _ in range(2)
+        ]
+        self.assertFalse(parse_cache.load(pages[0], revision_element.sha1))
+        parse_cache.store(pages[0], revision_element.sha1)
+        self.assertTrue(parse_cache.load(pages[1], revision_element.sha1))
+        self.assertEqual(pages[0].section, pages[1].section)
+        self.assertEqual(
+            pages[0].create_pagelinks_table(),
+            pages[1].create_pagelinks_table()
+        )
+        section = pages[1].find_section("Official websites")
+        self.assertEqual(
+            pages[0].find_external_links(section.wikitext),
+            pages[1].find_section_links(section)[1]
+        )
+        other_parse_cache = src.cache.ParseCache(
+            [src.cache.SQLiteCache(path)], {"0": "(Main)"}
+        )
+        self.assertFalse(
+            other_parse_cache.load(pages[1], revision_element.sha1)
+        )
+        parse_cache.close()
+        other_parse_cache.close()
+        return
+
+    def test_parse_cache_01(self):
+        """Test parse cache (pages with the same wikitext but different
+        titles, namespace aliases)."""
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        namespaces = export_file_parser.find_namespace_elements()
+        parser = src.parser.Parser(namespaces)
+        _, revision_element = next(
+            export_file_parser.find_revision_elements(
+                prop=("revision.id", "revision.text", "revision.sha1")
+            )
+        )
+        path = os.path.join(self.directory, "cache.db")
+        parse_cache = src.cache.ParseCache(
+            [src.cache.SQLiteCache(path)], namespaces
+        )
+        alpha, beta = [
+            src.page.Page(
+                title, "1", "0", revision_element.id,
+                revision_element.text.text, parser
+            )
+            for title in ("Alpha", "Beta")
+        ]
+        parse_cache.store(alpha, revision_element.sha1)
+        self.assertTrue(parse_cache.load(beta, revision_element.sha1))
+        self.assertEqual("Beta", beta.section.heading)
+        self.assertIn('"Beta"', beta.find_toc(beta.section))
+        self.assertNotIn("Alpha", beta.find_toc(beta.section))
+        other_parse_cache = src.cache.ParseCache(
+            [src.cache.SQLiteCache(path)],
+            namespaces,
+            aliases=links.ENWIKI_NAMESPACE_ALIASES
+        )
+        self.assertFalse(
+            other_parse_cache.load(beta, revision_element.sha1)
+        )
+        parse_cache.close()
+        other_parse_cache.close()
+        return
+
+    def test_parse_cache_02(self):
+        """Test parse cache (links found creating the pagelinks table are
+        not found again)."""
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        namespaces = export_file_parser.find_namespace_elements()
+        parser = src.parser.Parser(namespaces)
+        page_element, revision_element = next(
+            export_file_parser.find_revision_elements(
+                prop=("title", "ns", "id", "revision")
+            )
+        )
+        path = os.path.join(self.directory, "cache.db")
+        parse_cache = src.cache.ParseCache(
+            [src.cache.SQLiteCache(path)], namespaces
+        )
+        pages = [
+            src.page.Page(
+                page_element.title, page_element.id, page_element.ns,
+                revision_element.id, revision_element.text.text, parser
+            )
+            for _ in range(3)
+        ]
+        rows = pages[0].create_pagelinks_table()
+        with unittest.mock.patch.object(
+                parser, "find_links", side_effect=AssertionError
+        ):
+            parse_cache.store(pages[0], revision_element.sha1)
+        self.assertTrue(parse_cache.load(pages[1], revision_element.sha1))
+        self.assertEqual(rows, pages[1].create_pagelinks_table())
+        for section in pages[2].section.subsections:
+            self.assertEqual(
+                pages[2].find_section_links(section),
+                pages[1].find_section_links(section)
+            )
+        parse_cache.close()
+        return
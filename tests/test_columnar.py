@@ -0,0 +1,90 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Columnar pagelinks file format tests.
+"""
+
+
+# standard library imports
+import os
+import shutil
+import tempfile
+import unittest
+
+# third party imports
+import hypothesis
+import hypothesis.strategies
+
+# library specific imports
+import src.columnar
+
+
+PAGES = hypothesis.strategies.lists(
+    hypothesis.strategies.tuples(
+        hypothesis.strategies.integers(min_value=0, max_value=2**63-1),
+        hypothesis.strategies.integers(min_value=-2, max_value=2**15-1),
+        hypothesis.strategies.lists(
+            hypothesis.strategies.tuples(
+                hypothesis.strategies.integers(
+                    min_value=-2, max_value=2**15-1
+                ),
+                hypothesis.strategies.text(max_size=8)
+            ),
+            max_size=8
+        )
+    ),
+    max_size=8
+)
+
+
+class TestColumnar(unittest.TestCase):
+    """Columnar pagelinks file format tests."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @hypothesis.given(PAGES)
+    def test_columnar_00(self, pages):
+        """Test writing and reading columnar pagelinks file.
+
+        :param list pages: pages (page ID, page namespace and links)
+        """
+        path = os.path.join(self.directory, "pagelinks.wpl")
+        with src.columnar.ColumnarWriter(path, batch_size=4) as writer:
+            for page_id, page_namespace, links in pages:
+                writer.write(str(page_id), str(page_namespace), links)
+        with src.columnar.ColumnarReader(path) as reader:
+            self.assertEqual(pages, list(reader))
+            self.assertEqual(
+                len({title for _, _, links in pages for _, title in links}),
+                len(reader.string_offset) - 1
+            )
+        return
+
+    def test_columnar_01(self):
+        """Test reading invalid columnar pagelinks file."""
+        path = os.path.join(self.directory, "pagelinks.wpl")
+        with open(path, "wb") as fp:  # pylint: disable=invalid-name
+            fp.write(64*b"\0")
+        with self.assertRaises(RuntimeError):
+            src.columnar.ColumnarReader(path)
+        return
@@ -0,0 +1,148 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Incremental pagelinks extraction tests.
+"""
+
+
+# standard library imports
+import unittest
+
+# third party imports
+
+# library specific imports
+import src.xml
+import src.page
+import src.parser
+import src.incremental
+import src.page_elements
+
+
+XML = "examples/Wikipedia-20180812145957.xml"
+
+
+class TestIncrementalExtractor(unittest.TestCase):
+    """Incremental pagelinks extraction tests."""
+
+    @classmethod
+    def setUpClass(cls):
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        cls.parser = src.parser.Parser(
+            export_file_parser.find_namespace_elements()
+        )
+        cls.revision_elements = list(
+            export_file_parser.find_revision_elements(
+                prop=("title", "ns", "id", "revision")
+            )
+        )
+        # shorten Doctor Who (lead, Premise, Chronology and canonicity, ...)
+        page_element, revision_element = cls.revision_elements[0]
+        wikitext = revision_element.text.text
+        wikitext = wikitext[:9152] + wikitext[140704:]
+        cls.revision_elements[0] = (
+            page_element,
+            revision_element._replace(
+                text=revision_element.text._replace(text=wikitext)
+            )
+        )
+
+    def _create_history(self, page_element, revision_element):
+        """Create revision history (every revision removes a section or
+        reverts the previous revision).
+
+        :param PageRecord page_element: page element
+        :param RevisionRecord revision_element: revision element
+
+        :returns: page and revision elements
+        :rtype: list
+        """
+        wikitext = revision_element.text.text
+        section = src.page.Page(
+            page_element.title, page_element.id, page_element.ns,
+            revision_element.id, wikitext, self.parser
+        ).section
+        wikitexts = [wikitext]
+        for subsection in section.subsections:
+            wikitexts.append(
+                wikitexts[-1].replace(
+                    wikitext[subsection.heading_start:subsection.end], ""
+                )
+            )
+            wikitexts.append(wikitexts[-2])
+        history = []
+        parentid = ""
+        for i, wikitext in enumerate(wikitexts):
+            id_ = "{}.{}".format(revision_element.id, i)
+            history.append(
+                (
+                    page_element,
+                    revision_element._replace(
+                        id=id_,
+                        parentid=parentid,
+                        text=revision_element.text._replace(text=wikitext),
+                        sha1=str(hash(wikitext))
+                    )
+                )
+            )
+            parentid = id_
+        return history
+
+    def test_extract_00(self):
+        """Test pagelinks deltas against pagelinks tables."""
+        for page_element, revision_element in self.revision_elements[:5]:
+            history = self._create_history(page_element, revision_element)
+            rows = set()
+            for (page_element_, revision_element_), pagelinks_delta in zip(
+                    history,
+                    src.incremental.find_pagelinks_deltas(history, self.parser)
+            ):
+                self.assertEqual(
+                    revision_element_.id, pagelinks_delta.revision_id
+                )
+                self.assertTrue(rows.isdisjoint(pagelinks_delta.added))
+                self.assertTrue(rows.issuperset(pagelinks_delta.removed))
+                rows.update(pagelinks_delta.added)
+                rows.difference_update(pagelinks_delta.removed)
+                page = src.page.Page(
+                    page_element_.title, page_element_.id, page_element_.ns,
+                    revision_element_.id, revision_element_.text.text,
+                    self.parser
+                )
+                self.assertEqual(set(page.create_pagelinks_table()), rows)
+        return
+
+    def test_extract_01(self):
+        """Test pagelinks delta of revision with unknown parent revision."""
+        page_element, revision_element = self.revision_elements[0]
+        incremental_extractor = src.incremental.IncrementalExtractor(
+            self.parser
+        )
+        pagelinks_delta = incremental_extractor.extract(
+            page_element, revision_element._replace(parentid="0")
+        )
+        self.assertIsNone(pagelinks_delta.parentid)
+        self.assertEqual([], pagelinks_delta.removed)
+        page = src.page.Page(
+            page_element.title, page_element.id, page_element.ns,
+            revision_element.id, revision_element.text.text, self.parser
+        )
+        self.assertEqual(
+            sorted(set(page.create_pagelinks_table())), pagelinks_delta.added
+        )
+        return
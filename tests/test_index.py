@@ -0,0 +1,119 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Indexed Wikipedia export file parser tests.
+"""
+
+
+# standard library imports
+import os
+import bz2
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+# third party imports
+
+# library specific imports
+import src.xml
+import src.index
+
+
+XML = "examples/Wikipedia-20180812145957.xml"
+
+
+class TestIndexedExportFileParser(unittest.TestCase):
+    """Indexed Wikipedia export file parser tests."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_get_page_00(self):
+        """Test getting page elements by title and by page ID."""
+        prop = ("title", "ns", "id", "redirect", "revision")
+        export_file_parser = src.index.IndexedExportFileParser(
+            XML, None, index=os.path.join(self.directory, "index.db")
+        )
+        page_elements = list(
+            src.xml.ExportFileParser(XML, None).find_page_elements(prop=prop)
+        )
+        self.assertEqual(len(page_elements), export_file_parser.build_index())
+        for page_element in page_elements:
+            self.assertEqual(
+                page_element,
+                export_file_parser.get_page(
+                    title=page_element.title, prop=prop
+                )
+            )
+            self.assertEqual(
+                page_element,
+                export_file_parser.get_page(id_=page_element.id, prop=prop)
+            )
+        self.assertIsNone(export_file_parser.get_page(title="Nonexistent"))
+        export_file_parser.close()
+        return
+
+    def test_get_page_01(self):
+        """Test getting page element (index built on first lookup)."""
+        export_file_parser = src.index.IndexedExportFileParser(
+            XML, None, index=os.path.join(self.directory, "lazy.db")
+        )
+        self.assertEqual(
+            "8209", export_file_parser.get_page(title="Doctor Who").id
+        )
+        export_file_parser.close()
+        return
+
+    def test_get_page_02(self):
+        """Test getting page element (stale page index)."""
+        index = os.path.join(self.directory, "stale.db")
+        export_file_parser = src.index.IndexedExportFileParser(
+            XML, None, index=index
+        )
+        export_file_parser.build_index()
+        connection = sqlite3.connect(index)
+        with connection:
+            connection.execute(
+                "UPDATE page_index SET offset = "
+                "(SELECT MAX(offset) FROM page_index) "
+                "WHERE title = 'Doctor Who'"
+            )
+        connection.close()
+        with self.assertRaises(RuntimeError):
+            export_file_parser.get_page(title="Doctor Who")
+        export_file_parser.close()
+        return
+
+    def test_build_index_00(self):
+        """Test building page index of compressed export file."""
+        xml = os.path.join(self.directory, "export.xml.bz2")
+        with open(XML, "rb") as fp:  # pylint: disable=invalid-name
+            with bz2.open(xml, "wb") as compressed_fp:
+                shutil.copyfileobj(fp, compressed_fp)
+        export_file_parser = src.index.IndexedExportFileParser(xml, None)
+        with self.assertRaises(RuntimeError):
+            export_file_parser.build_index()
+        export_file_parser.close()
+        return
@@ -0,0 +1,251 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+:synopsis: Multistream Wikipedia export file parser tests.
+"""
+
+
+# standard library imports
+import os
+import re
+import bz2
+import gzip
+import shutil
+import tempfile
+import unittest
+
+# third party imports
+import lxml.etree
+
+# library specific imports
+import src.xml
+import src.multistream
+
+
+XML = "examples/Wikipedia-20180812145957.xml"
+PROP = ("title", "ns", "id", "revision")
+# XSD rejecting every page element
+XSD = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  targetNamespace="http://www.mediawiki.org/xml/export-0.10/"
+  elementFormDefault="qualified">
+  <xs:element name="mediawiki">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="siteinfo" minOccurs="0">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:any processContents="skip" minOccurs="0"
+                maxOccurs="unbounded"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+      <xs:anyAttribute processContents="skip"/>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+
+def write_multistream(xml, directory, size=10):
+    """Write multistream export file and index.
+
+    :param str xml: XML file
+    :param str directory: directory
+    :param int size: number of pages per stream
+
+    :returns: multistream export file and index
+    :rtype: tuple
+    """
+    with open(xml, encoding="utf-8") as fp:  # pylint: disable=invalid-name
+        text = fp.read()
+    header = text[:text.index("  <page>")]
+    pages = re.findall(r"  <page>.*?</page>\n", text, flags=re.DOTALL)
+    multistream = os.path.join(directory, "multistream.xml.bz2")
+    index = os.path.join(directory, "multistream-index.txt.bz2")
+    lines = []
+    with open(multistream, "wb") as fp:  # pylint: disable=invalid-name
+        fp.write(bz2.compress(header.encode("utf-8")))
+        for i in range(0, len(pages), size):
+            offset = fp.tell()
+            for page in pages[i:i+size]:
+                element = lxml.etree.fromstring(page)
+                lines.append(
+                    "{}:{}:{}\n".format(
+                        offset,
+                        element.findtext("id"),
+                        element.findtext("title")
+                    )
+                )
+            fp.write(bz2.compress("".join(pages[i:i+size]).encode("utf-8")))
+        fp.write(bz2.compress(b"</mediawiki>\n"))
+    with bz2.open(index, "wt", encoding="utf-8") as fp:  # pylint: disable=C0103
+        fp.writelines(lines)
+    return multistream, index
+
+
+class TestMultistream(unittest.TestCase):
+    """Multistream Wikipedia export file parser tests."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.multistream, cls.index = write_multistream(XML, cls.directory)
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        cls.page_elements = list(
+            export_file_parser.find_page_elements(prop=PROP)
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_compressed_00(self):
+        """Test (gzip) compressed export file."""
+        path = os.path.join(self.directory, "export.xml.gz")
+        with open(XML, "rb") as fp:  # pylint: disable=invalid-name
+            with gzip.open(path, "wb") as gzip_fp:
+                shutil.copyfileobj(fp, gzip_fp)
+        for streaming in (False, True):
+            export_file_parser = src.xml.ExportFileParser(
+                path, None, streaming=streaming
+            )
+            self.assertEqual(
+                self.page_elements,
+                list(export_file_parser.find_page_elements(prop=PROP))
+            )
+        return
+
+    def test_find_page_elements_00(self):
+        """Test finding page elements in multistream export file."""
+        export_file_parser = src.multistream.MultistreamExportFileParser(
+            self.multistream, None, self.index
+        )
+        self.assertEqual("en", export_file_parser.find_language_attrib())
+        self.assertEqual(
+            self.page_elements,
+            list(export_file_parser.find_page_elements(prop=PROP))
+        )
+        return
+
+    def test_find_page_elements_01(self):
+        """Test finding page elements in multistream export file (in worker
+        processes)."""
+        export_file_parser = src.multistream.MultistreamExportFileParser(
+            self.multistream, None, self.index
+        )
+        self.assertEqual(
+            self.page_elements,
+            list(
+                export_file_parser.find_page_elements(prop=PROP, processes=2)
+            )
+        )
+        return
+
+    def test_find_offsets_00(self):
+        """Test finding byte offsets of bzip2 streams."""
+        offsets = [
+            offset for offset, _, _ in src.multistream.read_index(self.index)
+        ]
+        self.assertEqual(
+            sorted(set(offsets)),
+            list(src.multistream.find_offsets(self.index))
+        )
+        return
+
+    def test_get_page_00(self):
+        """Test getting page element by title."""
+        export_file_parser = src.multistream.MultistreamExportFileParser(
+            self.multistream, None, self.index
+        )
+        for page_element in self.page_elements:
+            self.assertEqual(
+                page_element,
+                export_file_parser.get_page(
+                    title=page_element["title"], prop=PROP
+                )
+            )
+        return
+
+    def test_get_page_01(self):
+        """Test getting page element by page ID."""
+        export_file_parser = src.multistream.MultistreamExportFileParser(
+            self.multistream, None, self.index
+        )
+        for page_element in self.page_elements:
+            self.assertEqual(
+                page_element,
+                export_file_parser.get_page(id_=page_element["id"], prop=PROP)
+            )
+        return
+
+    def test_get_page_02(self):
+        """Test getting non-existent page element."""
+        export_file_parser = src.multistream.MultistreamExportFileParser(
+            self.multistream, None, self.index
+        )
+        self.assertIsNone(export_file_parser.get_page(title="Doctor Who?"))
+        self.assertIsNone(export_file_parser.get_page(id_="0"))
+        return
+
+    def test_get_page_03(self):
+        """Test getting page element (offsets database)."""
+        directory = tempfile.mkdtemp(dir=self.directory)
+        index = os.path.join(directory, "index.txt.bz2")
+        shutil.copy(self.index, index)
+        export_file_parser = src.multistream.MultistreamExportFileParser(
+            self.multistream, None, index
+        )
+        self.assertEqual(
+            len(self.page_elements), export_file_parser.build_index()
+        )
+        export_file_parser.close()
+        os.remove(index)
+        export_file_parser = src.multistream.MultistreamExportFileParser(
+            self.multistream, None, index
+        )
+        page_element = self.page_elements[-1]
+        self.assertEqual(
+            page_element,
+            export_file_parser.get_page(title=page_element.title, prop=PROP)
+        )
+        export_file_parser.close()
+        return
+
+    def test_validation_00(self):
+        """Test streaming validation (in worker processes)."""
+        xsd = os.path.join(self.directory, "export.xsd")
+        with open(xsd, "w", encoding="utf-8") as fp:  # pylint: disable=C0103
+            fp.write(XSD)
+        export_file_parser = src.multistream.MultistreamExportFileParser(
+            self.multistream, xsd, self.index
+        )
+        self.assertEqual("streaming", export_file_parser.validation)
+        for processes in (1, 2):
+            with self.assertRaises(RuntimeError):
+                list(
+                    export_file_parser.find_page_elements(
+                        prop=PROP, processes=processes
+                    )
+                )
+        with self.assertRaises(RuntimeError):
+            export_file_parser.get_page(
+                title=self.page_elements[0]["title"]
+            )
+        return
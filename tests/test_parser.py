@@ -0,0 +1,391 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+:synopsis: Wikitext parser tests.
+"""
+
+
+# standard library imports
+import csv
+import unittest
+
+# third party imports
+import hypothesis
+
+# library specific imports
+import src.xml
+import src.page
+import src.page_elements
+import src.parser
+from src.parser_elements import layout, links
+from tests.parser_elements import strategies
+
+
+XML = "examples/Wikipedia-20180812145957.xml"
+
+
+def _get_namespaces():
+    """Get namespaces (tests/parser_elements/data/namespaces.csv).
+
+    :returns: namespaces
+    :rtype: dict
+    """
+    # pylint: disable=invalid-name
+    with open("tests/parser_elements/data/namespaces.csv") as fp:
+        reader = csv.reader(fp)
+        namespaces = {"0": "(Main)"}
+        for i, namespace in enumerate(next(reader), start=1):
+            namespaces[str(i)] = namespace
+    return namespaces
+
+
+def _find_sections(wikitext, level=2):
+    """Find sections (recursive reference implementation, splitting the
+    wikitext level by level).
+
+    :param str wikitext: wikitext
+    :param int level: level
+
+    :returns: section
+    :rtype: Section
+    """
+    pattern = layout.get_section_regex(level=level)
+    matches = [
+        match[0] if match[0] else match[1]
+        for match in pattern.findall(wikitext)
+    ]
+    if not matches:
+        return src.page_elements.Section(level-1, "", wikitext, [])
+    pattern = layout.get_section_regex(level=level, non_capturing=True)
+    # the lead is empty if the wikitext starts with a heading
+    splits = pattern.split(wikitext)
+    assert len(matches) == len(splits)-1
+    if level == 6:
+        subsections = [
+            src.page_elements.Section(level, heading, wikitext, [])
+            for heading, wikitext in zip(matches, splits[1:])
+        ]
+    else:
+        subsections = [
+            _find_sections(split, level=level+1)._replace(heading=heading)
+            for heading, split in zip(matches, splits[1:])
+        ]
+    return src.page_elements.Section(level-1, "", splits[0], subsections)
+
+
+class TestParser(unittest.TestCase):
+    """Wikitext parser tests."""
+
+    # pylint: disable=no-value-for-parameter
+    @hypothesis.given(strategies.layout.sections(16))
+    def test_find_sections_00(self, wikitext):
+        """Test find_sections (single pass) against reference implementation.
+
+        :param str wikitext: wikitext
+        """
+        self.assertEqual(
+            _find_sections(wikitext),
+            src.parser.Parser.find_sections(wikitext)
+        )
+        return
+
+    @hypothesis.given(strategies.layout.sections(16))
+    def test_find_section_spans_00(self, wikitext):
+        """Test find_section_spans offsets.
+
+        :param str wikitext: wikitext
+        """
+        section = src.parser.Parser.find_section_spans(wikitext)
+        stack = [section]
+        offsets = []
+        while stack:
+            section = stack.pop()
+            offsets.append((section.heading_start, section.heading_end))
+            offsets.append((section.start, section.end))
+            stack += section.subsections
+        self.assertEqual(
+            len(wikitext), sum(end - start for start, end in offsets)
+        )
+        return
+
+    def test_find_section_spans_01(self):
+        """Test find_section_spans (leading heading, subsections are
+        expanded on first access)."""
+        wikitext = "== A ==\nx\n=== B ===\ny\n== C ==\nz"
+        section = src.parser.Parser.find_section_spans(wikitext)
+        # pylint: disable=protected-access
+        self.assertIsNone(section.subsections._subsections)
+        self.assertEqual("", section.wikitext)
+        self.assertEqual(
+            [" A ", " C "],
+            [subsection.heading for subsection in section.subsections]
+        )
+        subsections = section.subsections[0].subsections
+        self.assertIsNone(subsections._subsections)
+        self.assertEqual(
+            ["\ny\n"], [subsection.wikitext for subsection in subsections]
+        )
+        self.assertEqual([], section.subsections[1].subsections)
+        return
+
+
+class TestEngines(unittest.TestCase):
+    """Differential tests (pyparsing and regex engine)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parsers = [
+            src.parser.Parser(_get_namespaces(), engine=engine)
+            for engine in src.parser.Parser.ENGINES
+        ]
+
+    # pylint: disable=no-value-for-parameter
+    @hypothesis.given(strategies.links.wikitext(16))
+    def test_find_internal_links_00(self, wikitext):
+        """Test finding internal links (generated wikitext).
+
+        :param str wikitext: wikitext
+        """
+        pyparsing_parser, regex_parser = self.parsers
+        self.assertEqual(
+            pyparsing_parser.find_internal_links(wikitext),
+            regex_parser.find_internal_links(wikitext)
+        )
+        return
+
+    @hypothesis.given(strategies.links.wikitext(16))
+    def test_find_external_links_00(self, wikitext):
+        """Test finding external links (generated wikitext).
+
+        :param str wikitext: wikitext
+        """
+        self.assertEqual(
+            src.parser.Parser.find_external_links(wikitext),
+            src.parser.Parser.find_external_links(wikitext, engine="regex")
+        )
+        return
+
+    def test_find_internal_links_01(self):
+        """Test finding internal links (namespace, link_text and
+        word_ending)."""
+        for parser in self.parsers:
+            self.assertEqual(
+                [
+                    src.page_elements.InternalLink("1", "Foo#top", "bars"),
+                    src.page_elements.InternalLink("14", "X", "X"),
+                    src.page_elements.InternalLink("0", "Category:X", "Y")
+                ],
+                parser.find_internal_links(
+                    "[[Talk:Foo#top|bar]]s [[category:X]] [[:Category:X|Y]]"
+                )
+            )
+            self.assertEqual(
+                [src.page_elements.ExternalLink("http://a.b", "c d")],
+                parser.find_external_links(
+                    "[http://a.b c d]", engine=parser.engine
+                )
+            )
+        return
+
+    def test_find_internal_links_02(self):
+        """Test finding internal links (namespace aliases)."""
+        wikitext = "[[Image:Foo.jpg]] [[project talk:X]] [[WP:NPOV]]"
+        for engine in src.parser.Parser.ENGINES:
+            parser = src.parser.Parser(_get_namespaces(), engine=engine)
+            self.assertEqual(
+                [("6", "Foo.jpg"), ("5", "X"), ("0", "WP:NPOV")],
+                [
+                    (internal_link.namespace, internal_link.page_name)
+                    for internal_link in parser.find_internal_links(wikitext)
+                ]
+            )
+            parser = src.parser.Parser(
+                _get_namespaces(),
+                engine=engine,
+                aliases=links.ENWIKI_NAMESPACE_ALIASES
+            )
+            internal_link = parser.find_internal_links(wikitext)[2]
+            self.assertEqual(
+                ("4", "NPOV"),
+                (internal_link.namespace, internal_link.page_name)
+            )
+        return
+
+    def test_find_links_00(self):
+        """Test finding internal and external links (example export
+        file)."""
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        namespaces = export_file_parser.find_namespace_elements()
+        pyparsing_parser, regex_parser = [
+            src.parser.Parser(namespaces, engine=engine)
+            for engine in src.parser.Parser.ENGINES
+        ]
+        for _, revision_element in export_file_parser.find_revision_elements(
+                prop=("revision.text",)
+        ):
+            wikitext = revision_element.text.text
+            self.assertEqual(
+                pyparsing_parser.find_internal_links(wikitext),
+                regex_parser.find_internal_links(wikitext)
+            )
+            self.assertEqual(
+                pyparsing_parser.find_external_links(
+                    wikitext, engine=pyparsing_parser.engine
+                ),
+                regex_parser.find_external_links(
+                    wikitext, engine=regex_parser.engine
+                )
+            )
+        return
+
+    # pylint: disable=no-value-for-parameter
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            strategies.links.wikitext(16), max_size=4
+        )
+    )
+    def test_extract_many_00(self, wikitexts):
+        """Test extracting internal links of several wikitexts at once.
+
+        :param list wikitexts: wikitexts
+        """
+        for parser in self.parsers:
+            columns = parser.extract_many(wikitexts)
+            self.assertEqual(
+                [
+                    (index, int(internal_link.namespace)) + internal_link[1:]
+                    for index, wikitext in enumerate(wikitexts)
+                    for internal_link in parser.find_internal_links(wikitext)
+                ],
+                list(zip(*columns))
+            )
+        return
+
+    def test_extract_many_01(self):
+        """Test extracting internal links of several wikitexts at once
+        (no link spans two wikitexts)."""
+        wikitexts = ["[[A", "]]", "", "[[B]]", "c [[C]]d"]
+        for parser in self.parsers:
+            columns = parser.extract_many(wikitexts)
+            self.assertEqual([3, 4], list(columns.source))
+            self.assertEqual(["B", "Cd"], columns.link_text)
+        return
+
+    # pylint: disable=no-value-for-parameter
+    @hypothesis.given(strategies.links.wikitext(16))
+    def test_find_links_01(self, wikitext):
+        """Test finding internal and external links at once (generated
+        wikitext).
+
+        :param str wikitext: wikitext
+        """
+        for parser in self.parsers:
+            self.assertEqual(
+                (
+                    parser.find_internal_links(wikitext),
+                    parser.find_external_links(
+                        wikitext, engine=parser.engine
+                    )
+                ),
+                parser.find_links(wikitext)
+            )
+        return
+
+    def test_find_links_02(self):
+        """Test finding internal and external links at once (overlapping
+        links, offsets)."""
+        wikitext = "x [[http://a.b c]] [[A|[http://d.e]]] [[B]]"
+        for parser in self.parsers:
+            internal_links, external_links = parser.find_links(wikitext)
+            self.assertEqual(
+                ["http://a.b c", "B"],
+                [internal_link.page_name for internal_link in internal_links]
+            )
+            self.assertEqual(
+                ["c", "http://d.e"],
+                [external_link.link_text for external_link in external_links]
+            )
+            self.assertEqual(
+                (internal_links[1:], []),
+                parser.find_links(wikitext, start=wikitext.index("[[B"))
+            )
+        return
+
+    def test_find_redirect_00(self):
+        """Test finding redirect (case-insensitive, leading whitespace)."""
+        for parser in self.parsers:
+            for wikitext in (
+                    "#REDIRECT [[Foo bar]]", "#redirect\t[[Foo bar]]",
+                    " \n#Redirect [[Foo bar#A|x]]\n[[Baz]]"
+            ):
+                self.assertEqual(
+                    "Foo bar",
+                    parser.find_redirect(wikitext).page_name.split("#")[0]
+                )
+            for wikitext in (
+                    "x #REDIRECT [[Foo bar]]", "#REDIRECTS [[Foo bar]]",
+                    "#REDIRECT [[Foo\nbar]]", ""
+            ):
+                self.assertIsNone(parser.find_redirect(wikitext))
+        return
+
+    def test_extract_00(self):
+        """Test extracting sections and links at once (example export
+        file)."""
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        namespaces = export_file_parser.find_namespace_elements()
+        for page_element, revision_element in \
+                export_file_parser.find_revision_elements(
+                    prop=("title", "id", "ns", "revision.id", "revision.text")
+                ):
+            for engine in src.parser.Parser.ENGINES:
+                parser = src.parser.Parser(namespaces, engine=engine)
+                page = src.page.Page(
+                    page_element.title,
+                    page_element.id,
+                    page_element.ns,
+                    revision_element.id,
+                    revision_element.text.text,
+                    parser
+                )
+                extraction = page.extract()
+                self.assertEqual(page.section, extraction.section)
+                for section in page._search_depth_first(  # pylint: disable=W0212
+                        page.section
+                ):
+                    self.assertEqual(
+                        (
+                            parser.find_internal_links(section.wikitext),
+                            parser.find_external_links(
+                                section.wikitext, engine=parser.engine
+                            )
+                        ),
+                        (
+                            [
+                                link for section_, link
+                                in extraction.internal_links
+                                if section_ is section
+                            ],
+                            [
+                                link for section_, link
+                                in extraction.external_links
+                                if section_ is section
+                            ]
+                        )
+                    )
+        return
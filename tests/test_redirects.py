@@ -0,0 +1,171 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Redirect table tests.
+"""
+
+
+# standard library imports
+import os
+import shutil
+import tempfile
+import unittest
+
+# third party imports
+import lxml.etree
+
+# library specific imports
+import src.xml
+import src.sinks
+import src.titles
+import src.parser
+import src.redirects
+
+
+XML = "examples/Wikipedia-20180812145957.xml"
+REDIRECTS = (
+    ("Foo", "Bar", None),
+    ("Bar", "Doctor_Who#History", None),
+    ("Talk:Cycle", "Cycle", None),
+    ("Cycle", "talk:cycle", None),
+    ("Old", None, "#REDIRECT [[doctor Who]]"),
+    ("Not a redirect", None, "[[Foo]]")
+)
+
+
+def write_redirects(xml, path):
+    """Write export file with redirects (the redirect element is left out
+    if the target is None).
+
+    :param str xml: XML file
+    :param str path: path
+    """
+    tree = lxml.etree.parse(xml)
+    root = tree.getroot()
+    page = root.find("{*}page")
+    for i, (title, target, wikitext) in enumerate(REDIRECTS):
+        copy = lxml.etree.fromstring(lxml.etree.tostring(page))
+        copy.find("{*}title").text = title
+        copy.find("{*}ns").text = "1" if title.startswith("Talk:") else "0"
+        copy.find("{*}id").text = str(100000 + i)
+        if target is not None:
+            redirect = copy.makeelement(
+                "{{{}}}redirect".format(lxml.etree.QName(root).namespace),
+                title=target
+            )
+            copy.find("{*}id").addnext(redirect)
+            wikitext = "#REDIRECT [[{}]]".format(target)
+        copy.find("{*}revision/{*}text").text = wikitext
+        root.append(copy)
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+class TestRedirects(unittest.TestCase):
+    """Redirect table tests."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.xml = os.path.join(cls.directory, "redirects.xml")
+        write_redirects(XML, cls.xml)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_collapse_00(self):
+        """Test collapsing chains of redirects."""
+        self.assertEqual(
+            {"a": "c", "b": "c", "x": None, "y": None, "z": None, "s": None},
+            src.redirects.collapse(
+                {"a": "b", "b": "c", "x": "y", "y": "x", "z": "x", "s": "s"}
+            )
+        )
+        return
+
+    def test_find_page_elements_00(self):
+        """Test finding page elements (redirect title attribute)."""
+        export_file_parser = src.xml.ExportFileParser(
+            self.xml, None, streaming=True
+        )
+        redirects = {
+            page_element.title: page_element.redirect
+            for page_element in export_file_parser.find_page_elements(
+                prop=("title", "redirect")
+            )
+        }
+        for title, target, _ in REDIRECTS:
+            self.assertEqual(target, redirects[title])
+        self.assertEqual(
+            "Template:BBC Online", redirects["Template:Bbc.co.uk"]
+        )
+        self.assertIsNone(redirects["Doctor Who"])
+        return
+
+    def test_redirect_table_00(self):
+        """Test building redirect table (chains, cycles and redirects
+        found in the wikitext)."""
+        export_file_parser = src.xml.ExportFileParser(
+            self.xml, None, streaming=True
+        )
+        namespaces = export_file_parser.find_namespace_elements()
+        redirect_table = src.redirects.RedirectTable(
+            os.path.join(self.directory, "redirects.db")
+        )
+        # the example export file has 8 redirects
+        self.assertEqual(
+            (8 + 5, 1, 2),
+            redirect_table.build(
+                export_file_parser.find_page_elements(
+                    prop=src.redirects.PROP, latest_only=True
+                ),
+                src.parser.Parser(namespaces, engine="regex")
+            )
+        )
+        table = src.titles.TitleTable()
+        redirects = redirect_table.load(table=table)
+        self.assertEqual(8 + 3, len(redirects))
+        for title in ("Foo", "Bar", "Old"):
+            self.assertEqual(
+                table.intern(("0", "Doctor Who")),
+                redirects[table.intern(("0", title))]
+            )
+        self.assertEqual(
+            ("0", "Doctor Who"), redirect_table.resolve("0", "Foo")
+        )
+        self.assertIsNone(redirect_table.resolve("1", "Cycle"))
+        self.assertEqual(8 + 5, len(redirect_table))
+        redirect_table.close()
+        path = os.path.join(self.directory, "pagelinks.tsv")
+        with src.sinks.get_sink(
+                path, redirects=redirects, table=table
+        ) as sink:
+            sink.write(
+                [
+                    ("1", "0", table.intern(("0", title)))
+                    for title in ("Foo", "Doctor Who", "Cycle")
+                ]
+            )
+        table.close()
+        with open(path, encoding="utf-8") as fp:  # pylint: disable=C0103
+            self.assertEqual(
+                ["1\t0\t0\tDoctor Who", "1\t0\t0\tCycle"],
+                fp.read().splitlines()
+            )
+        return
@@ -0,0 +1,161 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Pagelinks table sink tests.
+"""
+
+
+# standard library imports
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+# third party imports
+
+# library specific imports
+import src.sinks
+import src.titles
+import src.columnar
+
+
+ROWS = [
+    ("1", "0", "0", "Foo"),
+    ("1", "0", "14", "Bar's \"baz\"\\ qux"),
+    ("2", "1", "0", "Foo")
+]
+
+
+class TestSinks(unittest.TestCase):
+    """Pagelinks table sink tests."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.table = src.titles.TitleTable()
+        self.rows = [
+            (pl_from, pl_from_ns, self.table.intern((pl_ns, pl_title)))
+            for pl_from, pl_from_ns, pl_ns, pl_title in ROWS
+        ]
+
+    def tearDown(self):
+        self.table.close()
+        shutil.rmtree(self.directory)
+
+    def _write(self, filename):
+        """Write rows (title IDs, in batches of 2 rows).
+
+        :param str filename: filename
+
+        :returns: output file
+        :rtype: str
+        """
+        path = os.path.join(self.directory, filename)
+        with src.sinks.get_sink(path, batch_size=2, table=self.table) as sink:
+            sink.write(self.rows[:1])
+            sink.write(self.rows[1:])
+        self.assertEqual(len(ROWS), sink.rows)
+        return path
+
+    def test_get_sink_00(self):
+        """Test getting sink by file extension."""
+        self.assertIsNone(src.sinks.get_sink("output.txt"))
+        self.assertIsNone(src.sinks.get_sink(None))
+        return
+
+    def test_sqlite_sink_00(self):
+        """Test SQLite sink."""
+        connection = sqlite3.connect(self._write("pagelinks.db"))
+        self.assertEqual(
+            [
+                (int(pl_from), int(pl_from_ns), int(pl_ns), pl_title)
+                for pl_from, pl_from_ns, pl_ns, pl_title in ROWS
+            ],
+            connection.execute("SELECT * FROM pagelinks").fetchall()
+        )
+        self.assertIsNotNone(
+            connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            ).fetchone()
+        )
+        connection.close()
+        return
+
+    def test_sqlite_sink_01(self):
+        """Test SQLite sink (re-runs replace the rows)."""
+        self._write("pagelinks.db")
+        connection = sqlite3.connect(self._write("pagelinks.db"))
+        self.assertEqual(
+            len(ROWS),
+            connection.execute("SELECT COUNT(*) FROM pagelinks").fetchone()[0]
+        )
+        connection.close()
+        return
+
+    def test_tsv_sink_00(self):
+        """Test TSV sink."""
+        path = self._write("pagelinks.tsv")
+        with open(path, encoding="utf-8") as fp:  # pylint: disable=C0103
+            self.assertEqual(
+                ["\t".join(row) for row in ROWS], fp.read().splitlines()
+            )
+        return
+
+    def test_sql_sink_00(self):
+        """Test MediaWiki SQL sink (one INSERT statement per batch)."""
+        path = self._write("pagelinks.sql")
+        with open(path, encoding="utf-8") as fp:  # pylint: disable=C0103
+            lines = fp.read().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(
+            lines[0].endswith(
+                "VALUES (1,0,0,'Foo'),"
+                "(1,0,14,'Bar\\'s_\\\"baz\\\"\\\\_qux');"
+            )
+        )
+        self.assertTrue(lines[1].endswith("VALUES (2,1,0,'Foo');"))
+        return
+
+    def test_columnar_sink_00(self):
+        """Test columnar sink (rows written at once are one page)."""
+        path = os.path.join(self.directory, "pagelinks.wpl")
+        with src.sinks.get_sink(path, table=self.table) as sink:
+            sink.write(self.rows[:2])
+            sink.write([])
+            sink.write(self.rows[2:])
+        with src.columnar.ColumnarReader(path) as reader:
+            self.assertEqual(
+                ROWS,
+                [
+                    (str(page_id), str(page_namespace), str(namespace), title)
+                    for page_id, page_namespace, links in reader
+                    for namespace, title in links
+                ]
+            )
+            self.assertEqual(2, len(reader))
+        return
+
+    def test_columnar_sink_01(self):
+        """Test columnar sink (batch of rows of several pages)."""
+        path = os.path.join(self.directory, "pagelinks.wpl")
+        with src.sinks.get_sink(path, table=self.table) as sink:
+            sink._write_batch(self.rows)  # pylint: disable=protected-access
+        with src.columnar.ColumnarReader(path) as reader:
+            self.assertEqual(2, len(reader))
+        return
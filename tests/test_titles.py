@@ -0,0 +1,163 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Title normalisation tests.
+"""
+
+
+# standard library imports
+import os
+import shutil
+import tempfile
+import unittest
+
+# third party imports
+
+# library specific imports
+import src.page
+import src.parser
+import src.titles
+
+
+NAMESPACES = {
+    "0": "(Main)", "1": "Talk", "2": "User", "3": "User talk",
+    "4": "Wikipedia", "14": "Category"
+}
+
+
+class TestTitles(unittest.TestCase):
+    """Title normalisation tests."""
+
+    def setUp(self):
+        self.title_normalizer = src.titles.TitleNormalizer(NAMESPACES)
+
+    def test_normalize_00(self):
+        """Test normalising titles (case, underscores, anchors, namespaces
+        and encoding)."""
+        for page_name in (
+                "foo bar", "Foo_bar", "Foo bar#History", " foo__ bar ",
+                "Foo\u00a0bar\u200e", "foo%20bar", "Foo&#32;bar"
+        ):
+            self.assertEqual(
+                ("0", "Foo bar"),
+                self.title_normalizer.normalize("0", page_name)
+            )
+        self.assertEqual(
+            ("3", "Bob"),
+            self.title_normalizer.normalize("0", "user_TALK: bob")
+        )
+        self.assertEqual(
+            ("4", "NPOV"),
+            self.title_normalizer.normalize("0", "project:NPOV")
+        )
+        self.assertEqual(
+            ("0", "Unknown:x"),
+            self.title_normalizer.normalize("0", "unknown:x")
+        )
+        self.assertEqual(
+            ("1", "ßx"), self.title_normalizer.normalize("1", "ßx")
+        )
+        self.assertIsNone(self.title_normalizer.normalize("0", "#top"))
+        return
+
+    def test_get_id_00(self):
+        """Test interning titles."""
+        table = src.titles.TitleTable()
+        ids = [
+            self.title_normalizer.get_id("0", page_name, table)
+            for page_name in ("foo", "Foo#a", "Bar", "foo")
+        ]
+        self.assertEqual(ids[0], ids[1])
+        self.assertEqual(ids[0], ids[3])
+        self.assertNotEqual(ids[0], ids[2])
+        self.assertEqual(2, len(table))
+        self.assertEqual(("0", "Foo"), table[ids[0]])
+        table.close()
+        self.assertFalse(os.path.exists(table.path))
+        title_normalizer = src.titles.TitleNormalizer(
+            NAMESPACES, first_letter=False
+        )
+        self.assertEqual(("0", "foo"), title_normalizer.normalize("0", "foo"))
+        return
+
+    def test_title_table_00(self):
+        """Test intern table (IDs are stable after eviction and shared by
+        intern tables using the same SQLite database)."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "titles.db")
+            table = src.titles.TitleTable(path, size=2)
+            titles = [("0", "A"), ("0", "B"), ("14", "A")]
+            ids = [table.intern(title) for title in titles]
+            # pylint: disable=protected-access
+            self.assertEqual(titles[1:], list(table._ids))
+            self.assertEqual(ids, [table.intern(title) for title in titles])
+            self.assertEqual(titles, [table[id_] for id_ in ids])
+            self.assertLessEqual(len(table._titles), 2)
+            other_table = src.titles.TitleTable(path)
+            self.assertEqual(
+                ids[::-1],
+                [other_table.intern(title) for title in titles[::-1]]
+            )
+            with self.assertRaises(KeyError):
+                other_table[max(ids) + 1]  # pylint: disable=W0104
+            table.close()
+            other_table.close()
+        finally:
+            shutil.rmtree(directory)
+        return
+
+    def test_normalize_01(self):
+        """Test normalising titles (cache is bounded)."""
+        title_normalizer = src.titles.TitleNormalizer(NAMESPACES, size=2)
+        for page_name in ("foo", "bar", "foo", "baz", "foo"):
+            title_normalizer.normalize("0", page_name)
+        # pylint: disable=protected-access
+        self.assertEqual(
+            [("0", "baz"), ("0", "foo")], list(title_normalizer._titles)
+        )
+        return
+
+    def test_create_pagelinks_table_00(self):
+        """Test creating pagelinks table (normalised titles)."""
+        page = src.page.Page(
+            "Foo", "1", "0", "1",
+            "[[foo bar]] [[Foo_bar]]\n== A ==\n[[Foo bar#History|x]] "
+            "[[#top]] [[:category:Baz]] [[Talk:qux]]",
+            src.parser.Parser(NAMESPACES, engine="regex")
+        )
+        table = src.titles.TitleTable()
+        rows = page.create_pagelinks_table(normalize=True, table=table)
+        self.assertEqual(
+            [
+                ("1", "0", "0", "Foo bar"),
+                ("1", "0", "14", "Baz"),
+                ("1", "0", "1", "Qux")
+            ],
+            [(pl_from, ns, *table[id_]) for pl_from, ns, id_ in rows]
+        )
+        other_page = src.page.Page(
+            "Bar", "2", "0", "2", "[[Talk:Qux]] [[foo bar]]", page.parser
+        )
+        self.assertEqual(
+            [("2", "0", rows[2][2]), ("2", "0", rows[0][2])],
+            other_page.create_pagelinks_table(normalize=True, table=table)
+        )
+        table.close()
+        return
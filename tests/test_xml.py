@@ -0,0 +1,335 @@
+#    This file is part of WikiPie 1.0.
+#    Copyright (C) 2018  Carine Dengler
+#
+#    WikiPie is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+"""
+:synopsis: Wikipedia export file parser tests.
+"""
+
+
+# standard library imports
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+# third party imports
+import lxml.etree
+
+# library specific imports
+import src.xml
+import src.page_elements
+
+
+XML = "examples/Wikipedia-20180812145957.xml"
+# XSD accepting the example export file (page elements only)
+XSD = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:mw="http://www.mediawiki.org/xml/export-0.10/"
+  targetNamespace="http://www.mediawiki.org/xml/export-0.10/"
+  elementFormDefault="qualified">
+  <xs:complexType name="AnyType" mixed="true">
+    <xs:sequence>
+      <xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>
+    </xs:sequence>
+    <xs:anyAttribute processContents="skip"/>
+  </xs:complexType>
+  <xs:element name="mediawiki">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="siteinfo" type="mw:AnyType" minOccurs="0"/>
+        <xs:element name="page" minOccurs="0" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="title" type="xs:string"/>
+              <xs:element name="ns" type="xs:integer"/>
+              <xs:element name="id" type="xs:positiveInteger"/>
+              <xs:element name="redirect" type="mw:AnyType" minOccurs="0"/>
+              <xs:element name="restrictions" type="xs:string"
+                minOccurs="0"/>
+              <xs:element name="revision" type="mw:AnyType"
+                minOccurs="0" maxOccurs="unbounded"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+      <xs:anyAttribute processContents="skip"/>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+
+def write_history(xml, path, size=3):
+    """Write export file with several revisions per page.
+
+    :param str xml: XML file
+    :param str path: path
+    :param int size: number of revisions per page
+    """
+    tree = lxml.etree.parse(xml)
+    for page in tree.iterfind("{*}page"):
+        revision = page.find("{*}revision")
+        for i in range(1, size):
+            copy = lxml.etree.fromstring(lxml.etree.tostring(revision))
+            copy.find("{*}id").text += str(i)
+            copy.find("{*}text").text = "revision {}".format(i)
+            page.append(copy)
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+def write_invalid(xml, path, index):
+    """Write export file with an invalid element after the revision
+    elements of a page.
+
+    :param str xml: XML file
+    :param str path: path
+    :param int index: index of page
+    """
+    tree = lxml.etree.parse(xml)
+    page = list(tree.iterfind("{*}page"))[index]
+    lxml.etree.SubElement(
+        page, "{{{}}}invalid".format(lxml.etree.QName(page).namespace)
+    )
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+class TestExportFileParser(unittest.TestCase):
+    """Wikipedia export file parser tests."""
+
+    @classmethod
+    def setUpClass(cls):
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        cls.page_elements = list(
+            export_file_parser.find_page_elements(
+                prop=("title", "ns", "id", "revision")
+            )
+        )
+        cls.directory = tempfile.mkdtemp()
+        cls.history = os.path.join(cls.directory, "history.xml")
+        write_history(XML, cls.history)
+        cls.xsd = os.path.join(cls.directory, "export.xsd")
+        # pylint: disable=invalid-name
+        with open(cls.xsd, "w", encoding="utf-8") as fp:
+            fp.write(XSD)
+        cls.invalid = os.path.join(cls.directory, "invalid.xml")
+        write_invalid(cls.history, cls.invalid, 20)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_find_page_elements_00(self):
+        """Test finding page elements (projection)."""
+        export_file_parser = src.xml.ExportFileParser(
+            XML, None, streaming=True
+        )
+        prop = ("title", "id", "revision.text", "revision.contributor.ip")
+        for page_element, projection in zip(
+                self.page_elements,
+                export_file_parser.find_page_elements(prop=prop)
+        ):
+            self.assertEqual(
+                src.page_elements.PageRecord(
+                    title=page_element["title"],
+                    id=page_element["id"],
+                    revision=[
+                        src.page_elements.RevisionRecord(
+                            contributor=src.page_elements.Contributor(
+                                ip=revision_element["contributor"]["ip"]
+                            ),
+                            text=revision_element["text"]
+                        )
+                        for revision_element in page_element["revision"]
+                    ]
+                ),
+                projection
+            )
+        return
+
+    def test_find_page_elements_01(self):
+        """Test finding page elements (all revision properties)."""
+        export_file_parser = src.xml.ExportFileParser(XML, None)
+        page_element = self.page_elements[0]
+        self.assertEqual(
+            list(src.xml.REVISION_PROP),
+            page_element["revision"][0].keys()
+        )
+        self.assertEqual(
+            list(src.xml.CONTRIBUTOR_PROP),
+            page_element["revision"][0]["contributor"].keys()
+        )
+        prop = ("title", "ns", "id", "revision.contributor", "revision")
+        self.assertEqual(
+            self.page_elements,
+            list(export_file_parser.find_page_elements(prop=prop))
+        )
+        return
+
+    def test_find_page_elements_02(self):
+        """Test page elements are picklable and dict-compatible."""
+        for page_element in self.page_elements:
+            self.assertEqual(
+                page_element, pickle.loads(pickle.dumps(page_element))
+            )
+            self.assertEqual(page_element.title, page_element["title"])
+            self.assertIsNone(page_element.get("redirect"))
+            with self.assertRaises(KeyError):
+                page_element["redirect"]  # pylint: disable=W0104
+        return
+
+    def test_find_revision_elements_00(self):
+        """Test finding revision elements."""
+        prop = ("title", "ns", "id", "revision")
+        page_elements = list(
+            src.xml.ExportFileParser(self.history, None).find_page_elements(
+                prop=prop
+            )
+        )
+        for streaming in (False, True):
+            export_file_parser = src.xml.ExportFileParser(
+                self.history, None, streaming=streaming
+            )
+            self.assertEqual(
+                [
+                    (page_element._replace(revision=None), revision_element)
+                    for page_element in page_elements
+                    for revision_element in page_element.revision
+                ],
+                list(export_file_parser.find_revision_elements(prop=prop))
+            )
+        return
+
+    def test_find_revision_elements_01(self):
+        """Test finding revision elements (latest revision only)."""
+        prop = ("title", "ns", "id", "revision")
+        page_elements = list(
+            src.xml.ExportFileParser(self.history, None).find_page_elements(
+                prop=prop
+            )
+        )
+        for streaming in (False, True):
+            export_file_parser = src.xml.ExportFileParser(
+                self.history, None, streaming=streaming
+            )
+            self.assertEqual(
+                [
+                    (
+                        page_element._replace(revision=None),
+                        page_element.revision[-1]
+                    )
+                    for page_element in page_elements
+                ],
+                list(
+                    export_file_parser.find_revision_elements(
+                        prop=prop, latest_only=True
+                    )
+                )
+            )
+            self.assertEqual(
+                [
+                    page_element._replace(revision=page_element.revision[-1:])
+                    for page_element in page_elements
+                ],
+                list(
+                    export_file_parser.find_page_elements(
+                        prop=prop, latest_only=True
+                    )
+                )
+            )
+        return
+
+    def test_validation_00(self):
+        """Test full validation."""
+        export_file_parser = src.xml.ExportFileParser(self.history, self.xsd)
+        self.assertEqual("full", export_file_parser.validation)
+        with self.assertRaises(RuntimeError):
+            src.xml.ExportFileParser(self.invalid, self.xsd)
+        with self.assertRaisesRegex(RuntimeError, "not supported"):
+            src.xml.ExportFileParser(
+                self.history, self.xsd, streaming=True, validation="full"
+            )
+        with self.assertRaisesRegex(RuntimeError, "unknown validation"):
+            src.xml.ExportFileParser(self.history, self.xsd, validation="x")
+        return
+
+    def test_validation_01(self):
+        """Test streaming validation (whole page elements, including the
+        elements following the revision elements)."""
+        prop = ("title", "revision.id")
+        export_file_parser = src.xml.ExportFileParser(
+            self.history, self.xsd, streaming=True
+        )
+        self.assertEqual("streaming", export_file_parser.validation)
+        self.assertEqual(
+            len(self.page_elements) * 3,
+            len(list(export_file_parser.find_revision_elements(prop=prop)))
+        )
+        export_file_parser = src.xml.ExportFileParser(
+            self.invalid, self.xsd, streaming=True
+        )
+        for latest_only in (False, True):
+            with self.assertRaises(RuntimeError):
+                list(
+                    export_file_parser.find_revision_elements(
+                        prop=prop, latest_only=latest_only
+                    )
+                )
+            with self.assertRaises(RuntimeError):
+                list(
+                    export_file_parser.find_page_elements(
+                        prop=prop, latest_only=latest_only
+                    )
+                )
+        return
+
+    def test_validation_02(self):
+        """Test header-only validation and no validation."""
+        invalid = os.path.join(self.directory, "invalid_header.xml")
+        write_invalid(XML, invalid, src.xml.ExportFileParser.HEADER_PAGES - 1)
+        with self.assertRaises(RuntimeError):
+            src.xml.ExportFileParser(
+                invalid, self.xsd, streaming=True, validation="header-only"
+            )
+        export_file_parser = src.xml.ExportFileParser(
+            self.invalid, self.xsd, streaming=True, validation="header-only"
+        )
+        self.assertEqual(
+            len(self.page_elements),
+            len(list(export_file_parser.find_page_elements()))
+        )
+        for xsd, validation in ((self.xsd, "off"), (None, None)):
+            export_file_parser = src.xml.ExportFileParser(
+                self.invalid, xsd, streaming=True, validation=validation
+            )
+            self.assertEqual("off", export_file_parser.validation)
+            self.assertEqual(
+                len(self.page_elements) * 3,
+                len(list(export_file_parser.find_revision_elements()))
+            )
+        return
+
+    def test_validation_03(self):
+        """Test compiled XSDs are shared by export file parsers."""
+        src.xml.ExportFileParser(self.history, self.xsd, streaming=True)
+        xmlschema = src.xml.ExportFileParser.XMLSCHEMAS[self.xsd]
+        src.xml.ExportFileParser(self.history, self.xsd)
+        self.assertIs(
+            xmlschema, src.xml.ExportFileParser.XMLSCHEMAS[self.xsd]
+        )
+        return